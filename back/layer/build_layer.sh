@@ -0,0 +1,55 @@
+#!/bin/bash
+# Construye layer/layer_common_lib.zip, el layer compartido por service-room y service-user.
+#
+# Opciones:
+#   --fetch-wheels   Descarga los wheels de ambos servicios a layer/wheelhouse (requiere red)
+#   --offline        Construye sin red, instalando solo desde layer/wheelhouse
+#
+# Variables de entorno:
+#   LAYER_MAX_SIZE_KB, LAYER_MAX_IMPORT_MS  Presupuesto de tamaño del zip y de tiempo de import (0 = sin límite)
+#   OPTIMIZE                                Nivel de optimize de los .pyc (por defecto 2)
+#   SOURCE_DATE_EPOCH                       Fecha fija de las entradas del zip (por defecto 1980-01-01)
+set -e
+
+LAYER_DIR="$(cd "$(dirname "$0")" && pwd)"
+BACK_DIR="$(dirname "$LAYER_DIR")"
+OFFLINE=0
+
+for arg in "$@"; do
+  case "$arg" in
+    --offline) OFFLINE=1 ;;
+    --fetch-wheels)
+      pip download -d "$LAYER_DIR/wheelhouse" \
+        --platform manylinux2014_x86_64 --python-version 3.9 --implementation cp --only-binary=:all: \
+        -r "$BACK_DIR/service-room/requirements.txt" -r "$BACK_DIR/service-user/requirements.txt"
+      ;;
+    *) echo "Opción desconocida: $arg" >&2; exit 1 ;;
+  esac
+done
+
+NETWORK_ARGS=()
+if [ "$OFFLINE" = "1" ]; then
+  NETWORK_ARGS=(--network none)
+fi
+
+# Construir la imagen Docker usando sudo (con back/ como contexto)
+sudo docker build "${NETWORK_ARGS[@]}" -f "$LAYER_DIR/Dockerfile" -t lambda-layer-builder \
+  --build-arg OFFLINE="$OFFLINE" \
+  --build-arg OPTIMIZE="${OPTIMIZE:-2}" \
+  --build-arg LAYER_MAX_SIZE_KB="${LAYER_MAX_SIZE_KB:-0}" \
+  --build-arg LAYER_MAX_IMPORT_MS="${LAYER_MAX_IMPORT_MS:-0}" \
+  --build-arg SOURCE_DATE_EPOCH="${SOURCE_DATE_EPOCH:-315532800}" \
+  "$BACK_DIR"
+
+# Crear un contenedor a partir de la imagen y obtener su ID
+container_id=$(sudo docker create lambda-layer-builder)
+
+# Copiar el ZIP y el reporte generados desde el contenedor
+sudo docker cp "$container_id":/layer_common_lib.zip "$LAYER_DIR/layer_common_lib.zip"
+sudo docker cp "$container_id":/layer_report.json "$LAYER_DIR/layer_report.json"
+
+# Eliminar el contenedor temporal
+sudo docker rm "$container_id"
+
+cat "$LAYER_DIR/layer_report.json"
+echo "El archivo layer/layer_common_lib.zip se ha creado exitosamente."
@@ -0,0 +1,187 @@
+"""
+Adelgaza, compila y empaqueta el layer común de Lambda, y verifica su presupuesto de tamaño e import.
+
+Pasos:
+  1. Elimina lo que no se usa en ejecución: tests, __pycache__, stubs .pyi, fuentes C, binarios de consola
+     y la metadata de instalación de los *.dist-info (se conservan METADATA y las licencias).
+  2. Compila cada .py a un .pyc "sin fuentes" (junto al módulo, modo legacy) con el optimize indicado y
+     elimina el .py. Los .pyc usan invalidación por hash, así que el resultado es reproducible.
+  3. Empaqueta el zip con entradas ordenadas, fecha fija (SOURCE_DATE_EPOCH) y permisos fijos.
+  4. Mide el tamaño del zip y el tiempo de import de los módulos indicados y los compara con el presupuesto.
+
+Debe ejecutarse con el mismo Python que el runtime de Lambda (por eso corre dentro de la imagen de build).
+
+Uso:
+    python slim_layer.py layer_common_lib --zip layer_common_lib.zip --report layer_report.json \\
+        --imports jwt bcrypt --max-size-kb 2048 --max-import-ms 150
+"""
+import argparse
+import compileall
+import json
+import os
+import py_compile
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import zipfile
+
+LAYER_MOUNT_DIR = '/opt/python'
+STRIP_DIR_NAMES = {'__pycache__', 'tests', 'test', 'testing', 'docs', 'examples'}
+STRIP_SUFFIXES = ('.pyi', '.pyx', '.pxd', '.c', '.h', '.cpp')
+STRIP_FILE_NAMES = {'py.typed'}
+DIST_INFO_KEEP = ('METADATA', 'LICENSE', 'LICENCE', 'COPYING', 'NOTICE', 'AUTHORS')
+
+
+def strip_tree(python_dir: str) -> int:
+    """Elimina archivos y carpetas que no se usan en ejecución. Devuelve la cantidad de bytes eliminados."""
+    removed = 0
+
+    def remove(path):
+        nonlocal removed
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                removed += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+            shutil.rmtree(path)
+        else:
+            removed += os.path.getsize(path)
+            os.remove(path)
+
+    # Scripts de consola instalados por pip
+    bin_dir = os.path.join(python_dir, 'bin')
+    if os.path.isdir(bin_dir):
+        remove(bin_dir)
+
+    for root, dirs, files in os.walk(python_dir, topdown=True):
+        for name in [d for d in dirs if d in STRIP_DIR_NAMES]:
+            remove(os.path.join(root, name))
+            dirs.remove(name)
+
+        in_dist_info = root.endswith('.dist-info')
+        for name in files:
+            if in_dist_info and name.startswith(DIST_INFO_KEEP):
+                continue
+            if in_dist_info or name.endswith(STRIP_SUFFIXES) or name in STRIP_FILE_NAMES:
+                remove(os.path.join(root, name))
+
+    return removed
+
+
+def compile_tree(python_dir: str, optimize: int) -> int:
+    """Compila los .py a .pyc sin fuentes y elimina los .py. Devuelve la cantidad de módulos compilados."""
+    ok = compileall.compile_dir(
+        python_dir,
+        quiet=1,
+        ddir=LAYER_MOUNT_DIR,  # Rutas de los tracebacks tal como se ven en Lambda, independientes del build
+        legacy=True,  # module.pyc junto al módulo: se importa sin el .py
+        optimize=optimize,
+        invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+        workers=0
+    )
+    if not ok:
+        raise SystemExit("La compilación del layer falló.")
+
+    compiled = 0
+    for root, _, files in os.walk(python_dir):
+        for name in files:
+            if name.endswith('.py') and os.path.exists(os.path.join(root, name + 'c')):
+                os.remove(os.path.join(root, name))
+                compiled += 1
+    return compiled
+
+
+def build_zip(layer_dir: str, zip_path: str, source_date_epoch: int):
+    """Crea un zip reproducible: mismas entradas, orden, fechas y permisos en cada build."""
+    date_time = time.gmtime(max(source_date_epoch, 315532800))[:6]  # zip no admite fechas anteriores a 1980
+    entries = []
+    for root, dirs, files in os.walk(layer_dir):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            entries.append((os.path.relpath(path, layer_dir).replace(os.sep, '/'), path))
+
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+        for arcname, path in sorted(entries):
+            info = zipfile.ZipInfo(arcname, date_time=date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            with open(path, 'rb') as f:
+                zf.writestr(info, f.read(), compresslevel=9)
+
+
+def measure_import_ms(python_dir: str, modules, runs: int) -> float:
+    """Mide (mediana de varias ejecuciones en procesos nuevos) el tiempo de importar los módulos desde el layer."""
+    code = (
+        "import time, importlib\n"
+        "start = time.perf_counter()\n"
+        f"for name in {list(modules)!r}:\n"
+        "    importlib.import_module(name)\n"
+        "print((time.perf_counter() - start) * 1000)\n"
+    )
+    env = {**os.environ, 'PYTHONPATH': python_dir, 'PYTHONDONTWRITEBYTECODE': '1'}
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-s', '-c', code], env=env, check=True,
+                                capture_output=True, text=True).stdout
+        samples.append(float(output.strip()))
+    return statistics.median(samples)
+
+
+def dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('layer_dir', help="Carpeta del layer (contiene python/)")
+    parser.add_argument('--zip', required=True, help="Ruta del zip de salida")
+    parser.add_argument('--report', default=None, help="Ruta del reporte JSON")
+    parser.add_argument('--optimize', type=int, default=2, choices=[0, 1, 2], help="Nivel de optimize de los .pyc")
+    parser.add_argument('--imports', nargs='*', default=[], help="Módulos cuyo import se mide")
+    parser.add_argument('--import-runs', type=int, default=5)
+    parser.add_argument('--max-size-kb', type=int, default=0, help="Presupuesto del zip en KB (0 = sin límite)")
+    parser.add_argument('--max-import-ms', type=float, default=0, help="Presupuesto de import en ms (0 = sin límite)")
+    parser.add_argument('--target-python', default='3.9', help="Versión de Python del runtime de Lambda")
+    args = parser.parse_args()
+
+    running = f"{sys.version_info.major}.{sys.version_info.minor}"
+    if running != args.target_python:
+        raise SystemExit(f"El layer debe compilarse con Python {args.target_python} (se está usando {running}).")
+
+    python_dir = os.path.join(args.layer_dir, 'python')
+    installed_bytes = dir_size(python_dir)
+    stripped_bytes = strip_tree(python_dir)
+    compiled_modules = compile_tree(python_dir, args.optimize)
+    build_zip(args.layer_dir, args.zip, int(os.environ.get('SOURCE_DATE_EPOCH', 315532800)))
+
+    report = {
+        'python': running,
+        'optimize': args.optimize,
+        'installed_bytes': installed_bytes,
+        'stripped_bytes': stripped_bytes,
+        'unzipped_bytes': dir_size(args.layer_dir),
+        'zip_bytes': os.path.getsize(args.zip),
+        'compiled_modules': compiled_modules,
+        'budget': {'max_size_kb': args.max_size_kb, 'max_import_ms': args.max_import_ms},
+        'violations': []
+    }
+    if args.imports:
+        report['import_ms'] = round(measure_import_ms(python_dir, args.imports, args.import_runs), 2)
+
+    if args.max_size_kb and report['zip_bytes'] > args.max_size_kb * 1024:
+        report['violations'].append(f"zip de {report['zip_bytes'] // 1024} KB supera {args.max_size_kb} KB")
+    if args.max_import_ms and report.get('import_ms', 0) > args.max_import_ms:
+        report['violations'].append(f"import de {report['import_ms']} ms supera {args.max_import_ms} ms")
+
+    print(json.dumps(report, indent=2))
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if report['violations']:
+        raise SystemExit("El layer excede su presupuesto: " + "; ".join(report['violations']))
+
+
+if __name__ == '__main__':
+    main()
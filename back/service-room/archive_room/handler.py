@@ -0,0 +1,138 @@
+import json
+import time
+from datetime import datetime
+from utils.validator import get_validator_archive_room
+from utils.response import Response
+from utils.token import get_token_instance
+from utils.config import ROLES_PERMITED_CREATE_ROOM, SYNC_TOMBSTONE_RETENTION_DAYS, ROOM_TTL_ATTRIBUTE
+from utils.repository import get_backend
+from utils.room_repository import RoomRepository, room_to_dict
+from utils.room_stats import stats_increment_action
+from utils.archive import archive_room_update, room_owner_id, is_archived
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+validator_archive_room = get_validator_archive_room()
+token_validator = get_token_instance()
+
+dynamodb_client = DynamoClientPool()
+backend = get_backend(dynamodb_client)
+
+
+def archive_error(room, room_id: str, user_id: str):
+    """Respuesta de error si el room no existe, es de otro docente o ya estaba archivado; None si puede archivarse."""
+    if room is None:
+        logger.error("Room no encontrado con ID: %s", room_id)
+        return Response(status_code=404, body={'error': 'Room no encontrado.'}).to_dict()
+    if room_owner_id(room) != user_id:
+        logger.error("Acceso no autorizado para el usuario %s a la room con ID: %s", user_id, room_id)
+        return Response(status_code=403, body={"error": "Acceso no autorizado a la room."}).to_dict()
+    if is_archived(room):
+        return Response(status_code=409, body={'error': 'El room ya está archivado.'}).to_dict()
+    return None
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Archiva un room del docente: deja de aparecer en rooms/get (y en la exportación) y pasa a listarse en
+    rooms/archived. El body es opcional; con {"expire_in_days": n} el room se elimina por TTL pasado ese plazo
+    (nunca antes de SYNC_TOMBSTONE_RETENTION_DAYS).
+
+    El room archivado deja de contar en rooms/stats: el archivado y el descuento en los contadores del docente
+    se escriben en la misma transacción, y el borrado posterior por TTL ya no los toca.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dynamodb_client, token_validator=token_validator,
+                               validators=[validator_archive_room])
+
+    try:
+        headers = event.get('headers')
+        if not headers or 'Authorization' not in headers:
+            logger.error("Falta el encabezado de autorización en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el encabezado de autorización."}).to_dict()
+
+        token = token_validator.remove_bearer_prefix(headers['Authorization'])
+
+        try:
+            jwt_decode = token_validator.decode_token(token)
+        except ValueError as e:
+            logger.error("Error al decodificar el token JWT: %s", e)
+            return Response(status_code=401, body={"error": "Token JWT inválido."}).to_dict()
+
+        user_id = jwt_decode.get('id')
+        role = jwt_decode.get('role')
+
+        if not user_id or not role:
+            logger.error("Faltan los campos user_id o role: %s, %s", user_id, role)
+            return Response(status_code=401, body={"error": "Faltan los campos de usuario (ID) o rol."}).to_dict()
+
+        if role not in ROLES_PERMITED_CREATE_ROOM:
+            logger.error("Rol no permitido: %s", role)
+            return Response(status_code=403, body={"error": "Rol no permitido para realizar esta acción."}).to_dict()
+
+        path_parameters = event.get('pathParameters')
+        if not path_parameters or 'roomId' not in path_parameters:
+            logger.error("Falta el parámetro roomId en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el parámetro roomId en la solicitud."}).to_dict()
+
+        room_id = path_parameters.get('roomId')
+
+        body = event.get('body')
+        if isinstance(body, str):
+            body = json.loads(body) if body.strip() else None
+
+        expires_at = None
+        if body:
+            if not validator_archive_room.validate(data=body, param_field='body'):
+                logger.error("Errores de validación: %s", validator_archive_room.get_errors())
+                return Response(status_code=400, body={'error': 'Fallo en la validación de los datos proporcionados.',
+                                                       'details': validator_archive_room.get_errors()}).to_dict()
+            # El room archivado es la lápida de la sincronización incremental: no se borra antes de que los
+            # clientes con una marca todavía válida lo vean
+            expire_in_days = max(body['expire_in_days'], SYNC_TOMBSTONE_RETENTION_DAYS)
+            expires_at = int(time.time()) + expire_in_days * 24 * 3600
+
+        # El curso del room hace falta para descontarlo de los contadores del docente
+        room = RoomRepository(backend, deadline).get(room_id)
+        error = archive_error(room, room_id, user_id)
+        if error:
+            return error
+
+        archived_at = datetime.utcnow().isoformat()
+        try:
+            dynamodb_client.call(deadline, 'transact_write_items', TransactItems=[
+                {'Update': archive_room_update(room_id, user_id, room['course'], archived_at, expires_at)},
+                {'Update': stats_increment_action(user_id, room['course'], -1)}
+            ])
+        except dynamodb_client.exceptions.TransactionCanceledException as e:
+            reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+            if reasons[:1] != ['ConditionalCheckFailed']:
+                raise
+            # Otra solicitud archivó o editó el room después de leerlo
+            return archive_error(RoomRepository(backend, deadline).get(room_id), room_id, user_id) or Response(
+                status_code=409, body={'error': 'El room fue modificado por otra solicitud, intente nuevamente.'}).to_dict()
+
+        # Las transacciones no devuelven el item: el room archivado se arma con lo leído y lo escrito
+        room = {key: value for key, value in room.items() if key != 'user_id'}
+        room.update(archived_user_id=user_id, archived_at=archived_at, updated_at=archived_at, sync_user_id=user_id)
+        if expires_at is not None:
+            room[ROOM_TTL_ATTRIBUTE] = expires_at
+        logger.info("Room %s archivado por el usuario %s", room_id, user_id)
+
+        return Response(status_code=200, body={'message': 'Room archivado correctamente', 'data': room_to_dict(room)}).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
+    except Exception as e:
+        logger.error("Error inesperado en el servidor: %s", e)
+        return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
@@ -0,0 +1,79 @@
+import json
+from utils.response import Response
+from utils.config import (ROOM_TABLE, BATTLE_MESSAGE_MAX_BYTES, WS_CONNECTION_CACHE_SIZE,
+                          WS_CONNECTION_CACHE_TTL_SECONDS)
+from utils.cache import TTLCache
+from utils.connections import connection_key, connection_from_item
+from utils.broadcaster import Broadcaster, endpoint_from_event
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+dynamodb_client = DynamoClientPool()
+
+# connection_id -> {'room_id', 'user_id', 'role'}; una conexión envía muchos mensajes y su room no cambia
+connection_cache = TTLCache(max_size=WS_CONNECTION_CACHE_SIZE, ttl_seconds=WS_CONNECTION_CACHE_TTL_SECONDS)
+
+
+def resolve_connection(deadline, connection_id: str):
+    connection = connection_cache.get(connection_id)
+    if connection is None:
+        response = dynamodb_client.call(deadline, 'get_item', TableName=ROOM_TABLE, Key=connection_key(connection_id))
+        connection = connection_from_item(response.get('Item'))
+        if connection is not None:
+            connection_cache.set(connection_id, connection)
+    return connection
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Ruta "battle" de la API WebSocket: {"action": "battle", "state": {...}}.
+
+    Difunde el estado de batalla del emisor (vida, ataque elegido, progreso...) al resto de las conexiones
+    de su room. El room y el usuario salen del registro de la conexión, no del mensaje.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dynamodb_client)
+
+    try:
+        connection_id = (event.get('requestContext') or {}).get('connectionId')
+        raw_body = event.get('body') or ''
+        if not connection_id:
+            return Response(status_code=400, body={"error": "Falta el identificador de la conexión."}).to_dict()
+        if len(raw_body.encode('utf-8')) > BATTLE_MESSAGE_MAX_BYTES:
+            return Response(status_code=413, body={"error": "El mensaje es demasiado grande."}).to_dict()
+
+        try:
+            body = json.loads(raw_body)
+        except ValueError:
+            return Response(status_code=400, body={"error": "El mensaje debe ser JSON."}).to_dict()
+        if not isinstance(body, dict) or not isinstance(body.get('state'), dict):
+            return Response(status_code=400, body={"error": "El mensaje debe tener un objeto state."}).to_dict()
+
+        connection = resolve_connection(deadline, connection_id)
+        if connection is None:
+            logger.error("Mensaje de una conexión no registrada: %s", connection_id)
+            return Response(status_code=403, body={"error": "Conexión no registrada."}).to_dict()
+
+        summary = Broadcaster(dynamodb_client, endpoint_from_event(event)).broadcast(
+            deadline, connection['room_id'],
+            {'type': 'battle_state', 'room_id': connection['room_id'], 'user_id': connection['user_id'],
+             'state': body['state']},
+            exclude=connection_id
+        )
+        return Response(status_code=200, body={'message': 'Estado difundido', 'data': summary}).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
+    except Exception as e:
+        logger.error("Error inesperado en el servidor: %s", e)
+        return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
@@ -0,0 +1,148 @@
+"""
+Benchmark del Broadcaster contra un sustituto local de la API de administración de conexiones de API Gateway.
+
+El sustituto (LocalManagementApi) atiende POST /@connections/<id> con una latencia simulada y responde 410
+GoneException para las conexiones marcadas como cerradas, igual que API Gateway. El registro del room vive en
+memoria (InMemoryRegistry), así que no hace falta DynamoDB. Compara enviar conexión por conexión contra el pool
+de hilos del Broadcaster y verifica que las conexiones cerradas se quiten del registro.
+
+El sustituto también sirve para probar a mano los handlers: se levanta con --serve y se exporta
+WEBSOCKET_MANAGEMENT_ENDPOINT=http://127.0.0.1:<puerto>.
+
+Uso (desde back/service-room):
+    python -m benchmarks.bench_broadcast [--connections 40] [--gone 5] [--latency-ms 30]
+    python -m benchmarks.bench_broadcast --serve --port 8765
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# utils.config lee estas variables al importarse
+os.environ.setdefault('ROOM_TABLE', 'bench-rooms')
+os.environ.setdefault('ROOM_GSI_INDEX_USERID_ID', 'bench-index')
+os.environ.setdefault('ROOM_GSI_INDEX_MEMBER', 'bench-member-index')
+os.environ.setdefault('ROOM_GSI_INDEX_ARCHIVED', 'bench-archived-index')
+os.environ.setdefault('ROOM_GSI_INDEX_SYNC', 'bench-sync-index')
+os.environ.setdefault('JWT_SECRET_KEY', 'bench-secret')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'bench')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'bench')
+
+from utils.broadcaster import Broadcaster, management_client  # noqa: E402
+from utils.deadline import Deadline  # noqa: E402
+
+
+class LocalManagementApi(ThreadingHTTPServer):
+    """Sustituto local de POST /@connections/<id>: registra lo recibido y responde 410 a las conexiones cerradas."""
+    daemon_threads = True
+    request_queue_size = 128  # El pool abre muchas conexiones a la vez; el backlog por defecto (5) las rechazaría
+
+    def __init__(self, port: int = 0, latency_ms: float = 0, gone=()):
+        self.latency_ms = latency_ms
+        self.gone = set(gone)
+        self.received = {}
+        self.lock = threading.Lock()
+        super().__init__(('127.0.0.1', port), _ManagementHandler)
+
+    @property
+    def endpoint_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _ManagementHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        connection_id = self.path.rsplit('/', 1)[-1]
+        data = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        time.sleep(server.latency_ms / 1000)
+        if not self.path.startswith('/@connections/') or connection_id in server.gone:
+            self._reply(410, {'message': 'Gone'}, 'GoneException')
+            return
+        with server.lock:
+            server.received.setdefault(connection_id, []).append(data)
+        self._reply(200, {})
+
+    def _reply(self, status: int, body: dict, error_type: str = None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        if error_type:
+            self.send_header('x-amzn-ErrorType', error_type)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class InMemoryRegistry:
+    """Reemplaza al DynamoClientPool en las dos operaciones que usa el Broadcaster sobre ws#<room_id>."""
+
+    def __init__(self):
+        self.connections = {}
+
+    def call(self, deadline, operation: str, **params):
+        room_key = params['Key']['id']['S']
+        if operation == 'get_item':
+            connections = self.connections.get(room_key)
+            return {'Item': {'connections': {'SS': sorted(connections)}}} if connections else {}
+        if operation == 'update_item':
+            self.connections[room_key] -= set(params['ExpressionAttributeValues'][':stale']['SS'])
+            return {}
+        raise ValueError(f"Operación no soportada: {operation}")
+
+
+def run_benchmark(connections: int, gone: int, latency_ms: float):
+    ids = [uuid.uuid4().hex[:16] for _ in range(connections)]
+    server = LocalManagementApi(latency_ms=latency_ms, gone=ids[:gone])
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    registry = InMemoryRegistry()
+    client = management_client(server.endpoint_url)
+    message = {'type': 'battle_state', 'state': {'hp': 80}}
+
+    try:
+        registry.connections['ws#room-1'] = set(ids)
+        broadcaster = Broadcaster(registry, api_client=client)
+        started = time.perf_counter()
+        for connection_id in ids:
+            broadcaster._post(connection_id, json.dumps(message).encode('utf-8'))
+        sequential_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        summary = broadcaster.broadcast(Deadline(29000), 'room-1', message)
+        pooled_ms = (time.perf_counter() - started) * 1000
+    finally:
+        server.shutdown()
+
+    print(f"Conexiones: {connections} ({gone} cerradas), latencia por envío: {latency_ms} ms")
+    print(f"  Secuencial:     {sequential_ms:8.1f} ms")
+    print(f"  Pool de hilos:  {pooled_ms:8.1f} ms  {summary}")
+    print(f"  Conexiones en el registro después de podar: {len(registry.connections['ws#room-1'])}")
+    assert summary == {'sent': connections - gone, 'gone': gone, 'failed': 0}
+    assert registry.connections['ws#room-1'] == set(ids[gone:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del Broadcaster con un sustituto local de API Gateway")
+    parser.add_argument('--connections', type=int, default=40)
+    parser.add_argument('--gone', type=int, default=5, help="Conexiones que el sustituto responde como cerradas")
+    parser.add_argument('--latency-ms', type=float, default=30)
+    parser.add_argument('--serve', action='store_true', help="Solo levanta el sustituto local y queda escuchando")
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.serve:
+        server = LocalManagementApi(port=args.port, latency_ms=args.latency_ms)
+        print(f"WEBSOCKET_MANAGEMENT_ENDPOINT={server.endpoint_url}")
+        server.serve_forever()
+    else:
+        run_benchmark(args.connections, args.gone, args.latency_ms)
+
+
+if __name__ == '__main__':
+    main()
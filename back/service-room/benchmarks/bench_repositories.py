@@ -0,0 +1,83 @@
+"""
+Benchmark de RoomRepository con el backend en memoria: lecturas una por una (un repositorio por lectura,
+como hacían los handlers) contra lecturas agrupadas con load()/get_many() y mapa de identidad.
+
+El backend simula la latencia de cada llamada a DynamoDB (--latency-ms), así que la diferencia muestra
+cuántos viajes se ahorran al deduplicar y agrupar claves en BatchGetItem.
+
+Uso (desde back/service-room):
+    python -m benchmarks.bench_repositories [--rooms 40] [--duplicates 3] [--latency-ms 8]
+"""
+import argparse
+import os
+import random
+import time
+import uuid
+
+# utils.config lee estas variables al importarse
+os.environ.setdefault('ROOM_TABLE', 'bench-rooms')
+os.environ.setdefault('ROOM_GSI_INDEX_USERID_ID', 'bench-index')
+os.environ.setdefault('ROOM_GSI_INDEX_MEMBER', 'bench-member-index')
+os.environ.setdefault('ROOM_GSI_INDEX_ARCHIVED', 'bench-archived-index')
+os.environ.setdefault('ROOM_GSI_INDEX_SYNC', 'bench-sync-index')
+os.environ.setdefault('JWT_SECRET_KEY', 'bench-secret')
+
+from utils.config import ROOM_TABLE  # noqa: E402
+from utils.deadline import Deadline  # noqa: E402
+from utils.dynamo_utils import serialize_to_dynamo  # noqa: E402
+from utils.repository import InMemoryBackend  # noqa: E402
+from utils.room_repository import RoomRepository  # noqa: E402
+
+
+class LatencyBackend(InMemoryBackend):
+    """Backend en memoria que tarda latency_ms por llamada, como un viaje a DynamoDB."""
+
+    def __init__(self, latency_ms: float):
+        super().__init__()
+        self.latency_ms = latency_ms
+
+    def batch_get(self, deadline, table, ids):
+        time.sleep(self.latency_ms / 1000)
+        return super().batch_get(deadline, table, ids)
+
+
+def build_backend(rooms: int, latency_ms: float):
+    backend = LatencyBackend(latency_ms)
+    ids = []
+    for index in range(rooms):
+        room = {'name': f"Sala {index}", 'course': 'Matemáticas', 'topic': 'Fracciones', 'description': 'Repaso',
+                'id': str(uuid.uuid4()), 'user_id': 'docente', 'created_at': '2026-10-19T00:00:00'}
+        backend.put(ROOM_TABLE, serialize_to_dynamo(room))
+        ids.append(room['id'])
+    return backend, ids
+
+
+def one_by_one(backend, ids):
+    return [RoomRepository(backend, Deadline(29000)).get(room_id) for room_id in ids]
+
+
+def coalesced(backend, ids):
+    return RoomRepository(backend, Deadline(29000)).get_many(ids)
+
+
+def run(rooms: int, duplicates: int, latency_ms: float):
+    backend, ids = build_backend(rooms, latency_ms)
+    requested = ids * duplicates
+    random.shuffle(requested)
+
+    for label, func in (('una lectura por clave', one_by_one), ('agrupado (get_many)', coalesced)):
+        backend.calls.clear()
+        start = time.perf_counter()
+        records = func(backend, requested)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        assert [record['id'] for record in records] == requested
+        print(f"{label:<24} {len(requested):5d} lecturas pedidas  {len(backend.calls):5d} llamadas  {elapsed_ms:9.1f} ms")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rooms', type=int, default=40)
+    parser.add_argument('--duplicates', type=int, default=3)
+    parser.add_argument('--latency-ms', type=float, default=8)
+    args = parser.parse_args()
+    run(args.rooms, args.duplicates, args.latency_ms)
@@ -0,0 +1,83 @@
+from utils.response import Response
+from utils.token import get_token_instance
+from utils.config import ROOM_TABLE, ROLES_PERMITED_BATTLE
+from utils.repository import get_backend
+from utils.dynamo_utils import serialize_dynamo_to_dict
+from utils.archive import room_owner_id
+from utils.memberships import room_membership_id
+from utils.connections import register_connection_actions
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+token_validator = get_token_instance()
+
+dynamodb_client = DynamoClientPool()
+backend = get_backend(dynamodb_client)
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Ruta $connect de la API WebSocket de batallas: wss://...?roomId=<id>&token=<jwt>.
+
+    El navegador no puede enviar Authorization en el handshake, por eso el JWT viaja como parámetro. Solo el
+    docente dueño y los estudiantes miembros del room pueden conectarse; una respuesta distinta de 200 hace
+    que API Gateway rechace la conexión.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dynamodb_client, token_validator=token_validator)
+
+    try:
+        connection_id = (event.get('requestContext') or {}).get('connectionId')
+        query_params = event.get('queryStringParameters') or {}
+        room_id = query_params.get('roomId')
+        if not connection_id or not room_id or not query_params.get('token'):
+            return Response(status_code=400, body={"error": "Faltan los parámetros roomId o token."}).to_dict()
+
+        try:
+            jwt_decode = token_validator.decode_token(token_validator.remove_bearer_prefix(query_params['token']))
+        except ValueError as e:
+            logger.error("Error al decodificar el token JWT: %s", e)
+            return Response(status_code=401, body={"error": "Token JWT inválido."}).to_dict()
+
+        user_id = jwt_decode.get('id')
+        role = jwt_decode.get('role')
+
+        if not user_id or not role:
+            logger.error("Faltan los campos user_id o role: %s, %s", user_id, role)
+            return Response(status_code=401, body={"error": "Faltan los campos de usuario (ID) o rol."}).to_dict()
+
+        if role not in ROLES_PERMITED_BATTLE:
+            logger.error("Rol no permitido: %s", role)
+            return Response(status_code=403, body={"error": "Rol no permitido para realizar esta acción."}).to_dict()
+
+        access_id = room_id if role == 'TEACHER' else room_membership_id(room_id, user_id)
+        items = backend.batch_get(deadline, ROOM_TABLE, [access_id])
+        if role == 'TEACHER':
+            allowed = access_id in items and room_owner_id(serialize_dynamo_to_dict(items[access_id])) == user_id
+        else:
+            allowed = access_id in items
+        if not allowed:
+            logger.error("Conexión rechazada para el usuario %s en el room %s", user_id, room_id)
+            return Response(status_code=403, body={"error": "Acceso no autorizado a la room."}).to_dict()
+
+        dynamodb_client.call(deadline, 'transact_write_items',
+                             TransactItems=register_connection_actions(room_id, connection_id, user_id, role))
+
+        logger.info("Conexión %s registrada en el room %s para el usuario %s", connection_id, room_id, user_id)
+        return Response(status_code=200, body={'message': 'Conectado'}).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
+    except Exception as e:
+        logger.error("Error inesperado en el servidor: %s", e)
+        return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
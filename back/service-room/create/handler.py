@@ -1,28 +1,81 @@
 import json
-import logging
+import time
 import uuid
-import boto3
 from datetime import datetime
 from utils.validator import get_validator_create_room
 from utils.response import Response
 from utils.token import get_token_instance
-from utils.config import ROOM_TABLE, ROLES_PERMITED_CREATE_ROOM
+from utils.config import (ROOM_TABLE, ROLES_PERMITED_CREATE_ROOM, JOIN_CODE_TTL_SECONDS, JOIN_CODE_MAX_ATTEMPTS,
+                          HEADERS_RESPONSE_DEFAULT, IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_CACHE_SIZE,
+                          IDEMPOTENCY_CACHE_TTL_SECONDS)
 from utils.dynamo_utils import serialize_to_dynamo
-
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
+from utils.room_stats import stats_increment_action
+from utils.join_codes import generate_join_code, join_code_put_action
+from utils.idempotency import (get_idempotency_key, idempotency_item_key, request_fingerprint, idempotency_put_action,
+                               stored_response_from_item)
+from utils.cache import TTLCache
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled
+from utils.sharding import user_partition_key
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
 
 validator_create_room = get_validator_create_room()
 token_validator = get_token_instance()
 
-dynamodb_client = boto3.client('dynamodb')
+dynamodb_client = DynamoClientPool()
 
+# (user_id, clave) -> respuesta guardada; los reintentos suelen llegar al mismo contenedor caliente
+idempotency_cache = TTLCache(max_size=IDEMPOTENCY_CACHE_SIZE, ttl_seconds=IDEMPOTENCY_CACHE_TTL_SECONDS)
 
 
+def find_stored_response(deadline, user_id: str, key: str):
+    """
+    Busca la respuesta guardada para la clave de idempotencia, primero en la caché del contenedor y luego
+    con un GetItem consistente. Devuelve (huella, status_code, body, expires_at) o None.
+    """
+    stored = idempotency_cache.get((user_id, key))
+    if stored is not None:
+        return stored
+
+    response = dynamodb_client.call(deadline, 'get_item', TableName=ROOM_TABLE,
+                                    Key=idempotency_item_key(user_id, key), ConsistentRead=True)
+    if 'Item' not in response:
+        return None
+    stored = stored_response_from_item(response['Item'])
+    # El TTL de DynamoDB puede tardar en borrar el item, por eso se valida el vencimiento también aquí
+    if stored[3] <= time.time():
+        return None
+    idempotency_cache.set((user_id, key), stored)
+    return stored
+
+
+def replay_response(stored, fingerprint: str) -> dict:
+    """Devuelve la respuesta original, o un 422 si la clave se reutilizó con otro body."""
+    stored_fingerprint, status_code, body, _ = stored
+    if stored_fingerprint != fingerprint:
+        return Response(status_code=422, body={
+            'error': 'La clave de idempotencia ya se usó con una solicitud diferente.'}).to_dict()
+    return Response(status_code=status_code, body=dict(body),
+                    headers={**HEADERS_RESPONSE_DEFAULT, 'Idempotent-Replayed': 'true'}).to_dict()
+
+
+@logged
+@profiled
 def lambda_handler(event, context):
     """
     Esta función crea un room (sala) en la base de datos DynamoDB
+
+    Si la solicitud trae el encabezado Idempotency-Key, la respuesta se guarda en la misma transacción que
+    el room y los reintentos con la misma clave reciben esa respuesta sin crear otro room.
     """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dynamodb_client, token_validator=token_validator,
+                               validators=[validator_create_room])
+
     try:
         body = event.get('body')
 
@@ -34,7 +87,7 @@ def lambda_handler(event, context):
                 'error': 'El cuerpo de la solicitud debe contener los parámetros requeridos.'}).to_dict()
 
         if not validator_create_room.validate(data=body,param_field='body'):
-            logger.error(f"Errores de validación: {validator_create_room.get_errors()}")
+            logger.error("Errores de validación: %s", validator_create_room.get_errors())
             return Response(status_code=400, body={'error': 'Fallo en la validación de los datos proporcionados.',
                                                    'details': validator_create_room.get_errors()}).to_dict()
 
@@ -48,43 +101,97 @@ def lambda_handler(event, context):
         try:
             jwt_decode = token_validator.decode_token(token)
         except ValueError as e:
-            logger.error(f"Error al decodificar el token JWT: {str(e)}")
+            logger.error("Error al decodificar el token JWT: %s", e)
             return Response(status_code=401, body={"error": str(e)}).to_dict()
 
         user_id = jwt_decode.get('id')
         role = jwt_decode.get('role')
         if not user_id or not role:
-            logger.error(f"Faltan los campos user_id o role: {user_id}, {role}")
+            logger.error("Faltan los campos user_id o role: %s, %s", user_id, role)
             return Response(status_code=401, body={"error": "Faltan los campos de usuario (ID) o rol."}).to_dict()
 
         if role not in ROLES_PERMITED_CREATE_ROOM:
-            logger.error(f"Rol no permitido: {role}")
+            logger.error("Rol no permitido: %s", role)
             return Response(status_code=401, body={"error": "Rol no permitido para crear un room."}).to_dict()
 
+        try:
+            idempotency_key = get_idempotency_key(headers)
+        except ValueError as e:
+            return Response(status_code=400, body={'error': str(e)}).to_dict()
+
+        if idempotency_key:
+            fingerprint = request_fingerprint(body)
+            stored = find_stored_response(deadline, user_id, idempotency_key)
+            if stored is not None:
+                logger.info("Reintento con clave de idempotencia %s, se devuelve la respuesta original",
+                            idempotency_key)
+                return replay_response(stored, fingerprint)
+
+        room_id = str(uuid.uuid4())  # ID único para el room
+        created_at = datetime.utcnow().isoformat()
         room_data = {
             **body,  # Todos los datos validados del body
-            'id': str(uuid.uuid4()),  # ID único para el room
-            'user_id': user_id,
-            'created_at': datetime.utcnow().isoformat(),  # Fecha de creación
+            'id': room_id,
+            'user_id': user_partition_key(user_id, room_id),  # user_id#<shard> si el docente está repartido
+            'created_at': created_at,  # Fecha de creación
+            'updated_at': created_at,  # Cada edición lo renueva; es la marca de la sincronización incremental
+            'sync_user_id': user_id,  # Clave de ROOM_GSI_INDEX_SYNC, siempre sin shard
+            'version': 1,  # Versión para las actualizaciones parciales con control optimista
+            'join_code_expires_at': int(time.time()) + JOIN_CODE_TTL_SECONDS
         }
 
-        room_data_serialized = serialize_to_dynamo(room_data)
-
-        try:
-            dynamodb_client.put_item(
-                TableName=ROOM_TABLE,
-                Item=room_data_serialized,
-                ConditionExpression="attribute_not_exists(id)"  # Evita la sobrescritura si el id ya existe
-            )
-            logger.info(f"Room creado exitosamente: {room_data['id']} en la tabla {ROOM_TABLE}")
-
-            return Response(status_code=200, body={'message': 'Room creado exitosamente', 'id': room_data['id']}).to_dict()
-
-        except dynamodb_client.exceptions.ConditionalCheckFailedException:
-            logger.error(f"El ID del room {room_data['id']} ya existe.")
-            return Response(status_code=400, body={'error': f'El ID {room_data["id"]} ya está en uso.'}).to_dict()
+        for _ in range(JOIN_CODE_MAX_ATTEMPTS):
+            room_data['join_code'] = generate_join_code()
+            response_body = {'message': 'Room creado exitosamente', 'id': room_id, 'join_code': room_data['join_code'],
+                             'join_code_expires_at': room_data['join_code_expires_at']}
+
+            # El room, su código de acceso y el contador del docente se escriben en la misma transacción
+            transact_items = [
+                {'Put': {
+                    'TableName': ROOM_TABLE,
+                    'Item': serialize_to_dynamo(room_data),
+                    'ConditionExpression': "attribute_not_exists(id)"  # Evita la sobrescritura si el id ya existe
+                }},
+                {'Put': join_code_put_action(room_data['join_code'], room_id, room_data['join_code_expires_at'])},
+                {'Update': stats_increment_action(user_id, room_data['course'])}
+            ]
+            if idempotency_key:
+                stored = (fingerprint, 200, response_body, int(time.time()) + IDEMPOTENCY_TTL_SECONDS)
+                transact_items.append({'Put': idempotency_put_action(user_id, idempotency_key, *stored)})
+
+            try:
+                dynamodb_client.call(deadline, 'transact_write_items', TransactItems=transact_items)
+                logger.info("Room creado exitosamente: %s en la tabla %s", room_id, ROOM_TABLE)
+                if idempotency_key:
+                    idempotency_cache.set((user_id, idempotency_key), stored)
+
+                return Response(status_code=200, body=response_body).to_dict()
+
+            except dynamodb_client.exceptions.TransactionCanceledException as e:
+                reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+                if reasons[:1] == ['ConditionalCheckFailed']:
+                    logger.error("El ID del room %s ya existe.", room_id)
+                    return Response(status_code=400, body={'error': f'El ID {room_id} ya está en uso.'}).to_dict()
+                if reasons[3:4] == ['ConditionalCheckFailed']:
+                    # Otra solicitud con la misma clave se escribió primero: se devuelve su respuesta
+                    stored = find_stored_response(deadline, user_id, idempotency_key)
+                    if stored is not None:
+                        return replay_response(stored, fingerprint)
+                    raise
+                if reasons[1:2] == ['ConditionalCheckFailed']:
+                    logger.info("Colisión del código %s, se genera otro.", room_data['join_code'])
+                    continue
+                raise
+
+        logger.error("No se pudo asignar un código de acceso único al room %s", room_id)
+        return Response(status_code=503, body={'error': 'No se pudo generar un código de acceso, intente nuevamente.'}).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
 
     except Exception as e:
-        logger.error(f"Error inesperado en el servidor: {e}")
+        logger.error("Error inesperado en el servidor: %s", e)
         return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
 
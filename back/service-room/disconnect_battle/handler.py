@@ -0,0 +1,50 @@
+from utils.response import Response
+from utils.config import ROOM_TABLE
+from utils.connections import connection_key, connection_from_item, unregister_connection_actions
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+dynamodb_client = DynamoClientPool()
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Ruta $disconnect de la API WebSocket de batallas: quita la conexión del registro de su room.
+
+    API Gateway no garantiza esta invocación (por ejemplo si el cliente pierde la red); esas conexiones
+    las limpia el broadcaster cuando post_to_connection responde GoneException.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dynamodb_client)
+
+    try:
+        connection_id = (event.get('requestContext') or {}).get('connectionId')
+        if not connection_id:
+            return Response(status_code=400, body={"error": "Falta el identificador de la conexión."}).to_dict()
+
+        response = dynamodb_client.call(deadline, 'get_item', TableName=ROOM_TABLE, Key=connection_key(connection_id))
+        connection = connection_from_item(response.get('Item'))
+        if connection is None:
+            return Response(status_code=200, body={'message': 'Conexión no registrada'}).to_dict()
+
+        dynamodb_client.call(deadline, 'transact_write_items',
+                             TransactItems=unregister_connection_actions(connection['room_id'], connection_id))
+
+        logger.info("Conexión %s quitada del room %s", connection_id, connection['room_id'])
+        return Response(status_code=200, body={'message': 'Desconectado'}).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
+    except Exception as e:
+        logger.error("Error inesperado en el servidor: %s", e)
+        return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
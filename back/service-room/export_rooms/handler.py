@@ -0,0 +1,109 @@
+from utils.response import Response, RawResponse
+from utils.token import get_token_instance
+from utils.config import ROLES_PERMITED_CREATE_ROOM, EXPORT_MAX_RESPONSE_BYTES, EXPORT_MIN_REMAINING_MS
+from utils.dynamo_utils import encode_last_evaluated_key, decode_last_evaluated_key
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled, stage
+from utils.room_export import iter_room_pages, iter_ndjson_lines, iter_ndjson_chunks
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+token_validator = get_token_instance()
+
+dynamodb_client = DynamoClientPool()
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Exporta todos los rooms del docente en formato NDJSON (un room por línea).
+
+    Las páginas de ROOM_GSI_INDEX_USERID_ID se leen con prefetch y se codifican en bloques, así que la memoria
+    no depende de cuántos rooms tenga el docente. Como la respuesta de Lambda tiene un tamaño máximo, si la
+    exportación no cabe en una invocación (por tamaño o por tiempo) se devuelve el encabezado X-Export-Cursor
+    para continuar con el parámetro cursor en la siguiente llamada.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dynamodb_client, token_validator=token_validator)
+
+    try:
+        headers = event.get('headers')
+        if not headers or 'Authorization' not in headers:
+            logger.error("Falta el encabezado de autorización en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el encabezado de autorización."}).to_dict()
+
+        token = token_validator.remove_bearer_prefix(headers['Authorization'])
+
+        try:
+            jwt_decode = token_validator.decode_token(token)
+        except ValueError as e:
+            logger.error("Error al decodificar el token JWT: %s", e)
+            return Response(status_code=401, body={"error": "Token JWT inválido."}).to_dict()
+
+        user_id = jwt_decode.get('id')
+        role = jwt_decode.get('role')
+
+        if not user_id or not role:
+            logger.error("Faltan los campos user_id o role: %s, %s", user_id, role)
+            return Response(status_code=401, body={"error": "Faltan los campos de usuario (ID) o rol."}).to_dict()
+
+        if role not in ROLES_PERMITED_CREATE_ROOM:
+            logger.error("Rol no permitido: %s", role)
+            return Response(status_code=403, body={"error": "Rol no permitido para realizar esta acción."}).to_dict()
+
+        query_params = event.get('queryStringParameters') or {}
+        cursor = query_params.get('cursor')
+        try:
+            start_key = decode_last_evaluated_key(cursor) if cursor else None
+            pages = iter_room_pages(dynamodb_client, deadline, user_id, start_key)
+        except ValueError as e:
+            logger.error("Cursor de exportación inválido para el usuario %s: %s", user_id, e)
+            return Response(status_code=400, body={"error": "Cursor de exportación inválido."}).to_dict()
+        chunks = iter_ndjson_chunks(iter_ndjson_lines(pages))
+
+        body = []
+        size = 0
+        next_cursor = None
+        exhausted = False
+        try:
+            with stage('stream'):
+                for last_key, chunk in chunks:
+                    body.append(chunk)
+                    size += len(chunk)
+                    if size >= EXPORT_MAX_RESPONSE_BYTES or deadline.remaining_ms() < EXPORT_MIN_REMAINING_MS:
+                        next_cursor = encode_last_evaluated_key(last_key)
+                        break
+                else:
+                    exhausted = True
+        except DeadlineExceeded:
+            if not body:
+                raise
+            # Lo ya codificado se entrega y el cliente continúa desde el último bloque completo
+            logger.error("Exportación parcial por deadline para el usuario %s", user_id)
+        finally:
+            chunks.close()
+
+        response_headers = {}
+        if not exhausted and next_cursor is None and body:
+            next_cursor = encode_last_evaluated_key(last_key)
+        if next_cursor:
+            response_headers['X-Export-Cursor'] = next_cursor
+            response_headers['Access-Control-Expose-Headers'] = 'X-Export-Cursor'
+
+        response = RawResponse(status_code=200, body=b''.join(body).decode('utf-8'),
+                               content_type='application/x-ndjson')
+        response.set_headers({**response.headers, **response_headers})
+        return response.to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
+    except Exception as e:
+        logger.error("Error inesperado en el servidor: %s", e)
+        return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
@@ -0,0 +1,39 @@
+from utils.response import Response, RawResponse
+from utils.config import HEADERS_RESPONSE_DEFAULT, CATALOG_MANIFEST_CACHE_CONTROL
+from utils.catalog import get_catalog
+from utils.question_banks import if_none_match_matches
+from utils.deadline import Deadline
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+catalog = get_catalog()  # En el cold start, no en la primera solicitud
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Manifiesto del catálogo del juego: la versión y, por cada sección (heroes, villains, missions), el hash
+    y la ruta de su bundle inmutable. Es público, igual que el contenido que antes venía dentro de la app.
+
+    El cliente lo pide con If-None-Match y recibe 304 mientras el catálogo no cambie; cuando cambia, solo
+    descarga los bundles cuyo hash no tiene guardado.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline)
+
+    try:
+        response_headers = {**HEADERS_RESPONSE_DEFAULT, 'ETag': catalog.etag,
+                            'Cache-Control': CATALOG_MANIFEST_CACHE_CONTROL, 'Access-Control-Expose-Headers': 'ETag'}
+        if if_none_match_matches(event.get('headers'), catalog.etag):
+            return RawResponse(status_code=304, body='', headers=response_headers).to_dict()
+        return RawResponse(status_code=200, body=catalog.manifest, content_type='application/json',
+                           headers=response_headers).to_dict()
+
+    except Exception as e:
+        logger.error("Error inesperado en el servidor: %s", e)
+        return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
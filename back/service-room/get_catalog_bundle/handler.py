@@ -0,0 +1,46 @@
+from utils.response import Response, RawResponse
+from utils.config import HEADERS_RESPONSE_DEFAULT, CATALOG_BUNDLE_CACHE_CONTROL
+from utils.catalog import get_catalog
+from utils.question_banks import if_none_match_matches
+from utils.deadline import Deadline
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+catalog = get_catalog()  # En el cold start, no en la primera solicitud
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Bundle del catálogo por hash de contenido (catalog/bundles/{hash}).
+
+    Como el hash cambia con el contenido, la respuesta se marca immutable con un año de max-age: el
+    navegador o la CDN no vuelven a pedirla. Un hash que no es de la versión actual (por ejemplo, de un
+    manifiesto viejo) responde 404 sin cache, y el cliente vuelve a leer el manifiesto.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline)
+
+    try:
+        content_hash = (event.get('pathParameters') or {}).get('hash')
+        body = catalog.bundle(content_hash) if content_hash else None
+        if body is None:
+            return Response(status_code=404, body={"error": "Bundle no encontrado."},
+                            headers={**HEADERS_RESPONSE_DEFAULT, 'Cache-Control': 'no-store'}).to_dict()
+
+        etag = f'"{content_hash}"'
+        response_headers = {**HEADERS_RESPONSE_DEFAULT, 'ETag': etag, 'Cache-Control': CATALOG_BUNDLE_CACHE_CONTROL,
+                            'Access-Control-Expose-Headers': 'ETag'}
+        if if_none_match_matches(event.get('headers'), etag):
+            return RawResponse(status_code=304, body='', headers=response_headers).to_dict()
+        return RawResponse(status_code=200, body=body.decode('utf-8'), content_type='application/json',
+                           headers=response_headers).to_dict()
+
+    except Exception as e:
+        logger.error("Error inesperado en el servidor: %s", e)
+        return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
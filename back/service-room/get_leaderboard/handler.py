@@ -0,0 +1,84 @@
+from utils.response import Response
+from utils.token import get_token_instance
+from utils.config import (ROOM_TABLE, ROLES_PERMITED_VIEW_LEADERBOARD, LEADERBOARD_CACHE_SIZE,
+                          LEADERBOARD_CACHE_TTL_SECONDS)
+from utils.cache import TTLCache
+from utils.leaderboard import leaderboard_item_key, leaderboard_from_item
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+token_validator = get_token_instance()
+
+dynamodb_client = DynamoClientPool()
+
+# Durante una batalla toda la clase consulta el mismo leaderboard; unos segundos de atraso evitan una lectura por pedido
+leaderboard_cache = TTLCache(max_size=LEADERBOARD_CACHE_SIZE, ttl_seconds=LEADERBOARD_CACHE_TTL_SECONDS)
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Devuelve el top-K precalculado de un room con un solo GetItem.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dynamodb_client, token_validator=token_validator)
+
+    try:
+        headers = event.get('headers')
+        if not headers or 'Authorization' not in headers:
+            logger.error("Falta el encabezado de autorización en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el encabezado de autorización."}).to_dict()
+
+        token = token_validator.remove_bearer_prefix(headers['Authorization'])
+
+        try:
+            jwt_decode = token_validator.decode_token(token)
+        except ValueError as e:
+            logger.error("Error al decodificar el token JWT: %s", e)
+            return Response(status_code=401, body={"error": "Token JWT inválido."}).to_dict()
+
+        user_id = jwt_decode.get('id')
+        role = jwt_decode.get('role')
+
+        if not user_id or not role:
+            logger.error("Faltan los campos user_id o role: %s, %s", user_id, role)
+            return Response(status_code=401, body={"error": "Faltan los campos de usuario (ID) o rol."}).to_dict()
+
+        if role not in ROLES_PERMITED_VIEW_LEADERBOARD:
+            logger.error("Rol no permitido: %s", role)
+            return Response(status_code=403, body={"error": "Rol no permitido para realizar esta acción."}).to_dict()
+
+        path_parameters = event.get('pathParameters')
+        if not path_parameters or 'roomId' not in path_parameters:
+            logger.error("Falta el parámetro roomId en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el parámetro roomId en la solicitud."}).to_dict()
+
+        room_id = path_parameters.get('roomId')
+
+        leaderboard = leaderboard_cache.get(room_id)
+        if leaderboard is None:
+            response = dynamodb_client.call(deadline, 'get_item', TableName=ROOM_TABLE,
+                                            Key=leaderboard_item_key(room_id))
+            entries, version = leaderboard_from_item(response.get('Item'))
+            leaderboard = {
+                'entries': [{'rank': rank, **entry} for rank, entry in enumerate(entries, start=1)],
+                'version': version
+            }
+            leaderboard_cache.set(room_id, leaderboard)
+
+        return Response(status_code=200, body={'message': 'Leaderboard obtenido', 'data': leaderboard}).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
+    except Exception as e:
+        logger.error("Error inesperado en el servidor: %s", e)
+        return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
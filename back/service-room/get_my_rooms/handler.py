@@ -0,0 +1,81 @@
+from utils.response import Response
+from utils.token import get_token_instance
+from utils.config import ROLES_PERMITED_LIST_MY_ROOMS, LIMIT_PAGE_SIZE
+from utils.dynamo_utils import read_page_params, page_data
+from utils.repository import get_backend
+from utils.room_repository import RoomRepository, room_to_dict
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+token_validator = get_token_instance()
+
+dynamodb_client = DynamoClientPool()
+backend = get_backend(dynamodb_client)
+
+ROOM_PUBLIC_FIELDS = ('id', 'name', 'course', 'topic', 'description')
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Devuelve, paginados, los rooms a los que se unió el estudiante (el más reciente primero).
+    Usa los mismos parámetros size y last_evaluated_key que rooms/get.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dynamodb_client, token_validator=token_validator)
+
+    try:
+        headers = event.get('headers')
+        if not headers or 'Authorization' not in headers:
+            logger.error("Falta el encabezado de autorización en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el encabezado de autorización."}).to_dict()
+
+        token = token_validator.remove_bearer_prefix(headers['Authorization'])
+
+        try:
+            jwt_decode = token_validator.decode_token(token)
+        except ValueError as e:
+            logger.error("Error al decodificar el token JWT: %s", e)
+            return Response(status_code=401, body={"error": "Token JWT inválido."}).to_dict()
+
+        user_id = jwt_decode.get('id')
+        role = jwt_decode.get('role')
+
+        if not user_id or not role:
+            logger.error("Faltan los campos user_id o role: %s, %s", user_id, role)
+            return Response(status_code=401, body={"error": "Faltan los campos de usuario (ID) o rol."}).to_dict()
+
+        if role not in ROLES_PERMITED_LIST_MY_ROOMS:
+            logger.error("Rol no permitido: %s", role)
+            return Response(status_code=403, body={"error": "Rol no permitido para realizar esta acción."}).to_dict()
+
+        try:
+            size, start_key = read_page_params(event.get('queryStringParameters') or {}, LIMIT_PAGE_SIZE)
+        except ValueError as e:
+            logger.error("Parámetros de paginación inválidos: %s", e)
+            return Response(status_code=400, body={"error": str(e)}).to_dict()
+
+        memberships, last_evaluated_key = RoomRepository(backend, deadline).list_for_student(user_id, limit=size,
+                                                                                            start_key=start_key)
+        rooms = []
+        for room, joined_at in memberships:
+            room_data = room_to_dict(room)
+            rooms.append({**{field: room_data[field] for field in ROOM_PUBLIC_FIELDS if field in room_data},
+                          'joined_at': joined_at})
+
+        return Response(status_code=200, body={"data": page_data('rooms', rooms, size, last_evaluated_key)}).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
+    except Exception as e:
+        logger.error("Error inesperado en el servidor: %s", e)
+        return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
@@ -0,0 +1,142 @@
+import json
+from utils.response import Response, RawResponse
+from utils.token import get_token_instance
+from utils.config import (ROOM_TABLE, ROLES_PERMITED_VIEW_QUESTION_BANK, QBANK_CACHE_SIZE, QBANK_CACHE_TTL_SECONDS,
+                          HEADERS_RESPONSE_DEFAULT)
+from utils.repository import get_backend
+from utils.dynamo_utils import serialize_dynamo_to_dict
+from utils.archive import room_owner_id
+from utils.memberships import room_membership_id
+from utils.cache import TTLCache
+from utils.question_banks import (manifest_id, chunk_ids_of, blob_from_items, decode_question_bank, etag_of,
+                                  without_answers, if_none_match_matches)
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled, stage
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+token_validator = get_token_instance()
+
+dynamodb_client = DynamoClientPool()
+backend = get_backend(dynamodb_client)
+
+# (hash del contenido, variante) -> body ya serializado; al estar indexado por hash nunca queda desactualizado
+question_bank_cache = TTLCache(max_size=QBANK_CACHE_SIZE, ttl_seconds=QBANK_CACHE_TTL_SECONDS)
+
+STUDENT_VARIANT = '-student'
+
+
+def render_question_bank(deadline, manifest: dict, variant: str) -> str:
+    """
+    Lee los bloques (si los hay), descomprime y arma el body. Solo se llama cuando el cliente no tiene la
+    versión actual y el contenedor no la tiene ya armada.
+    """
+    cache_key = (manifest['content_hash']['S'], variant)
+    cached = question_bank_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    chunk_ids = chunk_ids_of(manifest)
+    chunks = backend.batch_get(deadline, ROOM_TABLE, chunk_ids) if chunk_ids else {}
+    with stage('decode'):
+        raw = decode_question_bank(blob_from_items(manifest, chunks))
+        if variant == STUDENT_VARIANT:
+            bank_json = json.dumps(without_answers(json.loads(raw)), ensure_ascii=False)
+        else:
+            # El docente recibe el JSON canónico tal como se guardó, sin volver a parsearlo
+            bank_json = raw.decode('utf-8')
+        body = f'{{"data": {bank_json}}}'
+
+    question_bank_cache.set(cache_key, body)
+    return body
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Devuelve el banco de preguntas de un room (GET rooms/{roomId}/questions) al docente dueño o a un estudiante
+    miembro; a los estudiantes sin la respuesta correcta de cada pregunta.
+
+    La respuesta lleva un ETag con el hash del contenido: si el cliente manda If-None-Match con ese valor se
+    responde 304 sin leer los bloques ni descomprimir.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dynamodb_client, token_validator=token_validator)
+
+    try:
+        headers = event.get('headers')
+        if not headers or 'Authorization' not in headers:
+            logger.error("Falta el encabezado de autorización en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el encabezado de autorización."}).to_dict()
+
+        token = token_validator.remove_bearer_prefix(headers['Authorization'])
+
+        try:
+            jwt_decode = token_validator.decode_token(token)
+        except ValueError as e:
+            logger.error("Error al decodificar el token JWT: %s", e)
+            return Response(status_code=401, body={"error": "Token JWT inválido."}).to_dict()
+
+        user_id = jwt_decode.get('id')
+        role = jwt_decode.get('role')
+
+        if not user_id or not role:
+            logger.error("Faltan los campos user_id o role: %s, %s", user_id, role)
+            return Response(status_code=401, body={"error": "Faltan los campos de usuario (ID) o rol."}).to_dict()
+
+        if role not in ROLES_PERMITED_VIEW_QUESTION_BANK:
+            logger.error("Rol no permitido: %s", role)
+            return Response(status_code=403, body={"error": "Rol no permitido para realizar esta acción."}).to_dict()
+
+        path_parameters = event.get('pathParameters')
+        if not path_parameters or 'roomId' not in path_parameters:
+            logger.error("Falta el parámetro roomId en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el parámetro roomId en la solicitud."}).to_dict()
+
+        room_id = path_parameters.get('roomId')
+
+        # El manifiesto y el item que autoriza (el room para el docente, la membresía para el estudiante)
+        # se leen juntos en un solo BatchGetItem
+        access_id = room_id if role == 'TEACHER' else room_membership_id(room_id, user_id)
+        items = backend.batch_get(deadline, ROOM_TABLE, [manifest_id(room_id), access_id])
+
+        if role == 'TEACHER':
+            room = serialize_dynamo_to_dict(items[access_id]) if access_id in items else None
+            if room is None:
+                logger.error("Room no encontrado con ID: %s", room_id)
+                return Response(status_code=404, body={'error': 'Room no encontrado.'}).to_dict()
+            allowed = room_owner_id(room) == user_id
+        else:
+            allowed = access_id in items
+        if not allowed:
+            logger.error("Acceso no autorizado para el usuario %s al banco del room %s", user_id, room_id)
+            return Response(status_code=403, body={"error": "Acceso no autorizado a la room."}).to_dict()
+
+        manifest = items.get(manifest_id(room_id))
+        if manifest is None:
+            return Response(status_code=404, body={'error': 'El room no tiene banco de preguntas.'}).to_dict()
+
+        variant = '' if role == 'TEACHER' else STUDENT_VARIANT
+        etag = etag_of(manifest['content_hash']['S'], variant)
+        response_headers = {**HEADERS_RESPONSE_DEFAULT, 'ETag': etag, 'Cache-Control': 'private, no-cache',
+                            'Access-Control-Expose-Headers': 'ETag'}
+
+        if if_none_match_matches(headers, etag):
+            return RawResponse(status_code=304, body='', headers=response_headers).to_dict()
+
+        body = render_question_bank(deadline, manifest, variant)
+        return RawResponse(status_code=200, body=body, content_type='application/json',
+                           headers=response_headers).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
+    except Exception as e:
+        logger.error("Error inesperado en el servidor: %s", e)
+        return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
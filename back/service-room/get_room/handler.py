@@ -1,20 +1,30 @@
-import logging
-import boto3
 from utils.response import Response
 from utils.token import get_token_instance
-from utils.config import ROOM_TABLE, ROLES_PERMITED_CREATE_ROOM
-from utils.dynamo_utils import serialize_dynamo_to_dict
+from utils.config import ROLES_PERMITED_CREATE_ROOM
+from utils.repository import get_backend
+from utils.room_repository import RoomRepository, room_to_dict
+from utils.archive import room_owner_id
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled
+from utils.structured_log import get_logger, logged
 
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
+logger = get_logger(__name__)
 
 
 token_validator = get_token_instance()
 
-dynamodb_client = boto3.client('dynamodb')
+dynamodb_client = DynamoClientPool()
+backend = get_backend(dynamodb_client)
 
 # Esta función maneja la solicitud de obtener los datos de una "room" desde DynamoDB
+@logged
+@profiled
 def lambda_handler(event, context):
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dynamodb_client, token_validator=token_validator)
+
     try:
         headers = event.get('headers')
         if not headers or 'Authorization' not in headers:
@@ -27,14 +37,14 @@ def lambda_handler(event, context):
         try:
             jwt_decode = token_validator.decode_token(token)
         except ValueError as e:
-            logger.error(f"Error al decodificar el token JWT: {str(e)}")
+            logger.error("Error al decodificar el token JWT: %s", e)
             return Response(status_code=401, body={"error": "Token JWT inválido."}).to_dict()
 
         user_id = jwt_decode.get('id')
         role = jwt_decode.get('role')
 
         if not user_id or not role:
-            logger.error(f"Faltan los campos user_id o role: {user_id}, {role}")
+            logger.error("Faltan los campos user_id o role: %s, %s", user_id, role)
             return Response(status_code=401, body={"error": "Faltan los campos de usuario (ID) o rol."}).to_dict()
 
         pathParameter = event.get("pathParameters")
@@ -44,29 +54,25 @@ def lambda_handler(event, context):
 
         room_id = pathParameter.get('roomId')
 
-        response = dynamodb_client.query(
-            TableName=ROOM_TABLE,
-            KeyConditionExpression='id = :id',
-            ExpressionAttributeValues={
-                ':id': {'S': room_id}
-            }
-        )
+        room = RoomRepository(backend, deadline).get(room_id)
 
-        if 'Items' not in response or len(response['Items']) == 0:
-            logger.error(f"Room no encontrado con ID: {room_id}")
+        if room is None:
+            logger.error("Room no encontrado con ID: %s", room_id)
             return Response(status_code=404, body={'error': 'Room no encontrado.'}).to_dict()
 
-        room_data = response['Items'][0]
-        room_data = serialize_dynamo_to_dict(room_data)
-
-        if role not in ROLES_PERMITED_CREATE_ROOM or room_data["user_id"] != user_id:
-            logger.error(f"Acceso no autorizado para el usuario {user_id} a la room con ID: {room_id}")
+        if role not in ROLES_PERMITED_CREATE_ROOM or room_owner_id(room) != user_id:
+            logger.error("Acceso no autorizado para el usuario %s a la room con ID: %s", user_id, room_id)
             return Response(status_code=403, body={"error": "Acceso no autorizado a la room."}).to_dict()
 
-        return Response(status_code=200, body={'message': 'Datos obtenidos correctamente', 'data': room_data}).to_dict()
+        return Response(status_code=200, body={'message': 'Datos obtenidos correctamente', 'data': room_to_dict(room)}).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
 
     except Exception as e:
-        logger.error(f"Error inesperado en el servidor: {str(e)}")
+        logger.error("Error inesperado en el servidor: %s", e)
         return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
 
 
@@ -1,27 +1,37 @@
-import json
-import logging
-import boto3
-import base64
 from utils.response import Response
 from utils.token import get_token_instance
-from utils.config import ROOM_TABLE, ROLES_PERMITED_CREATE_ROOM, LIMIT_PAGE_SIZE, ROOM_GSI_INDEX_USERID_ID
-from utils.dynamo_utils import serialize_dynamo_to_dict
-
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
+from utils.config import ROLES_PERMITED_CREATE_ROOM, LIMIT_PAGE_SIZE
+from utils.repository import get_backend
+from utils.room_repository import RoomRepository, room_to_dict
+from utils.dynamo_utils import read_page_params, page_data
+from utils.room_sync import sync_watermark
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled, stage
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
 
 token_validator = get_token_instance()
 
-dynamodb_client = boto3.client('dynamodb')
+dynamodb_client = DynamoClientPool()
+backend = get_backend(dynamodb_client)
 
+@logged
+@profiled
 def lambda_handler(event, context):
     """
         Función Lambda que maneja la consulta paginada de rooms en DynamoDB.
         Recibe parámetros como el tamaño de página (size) y un parámetro opcional last_evaluated_key
         para continuar la paginación desde donde quedó la consulta anterior.
         Valida la autorización del usuario y permite acceder a los datos de rooms de acuerdo a los permisos del rol.
+        La primera página incluye la marca (watermark) para continuar con rooms/sync.
     """
 
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dynamodb_client, token_validator=token_validator)
+
     try:
         headers = event.get('headers')
         if not headers or 'Authorization' not in headers:
@@ -34,66 +44,53 @@ def lambda_handler(event, context):
         try:
             jwt_decode = token_validator.decode_token(token)
         except ValueError as e:
-            logger.error(f"Error al decodificar el token JWT: {str(e)}")
+            logger.error("Error al decodificar el token JWT: %s", e)
             return Response(status_code=401, body={"error": "Token JWT inválido."}).to_dict()
 
         user_id = jwt_decode.get('id')
         role = jwt_decode.get('role')
 
         if not user_id or not role:
-            logger.error(f"Faltan los campos user_id o role: {user_id}, {role}")
+            logger.error("Faltan los campos user_id o role: %s, %s", user_id, role)
             return Response(status_code=401, body={"error": "Faltan los campos de usuario (ID) o rol."}).to_dict()
 
         if role not in ROLES_PERMITED_CREATE_ROOM:
-            logger.error(f"Rol no permitido: {role}")
+            logger.error("Rol no permitido: %s", role)
             return Response(status_code=403, body={"error": "Rol no permitido para realizar esta acción."}).to_dict()
 
         query_params = event.get('queryStringParameters')
         if not query_params:
             return Response(status_code=400, body={"error": "Parámetros de consulta no proporcionados."}).to_dict()
 
-        size = int(query_params.get('size', 10))  # Tamaño de página 10 por defecto
-
-        if size > LIMIT_PAGE_SIZE:
-            logger.error(f"El tamaño de página {size} excede el límite permitido de {LIMIT_PAGE_SIZE}.")
-            return Response(status_code=400, body={"error": f"El tamaño de página no puede ser mayor a {LIMIT_PAGE_SIZE}."}).to_dict()
-
-        last_evaluated_key = query_params.get('last_evaluated_key')  # Recibe el last_evaluated_key si está presente
-
-        query_params_for_dynamo = {
-            'TableName': ROOM_TABLE,
-            'IndexName': ROOM_GSI_INDEX_USERID_ID,
-            'KeyConditionExpression': 'user_id = :user_id',
-            'ExpressionAttributeValues': {
-                ':user_id': {'S': user_id}
-            },
-            'Limit': size
-        }
-
-        if last_evaluated_key:
-            last_evaluated_key = base64.b64decode(last_evaluated_key).decode('utf-8')
-            query_params_for_dynamo['ExclusiveStartKey'] = json.loads(last_evaluated_key)
-
-        response = dynamodb_client.query(**query_params_for_dynamo)
-
-        rooms = response.get('Items', [])
-        rooms = serialize_dynamo_to_dict(rooms)
-
-        last_evaluated_key = response.get('LastEvaluatedKey', None)
-
-        data = {
-            'rooms': rooms,
-            'size': size
-        }
-
-        if last_evaluated_key:
-            encoded_last_evaluated_key = base64.b64encode(json.dumps(last_evaluated_key).encode('utf-8')).decode('utf-8')
-            data['last_evaluated_key'] = encoded_last_evaluated_key
+        try:
+            size, start_key = read_page_params(query_params, LIMIT_PAGE_SIZE)  # Tamaño de página 10 por defecto
+        except ValueError as e:
+            logger.error("Parámetros de paginación inválidos: %s", e)
+            return Response(status_code=400, body={"error": str(e)}).to_dict()
 
-        return Response(status_code=200, body={"data": data}).to_dict()
+        # La primera página trae la marca desde la que el cliente sigue con rooms/sync
+        watermark = sync_watermark() if start_key is None else None
+        try:
+            with stage('query'):
+                records, last_evaluated_key = RoomRepository(backend, deadline).list_by_user(user_id, limit=size,
+                                                                                            start_key=start_key)
+        except ValueError as e:
+            logger.error("Cursor inválido para el usuario %s: %s", user_id, e)
+            return Response(status_code=400, body={"error": str(e)}).to_dict()
+        with stage('serialize'):
+            rooms = [room_to_dict(room) for room in records]
+            data = page_data('rooms', rooms, size, last_evaluated_key)
+            if watermark:
+                data['watermark'] = watermark
+            return Response(status_code=200, body={"data": data}).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
 
     except Exception as e:
-        logger.error(f"Error inesperado en el servidor: {str(e)}")
+        logger.error("Error inesperado en el servidor: %s", e)
         return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
 
 
@@ -0,0 +1,104 @@
+from utils.response import Response
+from utils.token import get_token_instance
+from utils.config import ROLES_PERMITED_SYNC_ROOMS, LIMIT_PAGE_SIZE
+from utils.repository import get_backend
+from utils.room_repository import RoomRepository, room_to_dict
+from utils.archive import is_archived
+from utils.dynamo_utils import read_page_params, page_data
+from utils.room_sync import (sync_watermark, parse_watermark, is_expired, changed_after, sync_cursor,
+                             read_sync_cursor)
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled, stage
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+token_validator = get_token_instance()
+
+dynamodb_client = DynamoClientPool()
+backend = get_backend(dynamodb_client)
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Sincronización incremental de los rooms del docente (GET rooms/sync?since=<marca>).
+
+    Devuelve solo los rooms creados o editados después de la marca (rooms) y los archivados después de ella
+    (removed, las lápidas), con una consulta por rango sobre updated_at en ROOM_GSI_INDEX_SYNC. La marca sale de
+    la primera página de rooms/get o de la última sincronización; la nueva llega en la última página (sin
+    last_evaluated_key). Una marca más antigua que SYNC_TOMBSTONE_RETENTION_DAYS responde 410: el cliente debe
+    recargar la lista completa.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dynamodb_client, token_validator=token_validator)
+
+    try:
+        headers = event.get('headers')
+        if not headers or 'Authorization' not in headers:
+            logger.error("Falta el encabezado de autorización en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el encabezado de autorización."}).to_dict()
+
+        token = token_validator.remove_bearer_prefix(headers['Authorization'])
+
+        try:
+            jwt_decode = token_validator.decode_token(token)
+        except ValueError as e:
+            logger.error("Error al decodificar el token JWT: %s", e)
+            return Response(status_code=401, body={"error": "Token JWT inválido."}).to_dict()
+
+        user_id = jwt_decode.get('id')
+        role = jwt_decode.get('role')
+
+        if not user_id or not role:
+            logger.error("Faltan los campos user_id o role: %s, %s", user_id, role)
+            return Response(status_code=401, body={"error": "Faltan los campos de usuario (ID) o rol."}).to_dict()
+
+        if role not in ROLES_PERMITED_SYNC_ROOMS:
+            logger.error("Rol no permitido: %s", role)
+            return Response(status_code=403, body={"error": "Rol no permitido para realizar esta acción."}).to_dict()
+
+        query_params = event.get('queryStringParameters') or {}
+        if not query_params.get('since'):
+            return Response(status_code=400, body={"error": "Falta el parámetro since."}).to_dict()
+
+        try:
+            since = parse_watermark(query_params['since'])
+            size, start_key = read_page_params(query_params, LIMIT_PAGE_SIZE)
+            if start_key is None:
+                watermark = sync_watermark()
+            else:
+                watermark, start_key = read_sync_cursor(start_key, user_id)
+        except ValueError as e:
+            logger.error("Parámetros de sincronización inválidos: %s", e)
+            return Response(status_code=400, body={"error": str(e)}).to_dict()
+
+        if is_expired(since):
+            logger.info("Marca de sincronización vencida para el usuario %s: %s", user_id, query_params['since'])
+            return Response(status_code=410, body={
+                "error": "La marca de sincronización es demasiado antigua; recarga la lista completa de rooms."
+            }).to_dict()
+
+        with stage('query'):
+            records, last_evaluated_key = RoomRepository(backend, deadline).list_changed_since(
+                user_id, changed_after(since), limit=size, start_key=start_key)
+        with stage('serialize'):
+            rooms = [room_to_dict(room) for room in records if not is_archived(room)]
+            removed = [{'id': room['id'], 'archived_at': room['archived_at']} for room in records if is_archived(room)]
+            data = page_data('rooms', rooms, size, sync_cursor(watermark, last_evaluated_key))
+            data['removed'] = removed
+            if not last_evaluated_key:
+                data['watermark'] = watermark
+            return Response(status_code=200, body={"data": data}).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
+    except Exception as e:
+        logger.error("Error inesperado en el servidor: %s", e)
+        return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
@@ -0,0 +1,145 @@
+import time
+from utils.response import Response
+from utils.token import get_token_instance
+from utils.config import (ROOM_TABLE, ROOM_TTL_ATTRIBUTE, ROLES_PERMITED_JOIN_ROOM, JOIN_CODE_CACHE_SIZE,
+                          JOIN_CODE_CACHE_TTL_SECONDS, MEMBERSHIP_CACHE_SIZE, MEMBERSHIP_CACHE_TTL_SECONDS)
+from utils.repository import get_backend
+from utils.room_repository import RoomRepository, room_to_dict
+from utils.archive import is_archived
+from utils.cache import TTLCache
+from utils.join_codes import normalize_join_code, join_code_key
+from utils.memberships import membership_put_actions
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+token_validator = get_token_instance()
+
+dynamodb_client = DynamoClientPool()
+backend = get_backend(dynamodb_client)
+
+# código -> (datos públicos del room, vencimiento del código); se comparte entre invocaciones del contenedor
+join_code_cache = TTLCache(max_size=JOIN_CODE_CACHE_SIZE, ttl_seconds=JOIN_CODE_CACHE_TTL_SECONDS)
+
+# (student_id, room_id) ya registrados, para no repetir la transacción cuando el estudiante vuelve a entrar
+membership_cache = TTLCache(max_size=MEMBERSHIP_CACHE_SIZE, ttl_seconds=MEMBERSHIP_CACHE_TTL_SECONDS)
+
+ROOM_PUBLIC_FIELDS = ('id', 'name', 'course', 'topic', 'description')
+
+
+def resolve_join_code(deadline, code: str):
+    """
+    Resuelve un código de acceso al room que referencia. Devuelve (room, expires_at) o None si el código
+    no existe o venció. El item del código se lee con un GetItem y el resultado queda en la caché del contenedor.
+    """
+    cached = join_code_cache.get(code)
+    if cached is not None:
+        return cached
+
+    response = dynamodb_client.call(deadline, 'get_item', TableName=ROOM_TABLE, Key=join_code_key(code))
+    item = response.get('Item')
+    # El TTL de DynamoDB puede tardar en borrar el item, por eso se valida el vencimiento también aquí
+    if not item or int(item[ROOM_TTL_ATTRIBUTE]['N']) <= time.time():
+        return None
+    expires_at = int(item[ROOM_TTL_ATTRIBUTE]['N'])
+
+    room = RoomRepository(backend, deadline).get(item['room_id']['S'])
+    # Un room archivado ya no admite nuevos ingresos aunque su código siga vigente, ni uno ya reemplazado
+    if room is None or is_archived(room) or room.get('join_code') != code:
+        return None
+
+    room = room_to_dict(room)
+    resolved = ({field: room[field] for field in ROOM_PUBLIC_FIELDS if field in room}, expires_at)
+    join_code_cache.set(code, resolved, ttl_seconds=min(JOIN_CODE_CACHE_TTL_SECONDS, expires_at - time.time()))
+    return resolved
+
+
+def record_membership(deadline, room_id: str, student_id: str, username: str) -> bool:
+    """
+    Registra la membresía del estudiante en el room. Devuelve True si es nueva y False si ya existía.
+    """
+    if membership_cache.get((student_id, room_id)):
+        return False
+    try:
+        dynamodb_client.call(deadline, 'transact_write_items',
+                             TransactItems=membership_put_actions(room_id, student_id, username))
+        joined = True
+    except dynamodb_client.exceptions.TransactionCanceledException as e:
+        reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+        if reasons[:1] != ['ConditionalCheckFailed']:
+            raise
+        joined = False
+    membership_cache.set((student_id, room_id), True)
+    return joined
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Permite a un estudiante (o docente) entrar a un room con su código corto de acceso.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dynamodb_client, token_validator=token_validator)
+
+    try:
+        headers = event.get('headers')
+        if not headers or 'Authorization' not in headers:
+            logger.error("Falta el encabezado de autorización en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el encabezado de autorización."}).to_dict()
+
+        token = token_validator.remove_bearer_prefix(headers['Authorization'])
+
+        try:
+            jwt_decode = token_validator.decode_token(token)
+        except ValueError as e:
+            logger.error("Error al decodificar el token JWT: %s", e)
+            return Response(status_code=401, body={"error": "Token JWT inválido."}).to_dict()
+
+        user_id = jwt_decode.get('id')
+        role = jwt_decode.get('role')
+
+        if not user_id or not role:
+            logger.error("Faltan los campos user_id o role: %s, %s", user_id, role)
+            return Response(status_code=401, body={"error": "Faltan los campos de usuario (ID) o rol."}).to_dict()
+
+        if role not in ROLES_PERMITED_JOIN_ROOM:
+            logger.error("Rol no permitido: %s", role)
+            return Response(status_code=403, body={"error": "Rol no permitido para realizar esta acción."}).to_dict()
+
+        path_parameters = event.get('pathParameters')
+        if not path_parameters or 'code' not in path_parameters:
+            logger.error("Falta el parámetro code en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el parámetro code en la solicitud."}).to_dict()
+
+        code = normalize_join_code(path_parameters.get('code'))
+        if not code:
+            return Response(status_code=400, body={"error": "El código de acceso no tiene un formato válido."}).to_dict()
+
+        resolved = resolve_join_code(deadline, code)
+        if resolved is None:
+            logger.error("Código de acceso inexistente o vencido: %s", code)
+            return Response(status_code=404, body={"error": "Código de acceso inválido o vencido."}).to_dict()
+
+        room, expires_at = resolved
+        # Los docentes pueden revisar un código sin quedar como miembros del room
+        joined = role == 'STUDENT' and record_membership(deadline, room['id'], user_id, jwt_decode.get('username'))
+
+        return Response(status_code=200, body={'message': 'Código válido', 'data': {
+            'room': room,
+            'join_code_expires_at': expires_at,
+            'joined': joined
+        }}).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
+    except Exception as e:
+        logger.error("Error inesperado en el servidor: %s", e)
+        return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
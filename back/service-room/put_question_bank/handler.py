@@ -0,0 +1,168 @@
+import json
+import time
+from datetime import datetime
+from utils.validator import get_validator_question_bank
+from utils.response import Response
+from utils.token import get_token_instance
+from utils.config import (ROOM_TABLE, ROLES_PERMITED_EDIT_QUESTION_BANK, QBANK_MAX_CHUNKS, QBANK_CHUNK_BYTES,
+                          QBANK_SUPERSEDED_CHUNK_TTL_SECONDS, HEADERS_RESPONSE_DEFAULT)
+from utils.repository import get_backend
+from utils.dynamo_utils import serialize_dynamo_to_dict
+from utils.archive import room_owner_id, is_archived
+from utils.batch_writer import batch_put_items
+from utils.question_banks import (encode_question_bank, question_bank_items, manifest_id, chunk_ids_of, etag_of,
+                                  new_write_id, manifest_put, superseded_chunk_update)
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled, stage
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+validator_question_bank = get_validator_question_bank()
+token_validator = get_token_instance()
+
+dynamodb_client = DynamoClientPool()
+backend = get_backend(dynamodb_client)
+
+
+def expire_chunks(deadline, chunk_ids: list):
+    """
+    Programa el vencimiento por TTL de bloques que ningún manifiesto nuevo va a referenciar. Es de mejor
+    esfuerzo: un bloque que quede sin vencer no lo referencia ningún manifiesto, así que solo ocupa espacio.
+    """
+    expires_at = int(time.time()) + QBANK_SUPERSEDED_CHUNK_TTL_SECONDS
+    for item_id in chunk_ids:
+        try:
+            dynamodb_client.call(deadline, 'update_item', **superseded_chunk_update(item_id, expires_at))
+        except dynamodb_client.exceptions.ConditionalCheckFailedException:
+            continue  # El bloque ya no existe
+        except (DeadlineExceeded, dynamodb_client.exceptions.ClientError) as e:
+            logger.error("No se pudo programar el vencimiento del bloque %s: %s", item_id, e)
+            return
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Guarda (o reemplaza) el banco de preguntas de un room del docente (PUT rooms/{roomId}/questions).
+
+    El banco se guarda comprimido y fuera del item del room, así que get_room no lo lee ni lo paga.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dynamodb_client, token_validator=token_validator,
+                               validators=[validator_question_bank])
+
+    try:
+        headers = event.get('headers')
+        if not headers or 'Authorization' not in headers:
+            logger.error("Falta el encabezado de autorización en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el encabezado de autorización."}).to_dict()
+
+        token = token_validator.remove_bearer_prefix(headers['Authorization'])
+
+        try:
+            jwt_decode = token_validator.decode_token(token)
+        except ValueError as e:
+            logger.error("Error al decodificar el token JWT: %s", e)
+            return Response(status_code=401, body={"error": "Token JWT inválido."}).to_dict()
+
+        user_id = jwt_decode.get('id')
+        role = jwt_decode.get('role')
+
+        if not user_id or not role:
+            logger.error("Faltan los campos user_id o role: %s, %s", user_id, role)
+            return Response(status_code=401, body={"error": "Faltan los campos de usuario (ID) o rol."}).to_dict()
+
+        if role not in ROLES_PERMITED_EDIT_QUESTION_BANK:
+            logger.error("Rol no permitido: %s", role)
+            return Response(status_code=403, body={"error": "Rol no permitido para realizar esta acción."}).to_dict()
+
+        path_parameters = event.get('pathParameters')
+        if not path_parameters or 'roomId' not in path_parameters:
+            logger.error("Falta el parámetro roomId en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el parámetro roomId en la solicitud."}).to_dict()
+
+        room_id = path_parameters.get('roomId')
+
+        body = event.get('body')
+        if isinstance(body, str):
+            body = json.loads(body)
+
+        if not body:
+            return Response(status_code=400, body={
+                'error': 'El cuerpo de la solicitud debe contener el banco de preguntas.'}).to_dict()
+
+        with stage('validate'):
+            valid = validator_question_bank.validate(data=body, param_field='body')
+        if not valid:
+            logger.error("Errores de validación: %s", validator_question_bank.get_errors())
+            return Response(status_code=400, body={'error': 'Fallo en la validación de los datos proporcionados.',
+                                                   'details': validator_question_bank.get_errors()}).to_dict()
+
+        with stage('encode'):
+            blob, content_hash, raw_bytes = encode_question_bank(body)
+        if len(blob) > QBANK_MAX_CHUNKS * QBANK_CHUNK_BYTES:
+            return Response(status_code=413, body={'error': 'El banco de preguntas es demasiado grande.'}).to_dict()
+
+        # El room y el manifiesto actual se leen juntos en un solo BatchGetItem
+        items = backend.batch_get(deadline, ROOM_TABLE, [room_id, manifest_id(room_id)])
+        room = serialize_dynamo_to_dict(items[room_id]) if room_id in items else None
+        if room is None:
+            logger.error("Room no encontrado con ID: %s", room_id)
+            return Response(status_code=404, body={'error': 'Room no encontrado.'}).to_dict()
+        if room_owner_id(room) != user_id:
+            logger.error("Acceso no autorizado para el usuario %s a la room con ID: %s", user_id, room_id)
+            return Response(status_code=403, body={"error": "Acceso no autorizado a la room."}).to_dict()
+        if is_archived(room):
+            return Response(status_code=409, body={'error': 'No se puede editar un room archivado.'}).to_dict()
+
+        previous_manifest = items.get(manifest_id(room_id))
+        manifest, chunks = question_bank_items(room_id, blob, content_hash, raw_bytes, datetime.utcnow().isoformat(),
+                                               new_write_id())
+        response_data = {
+            'content_hash': content_hash,
+            'chunk_count': len(chunks),
+            'raw_bytes': raw_bytes,
+            'compressed_bytes': len(blob)
+        }
+        response_headers = {**HEADERS_RESPONSE_DEFAULT, 'ETag': etag_of(content_hash),
+                            'Access-Control-Expose-Headers': 'ETag'}
+
+        if previous_manifest and previous_manifest['content_hash']['S'] == content_hash:
+            return Response(status_code=200, body={'message': 'El banco de preguntas no cambió',
+                                                   'data': response_data}, headers=response_headers).to_dict()
+
+        with stage('write'):
+            # Primero los bloques y al final el manifiesto que los referencia
+            if chunks and batch_put_items(dynamodb_client, deadline, ROOM_TABLE, chunks):
+                logger.error("No se pudieron escribir todos los bloques del banco del room %s", room_id)
+                return Response(status_code=503, body={
+                    'error': 'No se pudo guardar el banco de preguntas, intente nuevamente.'}).to_dict()
+            try:
+                dynamodb_client.call(deadline, 'put_item', **manifest_put(manifest, previous_manifest))
+            except dynamodb_client.exceptions.ConditionalCheckFailedException:
+                # Otra escritura cambió el banco después de leerlo: los bloques recién escritos quedan sin uso
+                logger.error("El banco del room %s cambió durante la escritura", room_id)
+                expire_chunks(deadline, [chunk['id']['S'] for chunk in chunks])
+                return Response(status_code=409, body={
+                    'error': 'El banco de preguntas fue modificado por otra solicitud, intente nuevamente.'}).to_dict()
+
+        if previous_manifest:
+            expire_chunks(deadline, chunk_ids_of(previous_manifest))
+        logger.info("Banco de preguntas del room %s: %s bytes, %s comprimidos, %s bloques",
+                    room_id, raw_bytes, len(blob), len(chunks))
+
+        return Response(status_code=200, body={'message': 'Banco de preguntas guardado correctamente',
+                                               'data': response_data}, headers=response_headers).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
+    except Exception as e:
+        logger.error("Error inesperado en el servidor: %s", e)
+        return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
@@ -0,0 +1,129 @@
+import time
+from datetime import datetime
+from utils.response import Response
+from utils.token import get_token_instance
+from utils.config import ROLES_PERMITED_UPDATE_ROOM, JOIN_CODE_TTL_SECONDS, JOIN_CODE_MAX_ATTEMPTS
+from utils.repository import get_backend
+from utils.room_repository import RoomRepository
+from utils.archive import room_owner_id, is_archived
+from utils.join_codes import (generate_join_code, join_code_put_action, join_code_delete_action,
+                              room_join_code_update)
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+token_validator = get_token_instance()
+
+dynamodb_client = DynamoClientPool()
+backend = get_backend(dynamodb_client)
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Genera un código de acceso nuevo para un room del docente (POST rooms/{roomId}/join-code).
+
+    Los códigos vencen a los JOIN_CODE_TTL_SECONDS; con esto el docente emite uno nuevo cuando venció o
+    cuando quiere invalidar el anterior. El código nuevo, el cambio del room y el borrado del código anterior
+    se escriben en una sola transacción. Los contenedores que tengan el código anterior en caché pueden
+    aceptarlo hasta JOIN_CODE_CACHE_TTL_SECONDS más.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dynamodb_client, token_validator=token_validator)
+
+    try:
+        headers = event.get('headers')
+        if not headers or 'Authorization' not in headers:
+            logger.error("Falta el encabezado de autorización en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el encabezado de autorización."}).to_dict()
+
+        token = token_validator.remove_bearer_prefix(headers['Authorization'])
+
+        try:
+            jwt_decode = token_validator.decode_token(token)
+        except ValueError as e:
+            logger.error("Error al decodificar el token JWT: %s", e)
+            return Response(status_code=401, body={"error": "Token JWT inválido."}).to_dict()
+
+        user_id = jwt_decode.get('id')
+        role = jwt_decode.get('role')
+
+        if not user_id or not role:
+            logger.error("Faltan los campos user_id o role: %s, %s", user_id, role)
+            return Response(status_code=401, body={"error": "Faltan los campos de usuario (ID) o rol."}).to_dict()
+
+        if role not in ROLES_PERMITED_UPDATE_ROOM:
+            logger.error("Rol no permitido: %s", role)
+            return Response(status_code=403, body={"error": "Rol no permitido para realizar esta acción."}).to_dict()
+
+        path_parameters = event.get('pathParameters')
+        if not path_parameters or 'roomId' not in path_parameters:
+            logger.error("Falta el parámetro roomId en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el parámetro roomId en la solicitud."}).to_dict()
+
+        room_id = path_parameters.get('roomId')
+
+        room = RoomRepository(backend, deadline).get(room_id)
+        if room is None:
+            logger.error("Room no encontrado con ID: %s", room_id)
+            return Response(status_code=404, body={'error': 'Room no encontrado.'}).to_dict()
+        if room_owner_id(room) != user_id:
+            logger.error("Acceso no autorizado para el usuario %s a la room con ID: %s", user_id, room_id)
+            return Response(status_code=403, body={"error": "Acceso no autorizado a la room."}).to_dict()
+        if is_archived(room):
+            return Response(status_code=409, body={'error': 'Un room archivado no admite nuevos ingresos.'}).to_dict()
+
+        now = int(time.time())
+        expires_at = now + JOIN_CODE_TTL_SECONDS
+        # El código anterior se borra solo si sigue vigente; uno vencido ya no da acceso y pudo pasar a otro room
+        previous_code = room.get('join_code')
+        previous_code_valid = previous_code and room.get('join_code_expires_at', 0) > now
+
+        for _ in range(JOIN_CODE_MAX_ATTEMPTS):
+            code = generate_join_code()
+            if code == previous_code:
+                continue  # Una transacción no puede escribir y borrar el mismo item
+            transact_items = [
+                {'Put': join_code_put_action(code, room_id, expires_at)},
+                {'Update': room_join_code_update(room_id, user_id, previous_code, code, expires_at,
+                                                 datetime.utcnow().isoformat())}
+            ]
+            if previous_code_valid:
+                transact_items.append({'Delete': join_code_delete_action(previous_code, room_id)})
+
+            try:
+                dynamodb_client.call(deadline, 'transact_write_items', TransactItems=transact_items)
+            except dynamodb_client.exceptions.TransactionCanceledException as e:
+                reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+                if reasons[:1] == ['ConditionalCheckFailed']:
+                    logger.info("Colisión del código %s, se genera otro.", code)
+                    continue
+                if 'ConditionalCheckFailed' in reasons[1:]:
+                    # El room se archivó o su código cambió después de leerlo
+                    logger.info("El room %s cambió mientras se regeneraba su código", room_id)
+                    return Response(status_code=409, body={
+                        'error': 'El room fue modificado por otra solicitud, intente nuevamente.'}).to_dict()
+                raise
+
+            logger.info("Código de acceso del room %s regenerado", room_id)
+            return Response(status_code=200, body={'message': 'Código de acceso generado', 'data': {
+                'join_code': code,
+                'join_code_expires_at': expires_at
+            }}).to_dict()
+
+        logger.error("No se pudo asignar un código de acceso único al room %s", room_id)
+        return Response(status_code=503, body={'error': 'No se pudo generar un código de acceso, intente nuevamente.'}).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
+    except Exception as e:
+        logger.error("Error inesperado en el servidor: %s", e)
+        return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
@@ -0,0 +1,127 @@
+"""
+Backfill único de los contadores de rooms por docente (stats#<user_id>).
+
+Cuenta, con un Scan segmentado en paralelo, los rooms creados antes de --cutoff (el momento en que se
+desplegó create con contadores transaccionales) y los suma con ADD a cada item de estadísticas.
+Como los rooms posteriores al cutoff ya los cuenta create, el backfill puede correr con tráfico real.
+Cada item se marca con backfilled_at y la escritura es condicional, así que repetir el backfill no duplica.
+
+Requiere las mismas variables de entorno que el servicio (ROOM_TABLE, ...), salvo para --help: utils.config
+las lee al importarse, así que se importa recién después de parsear los argumentos.
+
+Uso (desde back/service-room):
+    python -m reports.backfill_room_stats --cutoff 2026-10-20T00:00:00 --segments 8 --rcu-per-second 200
+"""
+import argparse
+import logging
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import boto3
+from utils.parallel_scan import ParallelScanner, CapacityRateLimiter, ScanCheckpoint, SCAN_CHECKPOINT_INTERVAL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class RoomsPerTeacherAggregate:
+    """
+    Conteo de rooms por partición de docente (user_id tal como está guardado, con su shard) y curso; se
+    combina sumando los contadores. main junta los shards de cada docente antes de escribir.
+    """
+
+    def __init__(self):
+        self.by_user = defaultdict(Counter)
+
+    def add(self, room: dict):
+        self.by_user[room['user_id']][room.get('course', '')] += 1
+
+    def merge(self, other: 'RoomsPerTeacherAggregate'):
+        for user_id, courses in other.by_user.items():
+            self.by_user[user_id].update(courses)
+
+    def to_state(self) -> dict:
+        return {user_id: dict(courses) for user_id, courses in self.by_user.items()}
+
+    def load_state(self, state: dict):
+        self.by_user = defaultdict(Counter, {user_id: Counter(courses) for user_id, courses in state.items()})
+
+
+def apply_user_stats(dynamodb_client, user_id: str, courses: Counter, backfilled_at: str) -> bool:
+    """Suma los conteos del docente a su item de estadísticas. Devuelve False si ya tenía backfill."""
+    from utils.config import ROOM_TABLE, ROOM_STATS_COURSE_PREFIX
+    from utils.room_stats import stats_item_key
+
+    names = {}
+    values = {':user_id': {'S': user_id}, ':backfilled_at': {'S': backfilled_at},
+              ':total': {'N': str(sum(courses.values()))}}
+    additions = ['room_count :total']
+    for index, (course, count) in enumerate(courses.items()):
+        names[f"#c{index}"] = f"{ROOM_STATS_COURSE_PREFIX}{course}"
+        values[f":c{index}"] = {'N': str(count)}
+        additions.append(f"#c{index} :c{index}")
+
+    params = {
+        'TableName': ROOM_TABLE,
+        'Key': stats_item_key(user_id),
+        'UpdateExpression': f"SET owner_id = :user_id, backfilled_at = :backfilled_at ADD {', '.join(additions)}",
+        'ConditionExpression': 'attribute_not_exists(backfilled_at)',
+        'ExpressionAttributeValues': values
+    }
+    if names:
+        params['ExpressionAttributeNames'] = names
+
+    try:
+        dynamodb_client.update_item(**params)
+        return True
+    except dynamodb_client.exceptions.ConditionalCheckFailedException:
+        logger.info("El docente %s ya tenía backfill, se omite.", user_id)
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cutoff', required=True, help="created_at (ISO) desde el que create ya cuenta los rooms")
+    parser.add_argument('--segments', type=int, default=4, help="TotalSegments del scan")
+    parser.add_argument('--workers', type=int, default=None, help="Hilos del scan (por defecto uno por segmento)")
+    parser.add_argument('--write-workers', type=int, default=8, help="Hilos para escribir los contadores")
+    parser.add_argument('--rcu-per-second', type=float, default=None, help="Capacidad de lectura máxima por segundo")
+    parser.add_argument('--checkpoint', default=None, help="Archivo JSON de checkpoint para reanudar el scan")
+    parser.add_argument('--checkpoint-interval', type=float, default=SCAN_CHECKPOINT_INTERVAL_SECONDS,
+                        help="Segundos mínimos entre escrituras del checkpoint de cada segmento")
+    args = parser.parse_args()
+
+    from utils.config import ROOM_TABLE
+    from utils.sharding import owner_of
+
+    logging.basicConfig(level=logging.INFO)
+    dynamodb_client = boto3.client('dynamodb')
+
+    scanner = ParallelScanner(
+        dynamodb_client,
+        ROOM_TABLE,
+        total_segments=args.segments,
+        max_workers=args.workers,
+        projection_expression='#user_id, #course',
+        expression_attribute_names={'#user_id': 'user_id', '#course': 'course', '#created_at': 'created_at'},
+        filter_expression='attribute_exists(#user_id) AND attribute_exists(#course) AND #created_at < :cutoff',
+        expression_attribute_values={':cutoff': {'S': args.cutoff}},
+        rate_limiter=CapacityRateLimiter(args.rcu_per_second) if args.rcu_per_second else None,
+        checkpoint=ScanCheckpoint(args.checkpoint, args.segments, interval_seconds=args.checkpoint_interval)
+    )
+    aggregate = scanner.run(RoomsPerTeacherAggregate)
+    by_owner = defaultdict(Counter)
+    for partition_key, courses in aggregate.by_user.items():
+        by_owner[owner_of(partition_key)].update(courses)
+
+    backfilled_at = datetime.utcnow().isoformat()
+    with ThreadPoolExecutor(max_workers=args.write_workers) as executor:
+        results = list(executor.map(
+            lambda entry: apply_user_stats(dynamodb_client, entry[0], entry[1], backfilled_at),
+            by_owner.items()
+        ))
+
+    logger.info("Backfill completado: %s docentes actualizados, %s omitidos.", sum(results), len(results) - sum(results))
+
+
+if __name__ == '__main__':
+    main()
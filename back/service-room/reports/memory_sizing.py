@@ -0,0 +1,283 @@
+"""
+Dimensionamiento de memorySize por función a partir del perfilado de memoria (MEMORY_PROFILING=1).
+
+Dos subcomandos:
+
+- replay: reproduce localmente los eventos de events/<función>/*.json contra cada handler con el perfilado
+  activo y guarda las líneas memory_profile en un NDJSON. Cada función corre en su propio proceso, igual que
+  en Lambda, para que la RSS máxima de una no contamine a las otras. En los eventos, "{{token:ROL}}" o
+  "{{token:ROL:user_id}}" se reemplaza por un JWT firmado con JWT_SECRET_KEY. Requiere las mismas variables
+  de entorno que el servicio; para no tocar tablas reales se puede apuntar a DynamoDB Local con
+  AWS_ENDPOINT_URL_DYNAMODB.
+
+- report: agrupa las líneas memory_profile (del replay o exportadas de CloudWatch) por función y recomienda
+  un memorySize: RSS máxima más un margen, redondeada a 64 MB. La RSS se mide con tracemalloc activo, que
+  agrega su propio overhead, así que la recomendación queda del lado conservador. Las funciones donde una
+  etapa de CPU (bcrypt, hash) domina el tiempo se marcan: en Lambda la memoria también asigna vCPU y bajarla
+  las hace más lentas, así que para ellas no se recomienda bajar del valor configurado.
+
+Uso (desde back/service-room):
+    python -m reports.memory_sizing replay --output memory_profile.ndjson [--function get_rooms] [--repeat 20]
+    python -m reports.memory_sizing report memory_profile.ndjson [--headroom 1.3] [--format json]
+"""
+import argparse
+import glob
+import importlib.util
+import json
+import logging
+import math
+import os
+import re
+import subprocess
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = 'service-room'
+EVENTS_DIR = 'events'
+SERVERLESS_FILE = 'serverless.yml'
+SKIPPED_FUNCTIONS = {'warmer'}
+LAMBDA_MIN_MEMORY_MB = 128
+LAMBDA_MEMORY_STEP_MB = 64
+CPU_BOUND_STAGES = {'bcrypt', 'hash'}
+CPU_BOUND_SHARE = 0.5  # Fracción del tiempo del handler a partir de la cual la función se considera limitada por CPU
+TOKEN_PLACEHOLDER = re.compile(r'\{\{token:([A-Z]+)(?::([^}]+))?\}\}')
+
+
+def read_memory_settings(path: str = SERVERLESS_FILE) -> dict:
+    """
+    Lee memorySize del serverless.yml sin depender de PyYAML: el valor del provider y los que se
+    sobreescriben por función.
+    :return: {'provider': mb, '<función>': mb, ...}
+    """
+    settings = {}
+    section = None
+    function = None
+    with open(path) as f:
+        for line in f:
+            stripped = line.split('#', 1)[0].rstrip()
+            if not stripped.strip():
+                continue
+            indent = len(stripped) - len(stripped.lstrip())
+            if indent == 0:
+                section = stripped.rstrip(':')
+                function = None
+            elif section == 'functions' and indent == 2:
+                function = stripped.strip().rstrip(':')
+            key, _, value = stripped.strip().partition(':')
+            if key != 'memorySize' or not value.strip().isdigit():
+                continue
+            if section == 'provider' and indent == 2:
+                settings['provider'] = int(value)
+            elif section == 'functions' and function and indent == 4:
+                settings[function] = int(value)
+    return settings
+
+
+def configured_memory_mb(settings: dict, function: str):
+    return settings.get(function, settings.get('provider'))
+
+
+def discover_functions() -> list:
+    """Funciones del servicio que tienen eventos para reproducir."""
+    return sorted(
+        os.path.basename(os.path.dirname(path))
+        for path in glob.glob(os.path.join(EVENTS_DIR, '*', ''))
+        if os.path.basename(os.path.dirname(path)) not in SKIPPED_FUNCTIONS
+        and os.path.exists(os.path.join(os.path.basename(os.path.dirname(path)), 'handler.py'))
+    )
+
+
+class ReplayContext:
+    """Contexto mínimo de Lambda: lo que usan Deadline.from_context y el perfilado."""
+
+    def __init__(self, function_name: str, memory_limit_in_mb: int, timeout_ms: int = 29000):
+        self.function_name = function_name
+        self.memory_limit_in_mb = memory_limit_in_mb
+        self._ends_at = time.monotonic() + timeout_ms / 1000
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, int((self._ends_at - time.monotonic()) * 1000))
+
+
+def render_event(raw: str, token_validator) -> dict:
+    def replace(match):
+        role, user_id = match.group(1), match.group(2) or f'replay-{match.group(1).lower()}'
+        return token_validator.generate_token({'id': user_id, 'role': role})
+    return json.loads(TOKEN_PLACEHOLDER.sub(replace, raw))
+
+
+def replay_function(function: str, repeat: int) -> int:
+    """
+    Reproduce los eventos de una función en este proceso. Cada invocación escribe en stdout su línea de log
+    (utils.structured_log) con el record memory_profile, igual que en CloudWatch. Devuelve las invocaciones.
+    """
+    os.environ['MEMORY_PROFILING'] = '1'
+    sys.path.insert(0, os.getcwd())
+    from utils.token import get_token_instance
+
+    spec = importlib.util.spec_from_file_location(f'{function}.handler', os.path.join(function, 'handler.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    token_validator = get_token_instance()
+    memory_mb = configured_memory_mb(read_memory_settings(), function)
+    event_paths = sorted(glob.glob(os.path.join(EVENTS_DIR, function, '*.json')))
+    invocations = 0
+    for _ in range(repeat):
+        for path in event_paths:
+            with open(path) as f:
+                event = render_event(f.read(), token_validator)
+            response = module.lambda_handler(event, ReplayContext(f'{SERVICE_NAME}-replay-{function}', memory_mb))
+            logger.info(f"{function} {os.path.basename(path)} -> {response.get('statusCode')}")
+            invocations += 1
+    return invocations
+
+
+def replay(functions: list, repeat: int, output_path: str):
+    """Lanza un proceso por función y junta sus líneas en output_path."""
+    with open(output_path, 'w') as output:
+        for function in functions:
+            result = subprocess.run(
+                [sys.executable, '-m', 'reports.memory_sizing', 'replay', '--function', function,
+                 '--repeat', str(repeat), '--output', '-'],
+                stdout=subprocess.PIPE, text=True
+            )
+            if result.returncode != 0:
+                logger.error(f"El replay de {function} terminó con código {result.returncode}")
+                continue
+            profiles = [profile for line in result.stdout.splitlines() for profile in profiles_in_line(line)]
+            output.write(''.join(json.dumps(profile) + '\n' for profile in profiles))
+            logger.info(f"{function}: {len(profiles)} invocaciones perfiladas")
+
+
+def profiles_in_line(line: str) -> list:
+    """
+    Records memory_profile de una línea: una línea ya extraída o la línea de log de una invocación
+    (utils.structured_log), con o sin prefijo de CloudWatch antes del JSON.
+    """
+    start = line.find('{')
+    if start < 0:
+        return []
+    try:
+        payload = json.loads(line[start:])
+    except ValueError:
+        return []
+    if not isinstance(payload, dict):
+        return []
+    records = payload.get('records') if isinstance(payload.get('records'), list) else [payload]
+    return [record for record in records if isinstance(record, dict) and record.get('event') == 'memory_profile']
+
+
+def read_profiles(paths: list) -> list:
+    """Lee los records memory_profile de los NDJSON del replay o de logs exportados de CloudWatch."""
+    profiles = []
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                profiles.extend(profiles_in_line(line))
+    return profiles
+
+
+def percentile(values: list, fraction: float):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def recommend_memory_mb(peak_rss_bytes: int, headroom: float) -> int:
+    needed_mb = peak_rss_bytes / (1024 * 1024) * headroom
+    return max(LAMBDA_MIN_MEMORY_MB, math.ceil(needed_mb / LAMBDA_MEMORY_STEP_MB) * LAMBDA_MEMORY_STEP_MB)
+
+
+def function_name_of(profile: dict) -> str:
+    """'service-room-dev-get_rooms' o 'service-room-replay-get_rooms' -> 'get_rooms'."""
+    name = profile.get('function') or ''
+    return name.rsplit('-', 1)[-1]
+
+
+def summarize(profiles: list, settings: dict, headroom: float) -> list:
+    by_function = {}
+    for profile in profiles:
+        by_function.setdefault(function_name_of(profile), []).append(profile)
+
+    rows = []
+    for function, items in sorted(by_function.items()):
+        rss = [item['peak_rss_bytes'] for item in items]
+        handler_stages = [stage for item in items for stage in item['stages'] if stage['stage'] == 'handler']
+        traced_peak = max((stage['tracemalloc_peak_bytes'] for stage in handler_stages), default=0)
+        handler_ms = sum(stage['duration_ms'] for stage in handler_stages)
+        cpu_ms = sum(stage['duration_ms'] for item in items for stage in item['stages']
+                     if stage['stage'] in CPU_BOUND_STAGES)
+        cpu_bound = handler_ms > 0 and cpu_ms / handler_ms >= CPU_BOUND_SHARE
+
+        configured = configured_memory_mb(settings, function)
+        recommended = recommend_memory_mb(max(rss), headroom)
+        if cpu_bound and configured:
+            recommended = max(recommended, configured)
+
+        sites = {}
+        for item in items:
+            for stage in item['stages']:
+                for site in stage['top_sites']:
+                    sites[site['site']] = max(sites.get(site['site'], 0), site['size_diff_bytes'])
+
+        rows.append({
+            'function': function,
+            'invocations': len(items),
+            'max_peak_rss_mb': round(max(rss) / (1024 * 1024), 1),
+            'p95_peak_rss_mb': round(percentile(rss, 0.95) / (1024 * 1024), 1),
+            'max_tracemalloc_peak_mb': round(traced_peak / (1024 * 1024), 2),
+            'cpu_bound': cpu_bound,
+            'configured_mb': configured,
+            'recommended_mb': recommended,
+            'top_sites': sorted(sites.items(), key=lambda site: site[1], reverse=True)[:3]
+        })
+    return rows
+
+
+def print_table(rows: list):
+    columns = ('function', 'invocations', 'max_peak_rss_mb', 'p95_peak_rss_mb', 'max_tracemalloc_peak_mb',
+               'cpu_bound', 'configured_mb', 'recommended_mb')
+    widths = {column: max(len(column), *(len(str(row[column])) for row in rows)) for column in columns}
+    print('  '.join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print('  '.join(str(row[column]).ljust(widths[column]) for column in columns))
+        for site, size in row['top_sites']:
+            print(f"    {size / 1024:10.1f} KB  {site}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfilado de memoria y recomendación de memorySize por función")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    replay_parser = subparsers.add_parser('replay', help="Reproduce los eventos locales con el perfilado activo")
+    replay_parser.add_argument('--function', help="Solo esta función (por defecto, todas las que tienen eventos)")
+    replay_parser.add_argument('--repeat', type=int, default=1, help="Veces que se reproduce cada evento")
+    replay_parser.add_argument('--output', default='memory_profile.ndjson', help="NDJSON de salida ('-' = stdout)")
+
+    report_parser = subparsers.add_parser('report', help="Recomienda memorySize a partir de las líneas memory_profile")
+    report_parser.add_argument('inputs', nargs='+', help="NDJSON del replay o logs exportados de CloudWatch")
+    report_parser.add_argument('--headroom', type=float, default=1.3, help="Margen sobre la RSS máxima")
+    report_parser.add_argument('--format', choices=('table', 'json'), default='table')
+    args = parser.parse_args()
+
+    if args.command == 'replay':
+        logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+        if args.function and args.output == '-':
+            replay_function(args.function, args.repeat)
+        else:
+            replay([args.function] if args.function else discover_functions(), args.repeat, args.output)
+        return
+
+    rows = summarize(read_profiles(args.inputs), read_memory_settings(), args.headroom)
+    if args.format == 'json':
+        print(json.dumps(rows, indent=2))
+    elif rows:
+        print_table(rows)
+    else:
+        print("No se encontraron líneas memory_profile.")
+
+
+if __name__ == '__main__':
+    main()
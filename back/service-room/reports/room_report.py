@@ -0,0 +1,111 @@
+"""
+Reporte administrativo de rooms: cantidad de rooms por curso, por tema y por día de creación.
+
+Recorre ROOM_TABLE con un Scan segmentado en paralelo, limitado por capacidad consumida y con
+checkpoints por segmento para poder reanudar un reporte interrumpido. No necesita las variables de entorno
+del servicio: solo la tabla (--table o $ROOM_TABLE) y las credenciales de AWS.
+
+Uso (desde back/service-room):
+    python -m reports.room_report --table <ROOM_TABLE> --segments 8 --rcu-per-second 200 \\
+        --checkpoint room_report.checkpoint.json --output-dir salida/ --format csv json
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+from collections import Counter
+import boto3
+from utils.parallel_scan import ParallelScanner, CapacityRateLimiter, ScanCheckpoint, SCAN_CHECKPOINT_INTERVAL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = ('course', 'topic', 'day')
+
+
+class RoomReportAggregate:
+    """Conteos incrementales de rooms por curso, tema y día; se combinan sumando los contadores."""
+
+    def __init__(self):
+        self.total = 0
+        self.counters = {dimension: Counter() for dimension in DIMENSIONS}
+
+    def add(self, room: dict):
+        self.total += 1
+        self.counters['course'][room.get('course', '')] += 1
+        self.counters['topic'][room.get('topic', '')] += 1
+        self.counters['day'][room.get('created_at', '')[:10]] += 1
+
+    def merge(self, other: 'RoomReportAggregate'):
+        self.total += other.total
+        for dimension in DIMENSIONS:
+            self.counters[dimension].update(other.counters[dimension])
+
+    def to_state(self) -> dict:
+        return {'total': self.total, **{dimension: dict(self.counters[dimension]) for dimension in DIMENSIONS}}
+
+    def load_state(self, state: dict):
+        self.total = state['total']
+        for dimension in DIMENSIONS:
+            self.counters[dimension] = Counter(state[dimension])
+
+
+def write_report(aggregate: RoomReportAggregate, output_dir: str, formats):
+    os.makedirs(output_dir, exist_ok=True)
+
+    if 'json' in formats:
+        with open(os.path.join(output_dir, 'room_report.json'), 'w', encoding='utf-8') as f:
+            json.dump({'total': aggregate.total,
+                       **{f"rooms_by_{dimension}": dict(sorted(aggregate.counters[dimension].items()))
+                          for dimension in DIMENSIONS}}, f, ensure_ascii=False, indent=2)
+
+    if 'csv' in formats:
+        for dimension in DIMENSIONS:
+            with open(os.path.join(output_dir, f"rooms_by_{dimension}.csv"), 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow([dimension, 'rooms'])
+                for key, count in sorted(aggregate.counters[dimension].items()):
+                    writer.writerow([key, count])
+
+
+def build_scanner(args) -> ParallelScanner:
+    return ParallelScanner(
+        boto3.client('dynamodb'),
+        args.table,
+        total_segments=args.segments,
+        max_workers=args.workers,
+        projection_expression='#course, #topic, #created_at',
+        expression_attribute_names={'#course': 'course', '#topic': 'topic', '#created_at': 'created_at'},
+        # ROOM_TABLE también guarda items auxiliares (estadísticas, códigos, etc.); solo los rooms tienen curso
+        filter_expression='attribute_exists(#course)',
+        page_size=args.page_size,
+        rate_limiter=CapacityRateLimiter(args.rcu_per_second) if args.rcu_per_second else None,
+        checkpoint=ScanCheckpoint(args.checkpoint, args.segments, interval_seconds=args.checkpoint_interval)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--table', default=os.environ.get('ROOM_TABLE'), help="Tabla de rooms (por defecto $ROOM_TABLE)")
+    parser.add_argument('--segments', type=int, default=4, help="TotalSegments del scan")
+    parser.add_argument('--workers', type=int, default=None, help="Hilos (por defecto uno por segmento)")
+    parser.add_argument('--page-size', type=int, default=None, help="Limit por página del scan")
+    parser.add_argument('--rcu-per-second', type=float, default=None, help="Capacidad de lectura máxima por segundo")
+    parser.add_argument('--checkpoint', default=None, help="Archivo JSON de checkpoint para reanudar")
+    parser.add_argument('--checkpoint-interval', type=float, default=SCAN_CHECKPOINT_INTERVAL_SECONDS,
+                        help="Segundos mínimos entre escrituras del checkpoint de cada segmento")
+    parser.add_argument('--output-dir', default='.', help="Directorio de salida")
+    parser.add_argument('--format', nargs='+', choices=['csv', 'json'], default=['csv', 'json'])
+    args = parser.parse_args()
+
+    if not args.table:
+        parser.error("Debe indicar --table o definir ROOM_TABLE.")
+
+    logging.basicConfig(level=logging.INFO)
+    aggregate = build_scanner(args).run(RoomReportAggregate)
+    write_report(aggregate, args.output_dir, args.format)
+    logger.info("Reporte generado con %s rooms en %s", aggregate.total, args.output_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+import json
+from utils.validator import get_validator_submit_score
+from utils.response import Response
+from utils.token import get_token_instance
+from utils.config import (ROOM_TABLE, ROLES_PERMITED_SUBMIT_SCORE, LEADERBOARD_CACHE_SIZE,
+                          LEADERBOARD_CACHE_TTL_SECONDS, ROOM_EXISTS_CACHE_SIZE, ROOM_EXISTS_CACHE_TTL_SECONDS,
+                          MEMBERSHIP_CACHE_SIZE, MEMBERSHIP_CACHE_TTL_SECONDS)
+from utils.cache import TTLCache
+from utils.repository import get_backend
+from utils.memberships import room_membership_id
+from utils.leaderboard import add_score, update_leaderboard
+from utils.broadcaster import Broadcaster
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+validator_submit_score = get_validator_submit_score()
+token_validator = get_token_instance()
+
+dynamodb_client = DynamoClientPool()
+backend = get_backend(dynamodb_client)
+broadcaster = Broadcaster(dynamodb_client)
+
+# room_id y membresías (id del item) -> True para no leerlos en cada puntaje; y room_id -> último top-K visto
+room_exists_cache = TTLCache(max_size=ROOM_EXISTS_CACHE_SIZE, ttl_seconds=ROOM_EXISTS_CACHE_TTL_SECONDS)
+membership_cache = TTLCache(max_size=MEMBERSHIP_CACHE_SIZE, ttl_seconds=MEMBERSHIP_CACHE_TTL_SECONDS)
+leaderboard_cache = TTLCache(max_size=LEADERBOARD_CACHE_SIZE, ttl_seconds=LEADERBOARD_CACHE_TTL_SECONDS)
+
+
+def check_room_access(deadline, room_id: str, student_id: str):
+    """
+    Comprueba que el room exista y que el estudiante se haya unido a él. Lo que no está en caché (solo se
+    guardan los resultados positivos) se lee en un solo BatchGetItem.
+    :return: (room existe, estudiante es miembro)
+    """
+    membership_id = room_membership_id(room_id, student_id)
+    checks = ((room_id, room_exists_cache), (membership_id, membership_cache))
+    pending = [item_id for item_id, cache in checks if not cache.get(item_id)]
+    found = backend.batch_get(deadline, ROOM_TABLE, pending) if pending else {}
+    for item_id, cache in checks:
+        if item_id in found:
+            cache.set(item_id, True)
+    return bool(room_exists_cache.get(room_id)), bool(membership_cache.get(membership_id))
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Registra puntos de un estudiante en un room (batalla o misión) y actualiza el top-K del room si corresponde.
+    Solo los estudiantes que se unieron al room (join_room) pueden sumar puntos en él.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dynamodb_client, token_validator=token_validator,
+                               validators=[validator_submit_score])
+
+    try:
+        body = event.get('body')
+
+        if isinstance(body, str):
+            body = json.loads(body)
+
+        if not body:
+            return Response(status_code=400, body={
+                'error': 'El cuerpo de la solicitud debe contener los parámetros requeridos.'}).to_dict()
+
+        if not validator_submit_score.validate(data=body, param_field='body'):
+            logger.error("Errores de validación: %s", validator_submit_score.get_errors())
+            return Response(status_code=400, body={'error': 'Fallo en la validación de los datos proporcionados.',
+                                                   'details': validator_submit_score.get_errors()}).to_dict()
+
+        headers = event.get('headers')
+        if not headers or 'Authorization' not in headers:
+            logger.error("Falta el encabezado de autorización en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el encabezado de autorización."}).to_dict()
+
+        token = token_validator.remove_bearer_prefix(headers['Authorization'])
+
+        try:
+            jwt_decode = token_validator.decode_token(token)
+        except ValueError as e:
+            logger.error("Error al decodificar el token JWT: %s", e)
+            return Response(status_code=401, body={"error": "Token JWT inválido."}).to_dict()
+
+        user_id = jwt_decode.get('id')
+        role = jwt_decode.get('role')
+
+        if not user_id or not role:
+            logger.error("Faltan los campos user_id o role: %s, %s", user_id, role)
+            return Response(status_code=401, body={"error": "Faltan los campos de usuario (ID) o rol."}).to_dict()
+
+        if role not in ROLES_PERMITED_SUBMIT_SCORE:
+            logger.error("Rol no permitido: %s", role)
+            return Response(status_code=403, body={"error": "Rol no permitido para realizar esta acción."}).to_dict()
+
+        path_parameters = event.get('pathParameters')
+        if not path_parameters or 'roomId' not in path_parameters:
+            logger.error("Falta el parámetro roomId en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el parámetro roomId en la solicitud."}).to_dict()
+
+        room_id = path_parameters.get('roomId')
+
+        room_found, is_member = check_room_access(deadline, room_id, user_id)
+        if not room_found:
+            logger.error("Room no encontrado: %s", room_id)
+            return Response(status_code=404, body={"error": "Room no encontrado."}).to_dict()
+        if not is_member:
+            logger.error("El estudiante %s no pertenece al room %s", user_id, room_id)
+            return Response(status_code=403, body={"error": "Acceso no autorizado a la room."}).to_dict()
+
+        score = add_score(dynamodb_client, deadline, room_id, user_id, body['points'])
+
+        # El puntaje ya quedó guardado; si el top-K no se pudo actualizar se corrige con el próximo envío
+        try:
+            leaderboard_updated = update_leaderboard(dynamodb_client, deadline, room_id, user_id,
+                                                     jwt_decode.get('username'), score, cache=leaderboard_cache)
+        except DeadlineExceeded as e:
+            logger.error("Sin tiempo para actualizar el leaderboard del room %s en la etapa %s", room_id, e.stage)
+            leaderboard_updated = False
+
+        # Las pantallas de batalla conectadas al room reciben el nuevo total sin consultar la API
+        try:
+            broadcaster.broadcast(deadline, room_id, {'type': 'score', 'room_id': room_id, 'student_id': user_id,
+                                                      'username': jwt_decode.get('username'), 'score': score})
+        except Exception as e:
+            logger.error("No se pudo difundir el puntaje del room %s: %s", room_id, e)
+
+        logger.info("Puntaje registrado: room %s, estudiante %s, total %s", room_id, user_id, score)
+        return Response(status_code=200, body={'message': 'Puntaje registrado', 'data': {
+            'score': score,
+            'leaderboard_updated': leaderboard_updated
+        }}).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
+    except Exception as e:
+        logger.error("Error inesperado en el servidor: %s", e)
+        return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
@@ -0,0 +1,164 @@
+import json
+from datetime import datetime
+from utils.validator import get_validator_update_room
+from utils.response import Response
+from utils.token import get_token_instance
+from utils.config import ROLES_PERMITED_UPDATE_ROOM
+from utils.repository import get_backend
+from utils.room_repository import RoomRepository, room_to_dict
+from utils.dynamo_utils import serialize_dynamo_to_dict
+from utils.room_updates import room_patch_update
+from utils.room_stats import stats_increment_action
+from utils.archive import room_owner_id, is_archived
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+validator_update_room = get_validator_update_room()
+token_validator = get_token_instance()
+
+dynamodb_client = DynamoClientPool()
+backend = get_backend(dynamodb_client)
+
+
+def rejected_update(room, room_id: str, user_id: str, expected_version: int):
+    """Respuesta de una edición cuya condición falló (o fallaría) según el room actual."""
+    if room is None:
+        logger.error("Room no encontrado con ID: %s", room_id)
+        return Response(status_code=404, body={'error': 'Room no encontrado.'}).to_dict()
+    if room_owner_id(room) != user_id:
+        logger.error("Acceso no autorizado para el usuario %s a la room con ID: %s", user_id, room_id)
+        return Response(status_code=403, body={"error": "Acceso no autorizado a la room."}).to_dict()
+    if is_archived(room):
+        return Response(status_code=409, body={'error': 'No se puede editar un room archivado.'}).to_dict()
+    logger.info("Conflicto de versión en el room %s: esperada %s, actual %s",
+                room_id, expected_version, room.get('version', 0))
+    return Response(status_code=409, body={'error': 'El room fue modificado por otra solicitud.',
+                                           'data': room_to_dict(room)}).to_dict()
+
+
+def update_course(deadline, room_id: str, user_id: str, fields: dict, expected_version: int, updated_at: str):
+    """
+    Edición que cambia el curso: los contadores stats#<docente> de create cuentan los rooms por curso, así que
+    el room y los dos contadores se escriben en una sola transacción. El curso anterior se lee del room y la
+    condición de versión del UpdateItem garantiza que sigue siendo el de la versión que el cliente leyó.
+    """
+    room = RoomRepository(backend, deadline).get(room_id)
+    if room is None or room_owner_id(room) != user_id or is_archived(room) \
+            or room.get('version', 0) != expected_version:
+        return rejected_update(room, room_id, user_id, expected_version)
+
+    update = room_patch_update(room_id, user_id, fields, expected_version, updated_at)
+    del update['ReturnValues']  # Las transacciones no devuelven el item: se arma con lo leído y lo escrito
+    transact_items = [{'Update': update}]
+    if room['course'] != fields['course']:
+        transact_items += [{'Update': stats_increment_action(user_id, room['course'], -1)},
+                           {'Update': stats_increment_action(user_id, fields['course'])}]
+    try:
+        dynamodb_client.call(deadline, 'transact_write_items', TransactItems=transact_items)
+    except dynamodb_client.exceptions.TransactionCanceledException as e:
+        reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+        if reasons[:1] == ['ConditionalCheckFailed']:
+            return rejected_update(RoomRepository(backend, deadline).get(room_id), room_id, user_id, expected_version)
+        raise
+
+    room = {**room, **fields, 'version': expected_version + 1, 'updated_at': updated_at, 'sync_user_id': user_id}
+    logger.info("Room %s actualizado a la versión %s con cambio de curso", room_id, room['version'])
+    return Response(status_code=200, body={'message': 'Room actualizado correctamente', 'data': room_to_dict(room)}).to_dict()
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Actualiza parcialmente un room del docente (PATCH rooms/{roomId}).
+
+    El body trae la versión que el cliente leyó ("version") y solo los campos a cambiar, validados con las
+    mismas reglas que la creación. La escritura es un único UpdateItem condicionado a la versión (si cambia el
+    curso, una transacción con los contadores del docente): si el room cambió entretanto responde 409 con el room
+    actual para que el cliente reaplique su cambio.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dynamodb_client, token_validator=token_validator,
+                               validators=[validator_update_room])
+
+    try:
+        headers = event.get('headers')
+        if not headers or 'Authorization' not in headers:
+            logger.error("Falta el encabezado de autorización en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el encabezado de autorización."}).to_dict()
+
+        token = token_validator.remove_bearer_prefix(headers['Authorization'])
+
+        try:
+            jwt_decode = token_validator.decode_token(token)
+        except ValueError as e:
+            logger.error("Error al decodificar el token JWT: %s", e)
+            return Response(status_code=401, body={"error": "Token JWT inválido."}).to_dict()
+
+        user_id = jwt_decode.get('id')
+        role = jwt_decode.get('role')
+
+        if not user_id or not role:
+            logger.error("Faltan los campos user_id o role: %s, %s", user_id, role)
+            return Response(status_code=401, body={"error": "Faltan los campos de usuario (ID) o rol."}).to_dict()
+
+        if role not in ROLES_PERMITED_UPDATE_ROOM:
+            logger.error("Rol no permitido: %s", role)
+            return Response(status_code=403, body={"error": "Rol no permitido para realizar esta acción."}).to_dict()
+
+        path_parameters = event.get('pathParameters')
+        if not path_parameters or 'roomId' not in path_parameters:
+            logger.error("Falta el parámetro roomId en la solicitud.")
+            return Response(status_code=400, body={"error": "Falta el parámetro roomId en la solicitud."}).to_dict()
+
+        room_id = path_parameters.get('roomId')
+
+        body = event.get('body')
+        if isinstance(body, str):
+            body = json.loads(body)
+
+        if not isinstance(body, dict) or not body:
+            return Response(status_code=400, body={
+                'error': 'El cuerpo de la solicitud debe contener los campos a actualizar.'}).to_dict()
+
+        fields = dict(body)
+        expected_version = fields.pop('version', None)
+        if not isinstance(expected_version, int) or isinstance(expected_version, bool) or expected_version < 0:
+            return Response(status_code=400, body={
+                'error': 'El campo version es requerido y debe ser un entero mayor o igual a 0.'}).to_dict()
+
+        if not validator_update_room.validate_partial(data=fields, param_field='body'):
+            logger.error("Errores de validación: %s", validator_update_room.get_errors())
+            return Response(status_code=400, body={'error': 'Fallo en la validación de los datos proporcionados.',
+                                                   'details': validator_update_room.get_errors()}).to_dict()
+
+        updated_at = datetime.utcnow().isoformat()
+        if 'course' in fields:
+            return update_course(deadline, room_id, user_id, fields, expected_version, updated_at)
+
+        try:
+            response = dynamodb_client.call(
+                deadline, 'update_item', **room_patch_update(room_id, user_id, fields, expected_version, updated_at)
+            )
+        except dynamodb_client.exceptions.ConditionalCheckFailedException:
+            # Se distingue el motivo con una lectura, solo en el camino de error
+            return rejected_update(RoomRepository(backend, deadline).get(room_id), room_id, user_id, expected_version)
+
+        room = serialize_dynamo_to_dict(response['Attributes'])
+        logger.info("Room %s actualizado a la versión %s", room_id, room['version'])
+
+        return Response(status_code=200, body={'message': 'Room actualizado correctamente', 'data': room_to_dict(room)}).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
+    except Exception as e:
+        logger.error("Error inesperado en el servidor: %s", e)
+        return Response(status_code=500, body={'message': 'Error interno del servidor.'}).to_dict()
@@ -0,0 +1,50 @@
+from utils.config import ROOM_TABLE, ROOM_TTL_ATTRIBUTE
+from utils.sharding import owner_of, owner_condition
+
+
+def room_owner_id(room):
+    """Docente dueño del room: user_id (sin shard) mientras está activo y archived_user_id una vez archivado."""
+    return owner_of(room.get('user_id')) or room.get('archived_user_id')
+
+
+def is_archived(room) -> bool:
+    return 'user_id' not in room and 'archived_user_id' in room
+
+
+def archive_room_update(room_id: str, user_id: str, course: str, archived_at: str, expires_at: int = None) -> dict:
+    """
+    Acción Update (para TransactWriteItems) que archiva un room activo del docente.
+
+    ROOM_GSI_INDEX_USERID_ID es un índice disperso: al quitar user_id el room sale del índice, así que las
+    consultas de rooms activos ya no lo leen (ni lo cobran). El dueño queda en archived_user_id, que es la
+    clave de ROOM_GSI_INDEX_ARCHIVED (sin shard). La condición sobre user_id hace que solo el dueño pueda
+    archivar y que archivar dos veces falle. Con expires_at, el TTL de DynamoDB borra el room más adelante.
+
+    El room archivado sigue en ROOM_GSI_INDEX_SYNC con updated_at = archived_at: es la lápida con la que la
+    sincronización incremental avisa a los clientes que lo quiten de su lista.
+
+    Los rooms archivados no cuentan en stats#<docente>: la misma transacción descuenta el room de su curso, y la
+    condición sobre course asegura que se descuenta del curso que el room tiene al archivarse.
+    """
+    condition, values = owner_condition(user_id)
+    condition += ' AND course = :course'
+    values[':course'] = {'S': course}
+    update_expression = ('REMOVE user_id SET archived_user_id = :user_id, archived_at = :archived_at, '
+                         'updated_at = :archived_at, sync_user_id = :user_id')
+    values[':archived_at'] = {'S': archived_at}
+    names = {}
+    if expires_at is not None:
+        update_expression += ', #ttl = :expires_at'
+        names['#ttl'] = ROOM_TTL_ATTRIBUTE
+        values[':expires_at'] = {'N': str(expires_at)}
+
+    params = {
+        'TableName': ROOM_TABLE,
+        'Key': {'id': {'S': room_id}},
+        'UpdateExpression': update_expression,
+        'ConditionExpression': condition,
+        'ExpressionAttributeValues': values
+    }
+    if names:
+        params['ExpressionAttributeNames'] = names
+    return params
@@ -0,0 +1,120 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+import boto3
+from botocore.config import Config
+from utils.config import (ROOM_TABLE, WEBSOCKET_MANAGEMENT_ENDPOINT, BROADCAST_MAX_WORKERS, BROADCAST_CONNECT_TIMEOUT,
+                          BROADCAST_READ_TIMEOUT)
+from utils.connections import room_registry_key, prune_connections_update
+from utils.deadline import DeadlineExceeded
+from utils.structured_log import get_logger
+
+logger = get_logger(__name__)
+
+_management_clients = {}
+_executor = None
+
+
+def management_client(endpoint_url: str):
+    """
+    Cliente de la API de administración de conexiones (apigatewaymanagementapi), uno por endpoint y contenedor.
+    El pool HTTP se dimensiona para los envíos concurrentes y no hay reintentos: una conexión que no responde
+    a tiempo se vuelve a intentar en el próximo cambio de estado, no en este.
+    """
+    client = _management_clients.get(endpoint_url)
+    if client is None:
+        client = boto3.client('apigatewaymanagementapi', endpoint_url=endpoint_url, config=Config(
+            connect_timeout=BROADCAST_CONNECT_TIMEOUT,
+            read_timeout=BROADCAST_READ_TIMEOUT,
+            retries={'max_attempts': 0},
+            max_pool_connections=BROADCAST_MAX_WORKERS
+        ))
+        _management_clients[endpoint_url] = client
+    return client
+
+
+def endpoint_from_event(event: dict):
+    """Endpoint de administración de la API WebSocket que originó el evento (o el configurado si no es WebSocket)."""
+    request_context = (event or {}).get('requestContext') or {}
+    if request_context.get('domainName') and request_context.get('stage'):
+        return f"https://{request_context['domainName']}/{request_context['stage']}"
+    return WEBSOCKET_MANAGEMENT_ENDPOINT
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=BROADCAST_MAX_WORKERS, thread_name_prefix='broadcast')
+    return _executor
+
+
+class Broadcaster:
+    """
+    Difunde un cambio de estado a todas las conexiones WebSocket de un room.
+
+    Lee el registro del room (un GetItem) y envía el mensaje a cada conexión con post_to_connection en
+    paralelo, con un pool de hilos que se reutiliza entre invocaciones del contenedor. Las conexiones que
+    API Gateway ya cerró (GoneException) se quitan del registro al final, en una sola escritura.
+    """
+
+    def __init__(self, dynamodb_client, endpoint_url: str = WEBSOCKET_MANAGEMENT_ENDPOINT, api_client=None):
+        self.dynamodb_client = dynamodb_client
+        self.endpoint_url = endpoint_url
+        self._api_client = api_client
+
+    @property
+    def enabled(self) -> bool:
+        return self._api_client is not None or bool(self.endpoint_url)
+
+    @property
+    def api_client(self):
+        if self._api_client is None:
+            self._api_client = management_client(self.endpoint_url)
+        return self._api_client
+
+    def connections(self, deadline, room_id: str) -> list:
+        response = self.dynamodb_client.call(deadline, 'get_item', TableName=ROOM_TABLE, Key=room_registry_key(room_id),
+                                             ProjectionExpression='connections')
+        return list(response.get('Item', {}).get('connections', {}).get('SS', []))
+
+    def _post(self, connection_id: str, data: bytes):
+        """Devuelve 'sent', 'gone' o 'failed'."""
+        try:
+            self.api_client.post_to_connection(ConnectionId=connection_id, Data=data)
+            return 'sent'
+        except self.api_client.exceptions.GoneException:
+            return 'gone'
+        except Exception as e:
+            logger.error("No se pudo enviar a la conexión %s: %s", connection_id, e)
+            return 'failed'
+
+    def broadcast(self, deadline, room_id: str, message: dict, exclude: str = None) -> dict:
+        """
+        Envía message (JSON) a todas las conexiones del room salvo exclude (por ejemplo, quien originó el cambio).
+        :return: {'sent': n, 'gone': n, 'failed': n}
+        """
+        summary = {'sent': 0, 'gone': 0, 'failed': 0}
+        if not self.enabled:
+            return summary
+
+        targets = [connection_id for connection_id in self.connections(deadline, room_id) if connection_id != exclude]
+        if not targets:
+            return summary
+
+        data = json.dumps(message).encode('utf-8')
+        deadline.ensure(BROADCAST_READ_TIMEOUT * 1000, 'broadcast')
+        results = _get_executor().map(lambda connection_id: self._post(connection_id, data), targets)
+
+        stale = []
+        for connection_id, result in zip(targets, results):
+            summary[result] += 1
+            if result == 'gone':
+                stale.append(connection_id)
+
+        if stale:
+            try:
+                self.dynamodb_client.call(deadline, 'update_item', **prune_connections_update(room_id, stale))
+            except DeadlineExceeded:
+                logger.error("Sin tiempo para quitar %s conexiones cerradas del room %s", len(stale), room_id)
+
+        logger.info("Difusión en el room %s: %s", room_id, summary)
+        return summary
@@ -0,0 +1,47 @@
+import json
+import hashlib
+from utils.config import CATALOG_FILE, CATALOG_BUNDLE_PATH
+
+_catalog = None
+
+
+class Catalog:
+    """
+    Catálogo del juego dividido en bundles direccionados por contenido.
+
+    Cada sección del artefacto (heroes, villains, missions) se serializa una vez de forma canónica y su
+    hash es parte de la URL del bundle. Mientras la sección no cambie, la URL tampoco y el cliente puede
+    guardar el bundle para siempre. El manifiesto lista los bundles vigentes y su ETag cambia solo cuando
+    cambia algún hash.
+    """
+
+    def __init__(self, sections: dict):
+        self.bundles = {}  # hash -> bytes servidos tal cual
+        bundles = {}
+        for name, data in sorted(sections.items()):
+            body = json.dumps({'name': name, 'data': data}, ensure_ascii=False, sort_keys=True,
+                              separators=(',', ':')).encode('utf-8')
+            content_hash = hashlib.sha256(body).hexdigest()[:16]
+            self.bundles[content_hash] = body
+            bundles[name] = {'hash': content_hash, 'path': f"{CATALOG_BUNDLE_PATH}{content_hash}", 'bytes': len(body)}
+
+        version = hashlib.sha256(json.dumps(bundles, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        self.etag = f'"{version}"'
+        self.manifest = json.dumps({'version': version, 'bundles': bundles}, separators=(',', ':'))
+
+    @classmethod
+    def from_file(cls, path: str = CATALOG_FILE) -> 'Catalog':
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def bundle(self, content_hash: str):
+        """Bytes del bundle o None si el hash no es de esta versión del catálogo."""
+        return self.bundles.get(content_hash)
+
+
+def get_catalog() -> Catalog:
+    """Catálogo del contenedor: el artefacto se lee y se serializa una sola vez."""
+    global _catalog
+    if _catalog is None:
+        _catalog = Catalog.from_file()
+    return _catalog
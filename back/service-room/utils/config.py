@@ -27,3 +27,248 @@ schema_create_room = {
     }
 }
 
+
+"""presupuesto de tiempo por invocación (deadline)"""
+
+DEADLINE_DEFAULT_BUDGET_MS = 29000  # Se usa cuando no hay context (ejecución local)
+DEADLINE_SAFETY_MARGIN_MS = 500  # Margen reservado para construir la respuesta
+DYNAMO_MIN_CALL_MS = 150  # Tiempo mínimo para intentar una llamada a DynamoDB
+DYNAMO_MAX_CALL_TIMEOUT = 5  # Timeout máximo (segundos) por intento a DynamoDB
+DYNAMO_CONNECT_TIMEOUT = 1
+DYNAMO_MAX_ATTEMPTS = 3
+DYNAMO_TIMEOUT_BUCKETS = (1, 2, 3, 5)  # Timeouts posibles, cada uno con su propio cliente
+
+"""exportación NDJSON de rooms"""
+
+EXPORT_PAGE_SIZE = LIMIT_PAGE_SIZE  # Items por página leída de DynamoDB
+EXPORT_CHUNK_BYTES = 64 * 1024  # Tamaño aproximado de cada bloque NDJSON
+EXPORT_MAX_RESPONSE_BYTES = 5 * 1024 * 1024  # Debajo del límite de 6 MB de respuesta de Lambda
+EXPORT_MIN_REMAINING_MS = 1000  # Tiempo que se reserva para cerrar la respuesta parcial
+
+"""estadísticas de rooms por docente"""
+
+ROOM_STATS_PREFIX = 'stats#'  # id del item de estadísticas: stats#<user_id>
+ROOM_STATS_COURSE_PREFIX = 'course_count#'  # atributo por curso: course_count#<curso>
+
+"""warm-up de contenedores"""
+
+WARMUP_SOURCE = 'aula360.warmup'  # source de los eventos de warm-up
+WARMUP_HOLD_MS = 100  # Con concurrencia > 1, mantiene ocupado el contenedor para forzar contenedores distintos
+WARMUP_CONCURRENCY = int(os.environ.get('WARMUP_CONCURRENCY', 1))  # Contenedores a mantener calientes por función
+WARMUP_TARGETS = [name for name in os.environ.get('WARMUP_TARGETS', '').split(',') if name]
+
+"""códigos cortos para unirse a un room"""
+
+ROOM_TTL_ATTRIBUTE = 'expires_at'  # Atributo TTL de ROOM_TABLE (epoch en segundos)
+JOIN_CODE_PREFIX = 'join#'  # id del item de búsqueda: join#<código>
+JOIN_CODE_ALPHABET = 'ABCDEFGHJKMNPQRSTUVWXYZ23456789'  # Sin caracteres ambiguos (0/O, 1/I/L)
+JOIN_CODE_LENGTH = 6
+JOIN_CODE_TTL_SECONDS = 7 * 24 * 3600
+JOIN_CODE_MAX_ATTEMPTS = 5  # Reintentos con otro código si hay colisión
+JOIN_CODE_CACHE_TTL_SECONDS = 60
+JOIN_CODE_CACHE_SIZE = 1024
+
+ROLES_PERMITED_JOIN_ROOM = {'TEACHER', 'STUDENT'}
+
+"""puntajes y leaderboard por room"""
+
+SCORE_PREFIX = 'score#'  # id del puntaje acumulado: score#<room_id>#<student_id>
+LEADERBOARD_PREFIX = 'leaderboard#'  # id del top-K del room: leaderboard#<room_id>
+LEADERBOARD_SIZE = 10  # K: cantidad de posiciones que se guardan y se devuelven
+LEADERBOARD_MAX_ATTEMPTS = 6  # Reintentos de la escritura condicional del top-K ante escrituras concurrentes
+LEADERBOARD_RETRY_BASE_MS = 20  # Base del backoff exponencial con jitter entre reintentos
+LEADERBOARD_CACHE_TTL_SECONDS = 2  # El leaderboard puede verse con hasta 2 s de atraso
+LEADERBOARD_CACHE_SIZE = 512
+ROOM_EXISTS_CACHE_TTL_SECONDS = 60
+ROOM_EXISTS_CACHE_SIZE = 1024
+
+ROLES_PERMITED_SUBMIT_SCORE = {'STUDENT'}
+ROLES_PERMITED_VIEW_LEADERBOARD = {'TEACHER', 'STUDENT'}
+
+schema_submit_score = {
+    'type': dict,
+    'schema': {
+        'points': {'type': int, 'min': 1, 'max': 10000}
+    }
+}
+
+"""ingesta en lote de respuestas de misiones"""
+
+ANSWER_PREFIX = 'answer#'  # id de cada respuesta: answer#<room_id>#<student_id>#<event_id>
+ANSWER_BATCH_MAX_EVENTS = 100  # Eventos por solicitud; el cliente envía un lote cada pocos segundos
+DYNAMO_BATCH_WRITE_SIZE = 25  # Máximo de items por BatchWriteItem
+DYNAMO_BATCH_WRITE_MAX_ATTEMPTS = 5  # Reintentos de los UnprocessedItems
+DYNAMO_BATCH_RETRY_BASE_MS = 50  # Base del backoff exponencial con jitter entre reintentos
+
+ROLES_PERMITED_SUBMIT_ANSWERS = {'STUDENT'}
+
+schema_answer_batch = {
+    'type': dict,
+    'schema': {
+        'events': {'type': list, 'minlength': 1, 'maxlength': ANSWER_BATCH_MAX_EVENTS}
+    }
+}
+
+schema_answer_event = {
+    'type': dict,
+    'schema': {
+        'event_id': {'type': str, 'regex': r'^[A-Za-z0-9_-]{8,64}$'},  # Generado por el cliente (por ejemplo un UUID)
+        'question_id': {'type': str, 'minlength': 1, 'maxlength': 64},
+        'answer': {'type': str, 'minlength': 1, 'maxlength': 500},
+        'correct': {'type': bool},
+        'elapsed_ms': {'type': int, 'min': 0, 'max': 3600000}
+    }
+}
+
+"""idempotencia de la creación de rooms"""
+
+IDEMPOTENCY_HEADER = 'idempotency-key'  # Se busca sin distinguir mayúsculas
+IDEMPOTENCY_PREFIX = 'idem#'  # id del item: idem#<user_id>#<clave>
+IDEMPOTENCY_KEY_PATTERN = r'^[A-Za-z0-9_-]{8,128}$'
+IDEMPOTENCY_TTL_SECONDS = 24 * 3600  # Tiempo durante el cual un reintento devuelve la respuesta original
+IDEMPOTENCY_CACHE_TTL_SECONDS = 300
+IDEMPOTENCY_CACHE_SIZE = 1024
+
+"""repositorios"""
+
+DATA_BACKEND = os.environ.get('DATA_BACKEND', 'dynamodb')  # 'memory' usa un backend en memoria (pruebas y benchmarks)
+DYNAMO_BATCH_GET_SIZE = 100  # Máximo de claves por BatchGetItem
+DYNAMO_BATCH_GET_MAX_ATTEMPTS = 5  # Reintentos de los UnprocessedKeys
+
+"""membresías de estudiantes en rooms"""
+
+ROOM_GSI_INDEX_MEMBER = os.environ['ROOM_GSI_INDEX_MEMBER']  # GSI sobrecargado: member_id (hash) + joined_at (range)
+MEMBER_PREFIX = 'member#'  # ids: member#room#<room_id>#<student_id> y member#student#<student_id>#<room_id>
+MEMBERSHIP_CACHE_TTL_SECONDS = 300
+MEMBERSHIP_CACHE_SIZE = 4096
+ROLES_PERMITED_LIST_MY_ROOMS = {'STUDENT'}
+
+"""edición de rooms"""
+
+ROLES_PERMITED_UPDATE_ROOM = {'TEACHER'}
+
+"""particiones repartidas de ROOM_GSI_INDEX_USERID_ID"""
+
+# Docentes con mucho volumen cuyos rooms nuevos se reparten en user_id#<shard>: "user_id:shards,user_id:shards".
+# La cantidad de un docente solo puede crecer: las lecturas recorren user_id y user_id#0 .. user_id#<shards - 1>.
+ROOM_USER_SHARDS_MAX = 16
+ROOM_USER_SHARDS = {
+    user_id.strip(): min(int(shards), ROOM_USER_SHARDS_MAX)
+    for user_id, _, shards in (entry.partition(':') for entry in os.environ.get('ROOM_USER_SHARDS', '').split(','))
+    if user_id.strip() and shards.strip()
+}
+ROOM_SHARD_SEPARATOR = '#'  # Los ids de usuario son UUID, así que el separador no es ambiguo
+# Items de más que se piden a cada partición sobre su parte de la página (ceil(página / particiones))
+ROOM_SHARD_PAGE_SLACK = 2
+
+"""rooms archivados"""
+
+ROOM_GSI_INDEX_ARCHIVED = os.environ['ROOM_GSI_INDEX_ARCHIVED']  # GSI disperso: archived_user_id (hash) + archived_at (range)
+ARCHIVE_MAX_EXPIRE_DAYS = 3650
+
+schema_archive_room = {
+    'type': dict,
+    'schema': {
+        'expire_in_days': {'type': int, 'min': 1, 'max': ARCHIVE_MAX_EXPIRE_DAYS}  # Opcional: el room se borra por TTL
+    }
+}
+
+"""sincronización incremental de rooms"""
+
+# GSI disperso: sync_user_id (hash, docente sin shard) + updated_at (range). Todo room creado, editado o archivado
+# desde que existe el índice queda en él, archivado o no.
+ROOM_GSI_INDEX_SYNC = os.environ['ROOM_GSI_INDEX_SYNC']
+# Tiempo mínimo que un room archivado (lápida) sigue en la tabla. Una marca más antigua ya no garantiza haber
+# visto todas las lápidas, así que el cliente debe recargar la lista completa.
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+SYNC_OVERLAP_MS = 5000  # Se relee este margen antes de la marca: desfase de relojes y propagación del GSI
+ROLES_PERMITED_SYNC_ROOMS = {'TEACHER'}
+
+"""bancos de preguntas por room"""
+
+QBANK_PREFIX = 'qbank#'  # manifiesto: qbank#<room_id>; bloques: qbank#<room_id>#<write_id>#<n>
+QBANK_FORMAT_VERSION = 1  # Versión del encabezado binario; permite cambiar el formato sin migrar lo guardado
+QBANK_COMPRESSION_LEVEL = 6
+QBANK_CHUNK_BYTES = 350 * 1024  # Deja margen bajo el límite de 400 KB por item para la clave y los demás atributos
+QBANK_MAX_CHUNKS = 16
+QBANK_SUPERSEDED_CHUNK_TTL_SECONDS = 3600  # Los bloques de una versión reemplazada vencen después de este plazo
+QBANK_MAX_MISSIONS = 50
+QBANK_MAX_QUESTIONS_PER_MISSION = 200
+QBANK_CACHE_SIZE = 64  # Bancos ya decodificados por contenedor
+QBANK_CACHE_TTL_SECONDS = 3600  # La clave es el hash del contenido, así que una entrada nunca queda desactualizada
+
+ROLES_PERMITED_EDIT_QUESTION_BANK = {'TEACHER'}
+ROLES_PERMITED_VIEW_QUESTION_BANK = {'TEACHER', 'STUDENT'}
+
+schema_question = {
+    'type': dict,
+    'schema': {
+        'question_id': {'type': str, 'minlength': 1, 'maxlength': 64},  # El mismo question_id de answers
+        'prompt': {'type': str, 'minlength': 1, 'maxlength': 500},
+        'options': {'type': list, 'minlength': 2, 'maxlength': 6,
+                    'schema': {'type': str, 'minlength': 1, 'maxlength': 200}},
+        'answer': {'type': str, 'minlength': 1, 'maxlength': 200}
+    }
+}
+
+schema_question_bank = {
+    'type': dict,
+    'schema': {
+        'missions': {'type': list, 'minlength': 1, 'maxlength': QBANK_MAX_MISSIONS, 'schema': {
+            'type': dict,
+            'schema': {
+                'mission_id': {'type': str, 'minlength': 1, 'maxlength': 64},
+                'title': {'type': str, 'minlength': 1, 'maxlength': 60},
+                'questions': {'type': list, 'minlength': 1, 'maxlength': QBANK_MAX_QUESTIONS_PER_MISSION,
+                              'schema': schema_question}
+            }
+        }}
+    }
+}
+
+"""batallas en tiempo real (WebSocket)"""
+
+WS_ROOM_PREFIX = 'ws#'  # Registro de conexiones del room: ws#<room_id> con un string set "connections"
+WS_CONNECTION_PREFIX = 'conn#'  # conn#<connection_id> -> room y usuario, para $disconnect y los mensajes
+WS_CONNECTION_TTL_SECONDS = 2 * 3600 + 600  # API Gateway corta las conexiones a las 2 horas
+WS_CONNECTION_CACHE_TTL_SECONDS = 300
+WS_CONNECTION_CACHE_SIZE = 4096
+# https://<api>.execute-api.<región>.amazonaws.com/<stage>; para pruebas locales, la URL del sustituto local
+WEBSOCKET_MANAGEMENT_ENDPOINT = os.environ.get('WEBSOCKET_MANAGEMENT_ENDPOINT')
+BROADCAST_MAX_WORKERS = 32  # post_to_connection concurrentes (y conexiones HTTP del cliente)
+BROADCAST_CONNECT_TIMEOUT = 1
+BROADCAST_READ_TIMEOUT = 2
+BATTLE_MESSAGE_MAX_BYTES = 8 * 1024  # Límite del estado que un cliente puede difundir por mensaje
+
+ROLES_PERMITED_BATTLE = {'TEACHER', 'STUDENT'}
+
+"""revocación de tokens"""
+
+# Los items revocados viven en la tabla de usuarios (service-user); sin tabla o sin índice no se consulta la lista
+TOKEN_REVOCATION_TABLE = os.environ.get('TOKEN_REVOCATION_TABLE')
+TOKEN_REVOCATION_INDEX = os.environ.get('TOKEN_REVOCATION_INDEX')  # GSI disperso: revocation_day (hash) + revoked_at (range)
+TOKEN_REVOCATION_PREFIX = 'revoked#'  # id del item: revoked#<jti>, con TTL en el exp del token
+TOKEN_REVOCATION_REFRESH_SECONDS = 5  # Cada cuánto un contenedor trae las revocaciones nuevas
+TOKEN_REVOCATION_OVERLAP_MS = 10000  # Margen que se vuelve a leer en cada refresco (el GSI es eventualmente consistente)
+TOKEN_REVOCATION_REFRESH_BUDGET_MS = 1500  # Presupuesto de un refresco; si no alcanza se sigue con la lista anterior
+
+"""catálogo del juego (héroes, villanos y misiones)"""
+
+# Artefacto empaquetado con las funciones; se lee una sola vez por contenedor
+CATALOG_FILE = os.environ.get('CATALOG_FILE', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                                            'content', 'catalog.json'))
+CATALOG_BUNDLE_PATH = 'catalog/bundles/'  # Ruta de cada bundle: catalog/bundles/<hash>
+CATALOG_MANIFEST_CACHE_CONTROL = 'public, no-cache'  # Se revalida siempre con If-None-Match (304 si no cambió)
+CATALOG_BUNDLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'  # El hash está en la URL: nunca cambia
+
+"""logs estructurados"""
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+# Fracción de invocaciones sin advertencias ni errores cuyos logs se escriben; las demás se descartan sin formatear
+LOG_SUCCESS_SAMPLE_RATE = float(os.environ.get('LOG_SUCCESS_SAMPLE_RATE', '0.1'))
+LOG_MAX_RECORDS_PER_INVOCATION = 200  # Tope del buffer por invocación; lo que exceda solo se cuenta
+
+"""perfilado de memoria (opcional)"""
+
+MEMORY_PROFILING = os.environ.get('MEMORY_PROFILING', '0') == '1'  # Solo para replays locales o pruebas puntuales
+MEMORY_PROFILING_TOP_SITES = 5  # Sitios de asignación que se reportan por etapa
@@ -0,0 +1,67 @@
+import time
+from utils.config import (ROOM_TABLE, ROOM_TTL_ATTRIBUTE, WS_ROOM_PREFIX, WS_CONNECTION_PREFIX,
+                          WS_CONNECTION_TTL_SECONDS)
+
+
+def room_registry_key(room_id: str) -> dict:
+    """Clave del registro de conexiones WebSocket de un room dentro de ROOM_TABLE."""
+    return {'id': {'S': f"{WS_ROOM_PREFIX}{room_id}"}}
+
+
+def connection_key(connection_id: str) -> dict:
+    return {'id': {'S': f"{WS_CONNECTION_PREFIX}{connection_id}"}}
+
+
+def register_connection_actions(room_id: str, connection_id: str, user_id: str, role: str) -> list:
+    """
+    Acciones (para TransactWriteItems) que registran una conexión: la agregan al string set del room y guardan
+    conexión -> room. Con todas las conexiones del room en un solo item, difundir un cambio es un GetItem;
+    el TTL se renueva en cada conexión, así que un room sin actividad se limpia solo. El usuario se guarda
+    en member_user_id y no en user_id para no entrar en ROOM_GSI_INDEX_USERID_ID.
+    """
+    expires_at = str(int(time.time()) + WS_CONNECTION_TTL_SECONDS)
+    return [
+        {'Update': {
+            'TableName': ROOM_TABLE,
+            'Key': room_registry_key(room_id),
+            'UpdateExpression': 'ADD connections :connection SET room_id = :room_id, #ttl = :expires_at',
+            'ExpressionAttributeNames': {'#ttl': ROOM_TTL_ATTRIBUTE},
+            'ExpressionAttributeValues': {':connection': {'SS': [connection_id]}, ':room_id': {'S': room_id},
+                                          ':expires_at': {'N': expires_at}}
+        }},
+        {'Put': {
+            'TableName': ROOM_TABLE,
+            'Item': {**connection_key(connection_id), 'room_id': {'S': room_id}, 'member_user_id': {'S': user_id},
+                     'role': {'S': role}, ROOM_TTL_ATTRIBUTE: {'N': expires_at}}
+        }}
+    ]
+
+
+def unregister_connection_actions(room_id: str, connection_id: str) -> list:
+    """Acciones (para TransactWriteItems) que quitan la conexión del room y borran conexión -> room."""
+    return [
+        {'Update': {
+            'TableName': ROOM_TABLE,
+            'Key': room_registry_key(room_id),
+            'UpdateExpression': 'DELETE connections :connection',
+            'ExpressionAttributeValues': {':connection': {'SS': [connection_id]}}
+        }},
+        {'Delete': {'TableName': ROOM_TABLE, 'Key': connection_key(connection_id)}}
+    ]
+
+
+def prune_connections_update(room_id: str, connection_ids) -> dict:
+    """Parámetros de UpdateItem que quitan del registro las conexiones que API Gateway ya cerró."""
+    return {
+        'TableName': ROOM_TABLE,
+        'Key': room_registry_key(room_id),
+        'UpdateExpression': 'DELETE connections :stale',
+        'ExpressionAttributeValues': {':stale': {'SS': sorted(connection_ids)}}
+    }
+
+
+def connection_from_item(item: dict):
+    """conn#<id> -> {'room_id', 'user_id', 'role'} o None si no está registrada."""
+    if not item:
+        return None
+    return {'room_id': item['room_id']['S'], 'user_id': item['member_user_id']['S'], 'role': item['role']['S']}
@@ -0,0 +1,147 @@
+import time
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ConnectTimeoutError, ReadTimeoutError
+from utils.config import (DEADLINE_DEFAULT_BUDGET_MS, DEADLINE_SAFETY_MARGIN_MS, DYNAMO_MIN_CALL_MS,
+                          DYNAMO_MAX_CALL_TIMEOUT, DYNAMO_CONNECT_TIMEOUT, DYNAMO_MAX_ATTEMPTS,
+                          DYNAMO_TIMEOUT_BUCKETS)
+from utils.structured_log import get_logger
+
+logger = get_logger(__name__)
+
+
+class DeadlineExceeded(Exception):
+    """
+    Se lanza cuando no queda tiempo suficiente para completar una etapa de la invocación.
+    """
+
+    def __init__(self, stage: str, remaining_ms: int):
+        super().__init__(f"Tiempo insuficiente para '{stage}' (quedan {remaining_ms} ms)")
+        self.stage = stage
+        self.remaining_ms = remaining_ms
+
+
+class Deadline:
+    """
+    Presupuesto de tiempo de una invocación, calculado a partir del context de Lambda.
+
+    Reserva un margen de seguridad para que el handler siempre pueda construir una respuesta
+    (por ejemplo un 504) antes de que API Gateway corte la conexión.
+    """
+
+    def __init__(self, budget_ms: int, safety_margin_ms: int = DEADLINE_SAFETY_MARGIN_MS, clock=time.monotonic):
+        """
+        :param budget_ms: Milisegundos disponibles para la invocación.
+        :param safety_margin_ms: Milisegundos que se descuentan del presupuesto.
+        :param clock: Reloj monotónico en segundos (inyectable para pruebas).
+        """
+        self._clock = clock
+        self._expires_at = clock() + max(0, budget_ms - safety_margin_ms) / 1000
+
+    @classmethod
+    def from_context(cls, context, safety_margin_ms: int = DEADLINE_SAFETY_MARGIN_MS, clock=time.monotonic):
+        """
+        Crea el deadline desde el context de Lambda. Acepta cualquier objeto con
+        get_remaining_time_in_millis(); si no existe (ejecución local) usa el presupuesto por defecto.
+        """
+        get_remaining = getattr(context, 'get_remaining_time_in_millis', None)
+        budget_ms = get_remaining() if callable(get_remaining) else DEADLINE_DEFAULT_BUDGET_MS
+        return cls(budget_ms, safety_margin_ms, clock)
+
+    def remaining_ms(self) -> int:
+        return max(0, int((self._expires_at - self._clock()) * 1000))
+
+    def remaining_seconds(self) -> float:
+        return self.remaining_ms() / 1000
+
+    def expired(self) -> bool:
+        return self.remaining_ms() <= 0
+
+    def ensure(self, required_ms: int, stage: str):
+        """
+        Verifica que queden al menos required_ms antes de iniciar una etapa.
+        :raises DeadlineExceeded: Si no queda tiempo suficiente.
+        """
+        remaining = self.remaining_ms()
+        if remaining < required_ms:
+            logger.error("Deadline insuficiente para %s: quedan %s ms, se requieren %s ms",
+                         stage, remaining, required_ms)
+            raise DeadlineExceeded(stage, remaining)
+
+    def attempts_for(self, max_attempts: int, attempt_ms: int) -> int:
+        """Cantidad de intentos que caben en el tiempo restante si cada uno tarda attempt_ms."""
+        return max(1, min(max_attempts, self.remaining_ms() // max(1, attempt_ms)))
+
+
+class DynamoClientPool:
+    """
+    Mantiene un cliente de DynamoDB por combinación (timeout, intentos).
+
+    botocore fija los timeouts y reintentos al crear el cliente, así que en lugar de crear un cliente
+    por llamada se reutiliza uno de un conjunto pequeño de "buckets". A medida que el deadline se acerca
+    se eligen clientes con timeouts más cortos y menos reintentos.
+    """
+
+    def __init__(self, service_name: str = 'dynamodb', buckets=DYNAMO_TIMEOUT_BUCKETS):
+        self.service_name = service_name
+        self.buckets = sorted(bucket for bucket in buckets if bucket <= DYNAMO_MAX_CALL_TIMEOUT)
+        self._clients = {}
+        # El cliente sin restricciones se crea al importar, igual que antes, para pagar el costo en el cold start
+        self._default_client = self._get_client(self.buckets[-1], DYNAMO_MAX_ATTEMPTS)
+
+    def _get_client(self, timeout, attempts):
+        key = (timeout, attempts)
+        client = self._clients.get(key)
+        if client is None:
+            config = Config(
+                connect_timeout=min(DYNAMO_CONNECT_TIMEOUT, timeout),
+                read_timeout=timeout,
+                retries={'max_attempts': attempts - 1, 'mode': 'standard'}
+            )
+            client = boto3.client(self.service_name, config=config)
+            self._clients[key] = client
+        return client
+
+    @property
+    def exceptions(self):
+        return self._default_client.exceptions
+
+    def client_for(self, deadline: Deadline):
+        """
+        Devuelve el cliente cuyo timeout por intento y número de reintentos caben en el deadline.
+        """
+        remaining = deadline.remaining_seconds()
+        per_attempt = min(DYNAMO_MAX_CALL_TIMEOUT, remaining / DYNAMO_MAX_ATTEMPTS)
+
+        timeout = self.buckets[0]
+        for bucket in self.buckets:
+            if bucket <= per_attempt:
+                timeout = bucket
+
+        attempts = deadline.attempts_for(DYNAMO_MAX_ATTEMPTS, int(timeout * 1000))
+        return self._get_client(timeout, attempts)
+
+    def prime(self, deadline: Deadline):
+        """
+        Abre la conexión TLS del cliente que se usa con un deadline completo, para que la primera
+        llamada real no pague el handshake. El resultado de la llamada no importa (ni sus errores de permisos).
+        """
+        try:
+            self.client_for(deadline).describe_endpoints()
+        except Exception as e:
+            logger.info("Warm-up de DynamoDB sin respuesta válida (la conexión igual queda abierta): %s", e)
+
+    def call(self, deadline: Deadline, operation: str, **params):
+        """
+        Ejecuta una operación de DynamoDB respetando el deadline.
+        :param deadline: Deadline de la invocación actual.
+        :param operation: Nombre del método del cliente (query, put_item, ...).
+        :raises DeadlineExceeded: Si no hay tiempo para la llamada o si se agotó el timeout.
+        """
+        deadline.ensure(DYNAMO_MIN_CALL_MS, operation)
+        client = self.client_for(deadline)
+        try:
+            return getattr(client, operation)(**params)
+        except (ConnectTimeoutError, ReadTimeoutError) as e:
+            logger.error("Timeout en la operación %s de DynamoDB: %s", operation, e)
+            raise DeadlineExceeded(operation, deadline.remaining_ms()) from e
@@ -1,3 +1,7 @@
+import base64
+import json
+
+
 def serialize_dynamo_to_dict(dynamo_data):
     """
     Convierte los datos devueltos por DynamoDB a tipos estándar de Python.
@@ -53,4 +57,46 @@ def serialize_to_dynamo(data):
         return {'B': data}
 
     else:
-        return {'S': str(data)}
\ No newline at end of file
+        return {'S': str(data)}
+
+
+def encode_last_evaluated_key(last_evaluated_key: dict) -> str:
+    """Codifica el LastEvaluatedKey de DynamoDB como un cursor opaco (JSON en base64)."""
+    return base64.b64encode(json.dumps(last_evaluated_key).encode('utf-8')).decode('utf-8')
+
+
+def decode_last_evaluated_key(cursor: str) -> dict:
+    """Decodifica un cursor generado por encode_last_evaluated_key al formato de ExclusiveStartKey."""
+    return json.loads(base64.b64decode(cursor).decode('utf-8'))
+
+
+def read_page_params(query_params: dict, max_size: int, default_size: int = 10):
+    """
+    Lee los parámetros de paginación size y last_evaluated_key (cursor de encode_last_evaluated_key).
+    :return: (size, ExclusiveStartKey o None)
+    :raises ValueError: Si size no es válido o el cursor no se puede decodificar.
+    """
+    try:
+        size = int(query_params.get('size', default_size))
+    except (TypeError, ValueError):
+        raise ValueError("El tamaño de página debe ser un número entero.")
+    if size < 1:
+        raise ValueError("El tamaño de página debe ser mayor a 0.")
+    if size > max_size:
+        raise ValueError(f"El tamaño de página no puede ser mayor a {max_size}.")
+
+    cursor = query_params.get('last_evaluated_key')
+    if not cursor:
+        return size, None
+    try:
+        return size, decode_last_evaluated_key(cursor)
+    except (ValueError, TypeError):
+        raise ValueError("El parámetro last_evaluated_key no es válido.")
+
+
+def page_data(items_name: str, items: list, size: int, last_evaluated_key: dict = None) -> dict:
+    """Arma el bloque data de una respuesta paginada, con el cursor de la página siguiente si la hay."""
+    data = {items_name: items, 'size': size}
+    if last_evaluated_key:
+        data['last_evaluated_key'] = encode_last_evaluated_key(last_evaluated_key)
+    return data
@@ -0,0 +1,60 @@
+import re
+import time
+import json
+import hashlib
+from utils.config import ROOM_TABLE, ROOM_TTL_ATTRIBUTE, IDEMPOTENCY_HEADER, IDEMPOTENCY_PREFIX, IDEMPOTENCY_KEY_PATTERN
+
+IDEMPOTENCY_KEY_REGEX = re.compile(IDEMPOTENCY_KEY_PATTERN)
+
+
+def get_idempotency_key(headers: dict):
+    """
+    Devuelve el valor del encabezado Idempotency-Key (sin distinguir mayúsculas, como lo reenvía API Gateway
+    según el cliente) o None si no vino.
+    :raises ValueError: Si el encabezado vino con un formato inválido.
+    """
+    for name, value in (headers or {}).items():
+        if name.lower() == IDEMPOTENCY_HEADER:
+            if not value or not IDEMPOTENCY_KEY_REGEX.match(value):
+                raise ValueError("El encabezado Idempotency-Key no tiene un formato válido.")
+            return value
+    return None
+
+
+def idempotency_item_key(user_id: str, key: str) -> dict:
+    """Clave del item de idempotencia dentro de ROOM_TABLE; se separa por usuario para que las claves no choquen."""
+    return {'id': {'S': f"{IDEMPOTENCY_PREFIX}{user_id}#{key}"}}
+
+
+def request_fingerprint(body: dict) -> str:
+    """Huella del body, para detectar una misma clave reutilizada con otra solicitud."""
+    return hashlib.sha256(json.dumps(body, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def idempotency_put_action(user_id: str, key: str, fingerprint: str, status_code: int, body: dict,
+                           expires_at: int) -> dict:
+    """
+    Acción Put (para TransactWriteItems) que guarda la respuesta de la solicitud. Es condicional, así que si
+    otra solicitud con la misma clave ganó la carrera, la transacción completa (incluido el room) se cancela.
+    Una clave reutilizada después de su vencimiento reemplaza al item viejo aunque el TTL aún no lo haya borrado.
+    """
+    return {
+        'TableName': ROOM_TABLE,
+        'Item': {
+            **idempotency_item_key(user_id, key),
+            'fingerprint': {'S': fingerprint},
+            'status_code': {'N': str(status_code)},
+            'response': {'S': json.dumps(body)},
+            ROOM_TTL_ATTRIBUTE: {'N': str(expires_at)}
+        },
+        # Un item vencido que el TTL de DynamoDB todavía no borró cuenta como inexistente
+        'ConditionExpression': 'attribute_not_exists(id) OR #ttl < :now',
+        'ExpressionAttributeNames': {'#ttl': ROOM_TTL_ATTRIBUTE},
+        'ExpressionAttributeValues': {':now': {'N': str(int(time.time()))}}
+    }
+
+
+def stored_response_from_item(item: dict):
+    """Convierte el item de idempotencia en (huella, status_code, body, expires_at)."""
+    return (item['fingerprint']['S'], int(item['status_code']['N']), json.loads(item['response']['S']),
+            int(item[ROOM_TTL_ATTRIBUTE]['N']))
@@ -0,0 +1,82 @@
+import re
+import time
+import secrets
+from utils.config import (ROOM_TABLE, ROOM_TTL_ATTRIBUTE, JOIN_CODE_PREFIX, JOIN_CODE_ALPHABET, JOIN_CODE_LENGTH)
+from utils.sharding import owner_condition
+
+JOIN_CODE_PATTERN = re.compile(f"^[{JOIN_CODE_ALPHABET}]{{{JOIN_CODE_LENGTH}}}$")
+
+
+def generate_join_code() -> str:
+    """Genera un código aleatorio y legible para que los estudiantes entren a un room."""
+    return ''.join(secrets.choice(JOIN_CODE_ALPHABET) for _ in range(JOIN_CODE_LENGTH))
+
+
+def normalize_join_code(code: str) -> str:
+    """Normaliza lo que escribe el estudiante (mayúsculas, sin espacios ni guiones). Devuelve None si no es válido."""
+    code = (code or '').strip().upper().replace('-', '').replace(' ', '')
+    return code if JOIN_CODE_PATTERN.match(code) else None
+
+
+def join_code_key(code: str) -> dict:
+    """Clave del item de búsqueda del código dentro de ROOM_TABLE."""
+    return {'id': {'S': f"{JOIN_CODE_PREFIX}{code}"}}
+
+
+def join_code_put_action(code: str, room_id: str, expires_at: int) -> dict:
+    """
+    Acción Put (para TransactWriteItems) del item código -> room. Es condicional, así que una colisión
+    cancela la transacción y create reintenta con otro código. El atributo TTL hace que DynamoDB
+    elimine los códigos vencidos y el espacio de códigos se mantenga chico.
+    """
+    return {
+        'TableName': ROOM_TABLE,
+        'Item': {
+            **join_code_key(code),
+            'room_id': {'S': room_id},
+            ROOM_TTL_ATTRIBUTE: {'N': str(expires_at)}
+        },
+        # Un item vencido que el TTL de DynamoDB todavía no borró cuenta como inexistente
+        'ConditionExpression': 'attribute_not_exists(id) OR #ttl < :now',
+        'ExpressionAttributeNames': {'#ttl': ROOM_TTL_ATTRIBUTE},
+        'ExpressionAttributeValues': {':now': {'N': str(int(time.time()))}}
+    }
+
+
+def join_code_delete_action(code: str, room_id: str) -> dict:
+    """
+    Acción Delete del item de un código reemplazado. La condición evita borrar el código si, ya vencido,
+    otro room lo tomó; si el TTL ya lo borró no hay nada que borrar.
+    """
+    return {
+        'TableName': ROOM_TABLE,
+        'Key': join_code_key(code),
+        'ConditionExpression': 'attribute_not_exists(id) OR room_id = :room_id',
+        'ExpressionAttributeValues': {':room_id': {'S': room_id}}
+    }
+
+
+def room_join_code_update(room_id: str, user_id: str, previous_code: str, code: str, expires_at: int,
+                          updated_at: str) -> dict:
+    """
+    Acción Update (para TransactWriteItems) que asigna un código nuevo al room. Exige que el room siga activo,
+    sea del docente y conserve el código que se leyó, así dos regeneraciones simultáneas no se pisan. Renueva
+    updated_at (y sync_user_id) para que el cambio llegue a rooms/sync, y sube la versión como cualquier edición.
+    """
+    owner, values = owner_condition(user_id)
+    values.update({':code': {'S': code}, ':expires_at': {'N': str(expires_at)}, ':updated_at': {'S': updated_at},
+                   ':one': {'N': '1'}})
+    if previous_code:
+        values[':previous_code'] = {'S': previous_code}
+        code_condition = 'join_code = :previous_code'
+    else:
+        code_condition = 'attribute_not_exists(join_code)'
+    return {
+        'TableName': ROOM_TABLE,
+        'Key': {'id': {'S': room_id}},
+        'UpdateExpression': ('SET join_code = :code, join_code_expires_at = :expires_at, updated_at = :updated_at, '
+                             'sync_user_id = :user_id ADD #version :one'),
+        'ConditionExpression': f'{owner} AND {code_condition}',
+        'ExpressionAttributeNames': {'#version': 'version'},
+        'ExpressionAttributeValues': values
+    }
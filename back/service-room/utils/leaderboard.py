@@ -0,0 +1,136 @@
+import random
+import time
+from datetime import datetime
+from utils.config import (ROOM_TABLE, SCORE_PREFIX, LEADERBOARD_PREFIX, LEADERBOARD_SIZE, LEADERBOARD_MAX_ATTEMPTS,
+                          LEADERBOARD_RETRY_BASE_MS)
+from utils.structured_log import get_logger
+
+logger = get_logger(__name__)
+
+
+def score_item_key(room_id: str, student_id: str) -> dict:
+    """Clave del puntaje acumulado del estudiante en el room dentro de ROOM_TABLE."""
+    return {'id': {'S': f"{SCORE_PREFIX}{room_id}#{student_id}"}}
+
+
+def leaderboard_item_key(room_id: str) -> dict:
+    """Clave del item con el top-K precalculado del room dentro de ROOM_TABLE."""
+    return {'id': {'S': f"{LEADERBOARD_PREFIX}{room_id}"}}
+
+
+def add_score(dynamodb_client, deadline, room_id: str, student_id: str, points: int) -> int:
+    """
+    Suma points al puntaje del estudiante con un UpdateItem ADD (atómico, sin leer antes) y devuelve el total.
+    El item no lleva user_id para no aparecer en ROOM_GSI_INDEX_USERID_ID.
+    """
+    response = dynamodb_client.call(
+        deadline, 'update_item',
+        TableName=ROOM_TABLE,
+        Key=score_item_key(room_id, student_id),
+        UpdateExpression='SET room_id = :room_id, student_id = :student_id, updated_at = :updated_at ADD score :points',
+        ExpressionAttributeValues={
+            ':room_id': {'S': room_id},
+            ':student_id': {'S': student_id},
+            ':updated_at': {'S': datetime.utcnow().isoformat()},
+            ':points': {'N': str(points)}
+        },
+        ReturnValues='UPDATED_NEW'
+    )
+    return int(response['Attributes']['score']['N'])
+
+
+def leaderboard_from_item(item: dict):
+    """Convierte el item del leaderboard (formato DynamoDB) en (entradas ordenadas, versión)."""
+    if not item:
+        return [], 0
+    entries = [
+        {'student_id': entry['M']['student_id']['S'],
+         'username': entry['M']['username']['S'] if 'username' in entry['M'] else None,
+         'score': int(entry['M']['score']['N'])}
+        for entry in item.get('entries', {}).get('L', [])
+    ]
+    return entries, int(item['version']['N'])
+
+
+def merge_entry(entries: list, student_id: str, username: str, score: int, size: int = LEADERBOARD_SIZE):
+    """
+    Devuelve el nuevo top-K si el puntaje lo modifica, o None si no entra (o ya está reflejado).
+    Los empates se ordenan por student_id para que el orden no dependa de quién escribió primero.
+    """
+    current = next((entry for entry in entries if entry['student_id'] == student_id), None)
+    if current is not None and current['score'] >= score:
+        return None
+    if current is None and len(entries) >= size and score <= entries[-1]['score']:
+        return None
+
+    merged = [entry for entry in entries if entry['student_id'] != student_id]
+    merged.append({'student_id': student_id, 'username': username, 'score': score})
+    merged.sort(key=lambda entry: (-entry['score'], entry['student_id']))
+    return merged[:size]
+
+
+def _leaderboard_item(room_id: str, entries: list, version: int) -> dict:
+    return {
+        **leaderboard_item_key(room_id),
+        'room_id': {'S': room_id},
+        'version': {'N': str(version)},
+        'updated_at': {'S': datetime.utcnow().isoformat()},
+        'entries': {'L': [
+            {'M': {'student_id': {'S': entry['student_id']},
+                   'score': {'N': str(entry['score'])},
+                   **({'username': {'S': entry['username']}} if entry.get('username') else {})}}
+            for entry in entries
+        ]}
+    }
+
+
+def update_leaderboard(dynamodb_client, deadline, room_id: str, student_id: str, username: str, score: int,
+                       cache=None) -> bool:
+    """
+    Intenta ubicar el puntaje en el top-K del room. Devuelve True si el leaderboard cambió.
+
+    Usa control de concurrencia optimista: lee el item (lectura consistente), calcula el nuevo top-K y lo escribe
+    solo si la versión no cambió. Si otro estudiante escribió antes, se reintenta con backoff y jitter para que
+    una clase completa enviando a la vez no choque en cada intento. Los puntajes que no entran al top-K
+    no escriben nada, así que la contención real es solo entre los que sí lo modifican.
+
+    :param cache: TTLCache opcional con el último top-K visto por el contenedor. Como los puntajes solo crecen,
+                  el mínimo de una copia vieja nunca es mayor que el real: si el puntaje no entra en la copia,
+                  tampoco entra en el actual y se evita la lectura.
+    """
+    if cache is not None:
+        cached = cache.get(room_id)
+        if cached is not None and merge_entry(cached, student_id, username, score) is None:
+            return False
+
+    for attempt in range(LEADERBOARD_MAX_ATTEMPTS):
+        response = dynamodb_client.call(deadline, 'get_item', TableName=ROOM_TABLE,
+                                        Key=leaderboard_item_key(room_id), ConsistentRead=True)
+        entries, version = leaderboard_from_item(response.get('Item'))
+        if cache is not None:
+            cache.set(room_id, entries)
+
+        merged = merge_entry(entries, student_id, username, score)
+        if merged is None:
+            return False
+
+        if version:
+            condition = {'ConditionExpression': 'version = :version',
+                         'ExpressionAttributeValues': {':version': {'N': str(version)}}}
+        else:
+            condition = {'ConditionExpression': 'attribute_not_exists(id)'}
+
+        try:
+            dynamodb_client.call(deadline, 'put_item', TableName=ROOM_TABLE,
+                                 Item=_leaderboard_item(room_id, merged, version + 1), **condition)
+            if cache is not None:
+                cache.set(room_id, merged)
+            return True
+        except dynamodb_client.exceptions.ConditionalCheckFailedException:
+            backoff_ms = random.uniform(0, LEADERBOARD_RETRY_BASE_MS * (2 ** attempt))
+            logger.info("Leaderboard %s modificado concurrentemente, reintento en %.0f ms", room_id, backoff_ms)
+            deadline.ensure(int(backoff_ms), 'leaderboard_retry')
+            time.sleep(backoff_ms / 1000)
+
+    logger.error("No se pudo actualizar el leaderboard del room %s tras %s intentos", room_id, LEADERBOARD_MAX_ATTEMPTS)
+    return False
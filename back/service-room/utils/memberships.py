@@ -0,0 +1,48 @@
+from datetime import datetime
+from utils.config import ROOM_TABLE, MEMBER_PREFIX
+
+
+def room_members_key(room_id: str) -> str:
+    """Partición de ROOM_GSI_INDEX_MEMBER con los estudiantes de un room."""
+    return f"room#{room_id}"
+
+
+def student_rooms_key(student_id: str) -> str:
+    """Partición de ROOM_GSI_INDEX_MEMBER con los rooms de un estudiante."""
+    return f"student#{student_id}"
+
+
+def room_membership_id(room_id: str, student_id: str) -> str:
+    """id del item room -> estudiante; permite comprobar la membresía con una lectura por clave."""
+    return f"{MEMBER_PREFIX}room#{room_id}#{student_id}"
+
+
+def membership_put_actions(room_id: str, student_id: str, username: str = None) -> list:
+    """
+    Acciones Put (para TransactWriteItems) de los dos items de adyacencia de la membresía:
+    room -> estudiante y estudiante -> room. Ambos van en ROOM_GSI_INDEX_MEMBER bajo particiones distintas,
+    así que "estudiantes del room" y "rooms del estudiante" son una sola consulta cada una.
+
+    La condición del primer item hace que volver a unirse no reescriba la membresía (ni cambie joined_at).
+    Ninguno tiene user_id, así que no aparecen en ROOM_GSI_INDEX_USERID_ID.
+    """
+    joined_at = datetime.utcnow().isoformat()
+    common = {
+        'room_id': {'S': room_id},
+        'student_id': {'S': student_id},
+        'joined_at': {'S': joined_at},
+        **({'username': {'S': username}} if username else {})
+    }
+    return [
+        {'Put': {
+            'TableName': ROOM_TABLE,
+            'Item': {'id': {'S': room_membership_id(room_id, student_id)},
+                     'member_id': {'S': room_members_key(room_id)}, **common},
+            'ConditionExpression': 'attribute_not_exists(id)'
+        }},
+        {'Put': {
+            'TableName': ROOM_TABLE,
+            'Item': {'id': {'S': f"{MEMBER_PREFIX}student#{student_id}#{room_id}"},
+                     'member_id': {'S': student_rooms_key(student_id)}, **common}
+        }}
+    ]
@@ -0,0 +1,119 @@
+import time
+import resource
+import functools
+import tracemalloc
+from contextlib import contextmanager
+from utils.config import MEMORY_PROFILING, MEMORY_PROFILING_TOP_SITES
+from utils.structured_log import get_logger
+
+logger = get_logger(__name__)
+
+_PAGE_SIZE = resource.getpagesize()
+# Las asignaciones del propio perfilado no deben aparecer entre los sitios reportados
+_SNAPSHOT_FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+_current_profile = None
+
+
+def current_rss_bytes() -> int:
+    """RSS actual del proceso (Linux); 0 si no se puede leer."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def peak_rss_bytes() -> int:
+    """RSS máxima alcanzada por el proceso (ru_maxrss está en KB en Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MemoryProfile:
+    """
+    Mediciones de memoria de una invocación, separadas por etapas.
+
+    Por etapa registra el pico de tracemalloc, la RSS antes y después y los sitios (archivo:línea) que
+    más memoria asignaron. Al final se agrega todo como un record event=memory_profile al log de la invocación.
+    """
+
+    def __init__(self, function_name: str, memory_limit_mb: int = None, top_sites: int = MEMORY_PROFILING_TOP_SITES):
+        self.function_name = function_name
+        self.memory_limit_mb = memory_limit_mb
+        self.top_sites = top_sites
+        self.stages = []
+        self._open_peaks = []  # Pico acumulado de cada etapa abierta (las etapas pueden anidarse)
+
+    @contextmanager
+    def stage(self, name: str):
+        rss_before = current_rss_bytes()
+        snapshot_before = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        # reset_peak es global: antes de reiniciarlo se guarda el pico que lleva la etapa contenedora
+        if self._open_peaks:
+            self._open_peaks[-1] = max(self._open_peaks[-1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        self._open_peaks.append(0)
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            traced_peak = max(self._open_peaks.pop(), tracemalloc.get_traced_memory()[1])
+            if self._open_peaks:
+                self._open_peaks[-1] = max(self._open_peaks[-1], traced_peak)
+            snapshot_after = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+            top = snapshot_after.compare_to(snapshot_before, 'lineno')[:self.top_sites]
+            self.stages.append({
+                'stage': name,
+                'duration_ms': round(elapsed_ms, 2),
+                'tracemalloc_peak_bytes': traced_peak,
+                'rss_before_bytes': rss_before,
+                'rss_after_bytes': current_rss_bytes(),
+                'top_sites': [{'site': str(stat.traceback[0]), 'size_diff_bytes': stat.size_diff, 'count_diff': stat.count_diff}
+                              for stat in top if stat.size_diff > 0]
+            })
+
+    def to_log_record(self) -> dict:
+        return {
+            'event': 'memory_profile',
+            'function': self.function_name,
+            'memory_limit_mb': self.memory_limit_mb,
+            'peak_rss_bytes': peak_rss_bytes(),
+            'stages': self.stages
+        }
+
+
+@contextmanager
+def stage(name: str):
+    """Marca una etapa del handler. Sin perfilado activo no hace nada."""
+    if _current_profile is None:
+        yield
+    else:
+        with _current_profile.stage(name):
+            yield
+
+
+def profiled(handler):
+    """
+    Decorador del lambda_handler que activa el perfilado de memoria si MEMORY_PROFILING=1.
+    Si no está activo devuelve el handler sin envolver, así que en producción no agrega costo.
+    """
+    if not MEMORY_PROFILING:
+        return handler
+
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        global _current_profile
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _current_profile = MemoryProfile(
+            getattr(context, 'function_name', handler.__module__),
+            getattr(context, 'memory_limit_in_mb', None)
+        )
+        try:
+            with _current_profile.stage('handler'):
+                return handler(event, context)
+        finally:
+            logger.info("memory_profile", extra={'fields': _current_profile.to_log_record(), 'keep': True})
+            _current_profile = None
+
+    return wrapper
@@ -0,0 +1,192 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.dynamo_utils import serialize_dynamo_to_dict
+
+# Este módulo solo lo usan los scripts de reports/: no importa utils.config (que exige las variables de entorno
+# del servicio), así que sus parámetros viven aquí y los scripts funcionan con solo sus argumentos
+SCAN_CHECKPOINT_INTERVAL_SECONDS = 30  # Cada segmento reescribe el checkpoint como mucho una vez por intervalo
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class CapacityRateLimiter:
+    """
+    Limita el consumo de capacidad de lectura compartido entre todos los hilos del scan.
+
+    Funciona como un token bucket en unidades de capacidad por segundo: cada página descuenta el
+    ConsumedCapacity que devolvió DynamoDB y, si el saldo queda negativo, el hilo espera a recuperarlo.
+    """
+
+    def __init__(self, units_per_second: float, clock=time.monotonic, sleep=time.sleep):
+        self.units_per_second = units_per_second
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = units_per_second
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def consume(self, units: float):
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.units_per_second, self._tokens + (now - self._updated_at) * self.units_per_second)
+            self._updated_at = now
+            self._tokens -= units
+            wait = -self._tokens / self.units_per_second if self._tokens < 0 else 0
+
+        if wait > 0:
+            self._sleep(wait)
+
+
+class ScanCheckpoint:
+    """
+    Guarda en un archivo JSON, por segmento, el último LastEvaluatedKey y el agregado parcial.
+
+    El estado de cada segmento se escribe junto con su agregado, así que al reanudar un segmento
+    se continúa exactamente desde la página siguiente sin contar items dos veces.
+
+    Serializar el agregado y reescribir el archivo en cada página cuesta O(páginas × estado); por eso cada
+    segmento guarda su estado como mucho una vez cada interval_seconds, y siempre al terminar o cuando
+    falla la lectura de una página. Al reanudar se repiten a lo sumo las páginas de ese intervalo.
+    """
+
+    def __init__(self, path: str, total_segments: int, interval_seconds: float = SCAN_CHECKPOINT_INTERVAL_SECONDS,
+                 clock=time.monotonic):
+        self.path = path
+        self.total_segments = total_segments
+        self.interval_seconds = interval_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._segments = {}
+        self._saved_at = {}
+
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('total_segments') != total_segments:
+                raise ValueError(f"El checkpoint {path} fue creado con {state.get('total_segments')} segmentos, "
+                                 f"no con {total_segments}.")
+            self._segments = {int(segment): data for segment, data in state.get('segments', {}).items()}
+
+    def get(self, segment: int) -> dict:
+        return self._segments.get(segment, {'last_key': None, 'done': False, 'aggregate': None})
+
+    def due(self, segment: int) -> bool:
+        """Indica si ya pasó el intervalo desde que el segmento guardó su estado (nunca sin archivo)."""
+        if not self.path:
+            return False
+        saved_at = self._saved_at.get(segment)
+        return saved_at is None or self._clock() - saved_at >= self.interval_seconds
+
+    def update(self, segment: int, last_key: dict, done: bool, aggregate: dict):
+        with self._lock:
+            self._segments[segment] = {'last_key': last_key, 'done': done, 'aggregate': aggregate}
+            self._saved_at[segment] = self._clock()
+            if not self.path:
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'total_segments': self.total_segments, 'segments': self._segments}, f)
+            os.replace(tmp_path, self.path)  # Escritura atómica para no dejar un checkpoint corrupto
+
+
+class ParallelScanner:
+    """
+    Ejecuta un Scan segmentado en paralelo (Segment/TotalSegments) sobre una tabla.
+
+    Cada hilo procesa un segmento y agrega sus items de forma incremental en su propio agregado;
+    al final los agregados se combinan. El agregado debe implementar add(item), merge(other),
+    to_state() y load_state(state).
+    """
+
+    def __init__(self, dynamodb_client, table_name: str, total_segments: int = 4, max_workers: int = None,
+                 projection_expression: str = None, expression_attribute_names: dict = None,
+                 filter_expression: str = None, expression_attribute_values: dict = None, page_size: int = None,
+                 rate_limiter: CapacityRateLimiter = None, checkpoint: ScanCheckpoint = None):
+        self.dynamodb_client = dynamodb_client
+        self.table_name = table_name
+        self.total_segments = total_segments
+        self.max_workers = max_workers or total_segments
+        self.projection_expression = projection_expression
+        self.expression_attribute_names = expression_attribute_names
+        self.filter_expression = filter_expression
+        self.expression_attribute_values = expression_attribute_values
+        self.page_size = page_size
+        self.rate_limiter = rate_limiter
+        self.checkpoint = checkpoint or ScanCheckpoint(None, total_segments)
+
+    def _scan_params(self, segment: int) -> dict:
+        params = {
+            'TableName': self.table_name,
+            'Segment': segment,
+            'TotalSegments': self.total_segments,
+            'ReturnConsumedCapacity': 'TOTAL'
+        }
+        if self.projection_expression:
+            params['ProjectionExpression'] = self.projection_expression
+        if self.expression_attribute_names:
+            params['ExpressionAttributeNames'] = self.expression_attribute_names
+        if self.filter_expression:
+            params['FilterExpression'] = self.filter_expression
+        if self.expression_attribute_values:
+            params['ExpressionAttributeValues'] = self.expression_attribute_values
+        if self.page_size:
+            params['Limit'] = self.page_size
+        return params
+
+    def _scan_segment(self, segment: int, aggregate_factory):
+        aggregate = aggregate_factory()
+        state = self.checkpoint.get(segment)
+        if state['aggregate'] is not None:
+            aggregate.load_state(state['aggregate'])
+        if state['done']:
+            logger.info("Segmento %s ya completado según el checkpoint.", segment)
+            return aggregate
+
+        params = self._scan_params(segment)
+        last_key = state['last_key']
+        pages = 0
+        while True:
+            if last_key:
+                params['ExclusiveStartKey'] = last_key
+            try:
+                response = self.dynamodb_client.scan(**params)
+            except BaseException:
+                # Entre páginas el agregado está completo: se guarda el avance antes de propagar el error
+                if pages and self.checkpoint.path:
+                    self.checkpoint.update(segment, last_key, False, aggregate.to_state())
+                raise
+
+            for item in response.get('Items', []):
+                aggregate.add(serialize_dynamo_to_dict(item))
+
+            last_key = response.get('LastEvaluatedKey')
+            if last_key is None or self.checkpoint.due(segment):
+                self.checkpoint.update(segment, last_key, last_key is None, aggregate.to_state())
+            pages += 1
+
+            if self.rate_limiter:
+                self.rate_limiter.consume(response.get('ConsumedCapacity', {}).get('CapacityUnits', 0))
+
+            if not last_key:
+                break
+
+        logger.info("Segmento %s completado en %s páginas.", segment, pages)
+        return aggregate
+
+    def run(self, aggregate_factory):
+        """
+        Escanea todos los segmentos y devuelve el agregado combinado.
+        :param aggregate_factory: Callable sin argumentos que crea un agregado vacío.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._scan_segment, segment, aggregate_factory)
+                       for segment in range(self.total_segments)]
+            result = aggregate_factory()
+            for future in futures:
+                result.merge(future.result())
+        return result
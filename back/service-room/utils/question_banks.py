@@ -0,0 +1,165 @@
+import hashlib
+import json
+import struct
+import uuid
+import zlib
+from utils.config import (ROOM_TABLE, ROOM_TTL_ATTRIBUTE, QBANK_PREFIX, QBANK_FORMAT_VERSION, QBANK_COMPRESSION_LEVEL,
+                          QBANK_CHUNK_BYTES)
+
+# Encabezado del binario guardado: marca, versión del formato y códec
+_HEADER = struct.Struct('>2sBB')
+_MAGIC = b'QB'
+CODEC_ZLIB = 1
+
+
+class QuestionBankFormatError(ValueError):
+    """El binario guardado no tiene un encabezado o códec reconocido."""
+
+
+def manifest_id(room_id: str) -> str:
+    return f"{QBANK_PREFIX}{room_id}"
+
+
+def new_write_id() -> str:
+    """Identificador de una escritura del banco; va en el id de sus bloques."""
+    return uuid.uuid4().hex[:16]
+
+
+def chunk_id(room_id: str, write_id: str, index: int) -> str:
+    # Cada escritura usa sus propios ids, aunque el contenido se repita: nunca sobrescribe ni comparte los
+    # bloques de otra escritura, que pueden estar leyéndose o a punto de vencer
+    return f"{QBANK_PREFIX}{room_id}#{write_id}#{index}"
+
+
+def canonical_json(bank: dict) -> bytes:
+    """JSON con claves ordenadas y sin espacios: el mismo banco produce siempre los mismos bytes (y el mismo hash)."""
+    return json.dumps(bank, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def encode_question_bank(bank: dict):
+    """
+    Comprime el banco para guardarlo como atributo binario.
+    :return: (binario con encabezado, hash sha256 del JSON canónico, tamaño del JSON sin comprimir)
+    """
+    raw = canonical_json(bank)
+    blob = _HEADER.pack(_MAGIC, QBANK_FORMAT_VERSION, CODEC_ZLIB) + zlib.compress(raw, QBANK_COMPRESSION_LEVEL)
+    return blob, hashlib.sha256(raw).hexdigest(), len(raw)
+
+
+def decode_question_bank(blob: bytes) -> bytes:
+    """Devuelve el JSON canónico del banco a partir del binario guardado."""
+    if len(blob) < _HEADER.size:
+        raise QuestionBankFormatError("Banco de preguntas truncado")
+    magic, version, codec = _HEADER.unpack_from(blob)
+    if magic != _MAGIC or version != QBANK_FORMAT_VERSION:
+        raise QuestionBankFormatError(f"Formato de banco de preguntas no soportado (versión {version})")
+    if codec != CODEC_ZLIB:
+        raise QuestionBankFormatError(f"Códec de banco de preguntas desconocido: {codec}")
+    return zlib.decompress(blob[_HEADER.size:])
+
+
+def question_bank_items(room_id: str, blob: bytes, content_hash: str, raw_bytes: int, updated_at: str,
+                        write_id: str):
+    """
+    Items a escribir para un banco: el manifiesto y, si el binario no entra en un item, los bloques.
+
+    Un banco chico va completo dentro del manifiesto (una sola lectura). Uno grande se parte en bloques de
+    QBANK_CHUNK_BYTES que se escriben antes que el manifiesto; como el manifiesto es lo último que cambia,
+    un lector ve la versión anterior completa o la nueva completa. Los bloques de la versión anterior no se
+    borran, vencen por TTL (superseded_chunk_update) cuando un lector ya no puede necesitarlos.
+    :return: (manifiesto, lista de bloques)
+    """
+    manifest = {
+        'id': {'S': manifest_id(room_id)},
+        'room_id': {'S': room_id},
+        'content_hash': {'S': content_hash},
+        'format_version': {'N': str(QBANK_FORMAT_VERSION)},
+        'raw_bytes': {'N': str(raw_bytes)},
+        'compressed_bytes': {'N': str(len(blob))},
+        'updated_at': {'S': updated_at},
+        'write_id': {'S': write_id}
+    }
+    if len(blob) <= QBANK_CHUNK_BYTES:
+        manifest['data'] = {'B': blob}
+        manifest['chunk_count'] = {'N': '0'}
+        return manifest, []
+
+    chunks = [
+        {'id': {'S': chunk_id(room_id, write_id, index)}, 'data': {'B': blob[start:start + QBANK_CHUNK_BYTES]}}
+        for index, start in enumerate(range(0, len(blob), QBANK_CHUNK_BYTES))
+    ]
+    manifest['chunk_count'] = {'N': str(len(chunks))}
+    return manifest, chunks
+
+
+def chunk_ids_of(manifest: dict) -> list:
+    room_id = manifest['room_id']['S']
+    # Los manifiestos anteriores a write_id nombraban sus bloques con el prefijo del hash del contenido
+    write_id = manifest['write_id']['S'] if 'write_id' in manifest else manifest['content_hash']['S'][:16]
+    return [chunk_id(room_id, write_id, index) for index in range(int(manifest['chunk_count']['N']))]
+
+
+def manifest_put(manifest: dict, previous_manifest: dict = None) -> dict:
+    """
+    Parámetros del PutItem del manifiesto, condicionado a que el manifiesto siga siendo el que se leyó. Si otra
+    escritura se adelantó, la condición falla en lugar de dejar apuntando a bloques que la otra ya dio por vencidos.
+    """
+    params = {'TableName': ROOM_TABLE, 'Item': manifest}
+    if previous_manifest is None:
+        params['ConditionExpression'] = 'attribute_not_exists(id)'
+        return params
+    params['ConditionExpression'] = 'content_hash = :previous_hash'
+    params['ExpressionAttributeValues'] = {':previous_hash': previous_manifest['content_hash']}
+    if 'write_id' in previous_manifest:
+        params['ConditionExpression'] += ' AND write_id = :previous_write_id'
+        params['ExpressionAttributeValues'][':previous_write_id'] = previous_manifest['write_id']
+    return params
+
+
+def superseded_chunk_update(item_id: str, expires_at: int) -> dict:
+    """
+    Parámetros de UpdateItem que programan el borrado por TTL de un bloque de una versión reemplazada. No se
+    borra en el momento porque una lectura que ya tiene el manifiesto anterior todavía puede pedirlo.
+    """
+    return {
+        'TableName': ROOM_TABLE,
+        'Key': {'id': {'S': item_id}},
+        'UpdateExpression': 'SET #ttl = :expires_at',
+        'ConditionExpression': 'attribute_exists(id)',
+        'ExpressionAttributeNames': {'#ttl': ROOM_TTL_ATTRIBUTE},
+        'ExpressionAttributeValues': {':expires_at': {'N': str(expires_at)}}
+    }
+
+
+def blob_from_items(manifest: dict, chunks: dict) -> bytes:
+    """Reconstruye el binario a partir del manifiesto y los bloques leídos ({id: item})."""
+    if 'data' in manifest:
+        return manifest['data']['B']
+    parts = []
+    for item_id in chunk_ids_of(manifest):
+        if item_id not in chunks:
+            raise QuestionBankFormatError(f"Falta el bloque {item_id} del banco de preguntas")
+        parts.append(chunks[item_id]['data']['B'])
+    return b''.join(parts)
+
+
+def etag_of(content_hash: str, variant: str = '') -> str:
+    """ETag de la respuesta; el banco sin respuestas (para estudiantes) es otra representación y lleva otro ETag."""
+    return f'"{content_hash}{variant}"'
+
+
+def without_answers(bank: dict) -> dict:
+    """Copia del banco sin la respuesta correcta de cada pregunta, para los estudiantes."""
+    return {**bank, 'missions': [
+        {**mission, 'questions': [{k: v for k, v in question.items() if k != 'answer'} for question in mission['questions']]}
+        for mission in bank['missions']
+    ]}
+
+
+def if_none_match_matches(headers: dict, etag: str) -> bool:
+    """True si el encabezado If-None-Match (sin distinguir mayúsculas) incluye el ETag actual o '*'."""
+    for name, value in (headers or {}).items():
+        if name.lower() == 'if-none-match' and value:
+            candidates = {candidate.strip().removeprefix('W/') for candidate in value.split(',')}
+            return '*' in candidates or etag in candidates
+    return False
@@ -98,3 +98,26 @@ class Response:
             'body': json.dumps(response_body)
         }
 
+
+class RawResponse(Response):
+    """
+    Respuesta cuyo body ya está serializado (por ejemplo NDJSON o CSV), por lo que no se pasa por json.dumps.
+    """
+
+    def __init__(self, status_code: int = 200, body: str = '', content_type: str = 'text/plain', headers: dict = None):
+        super().__init__(status_code=status_code, headers=headers)
+        self.body = body
+        self.content_type = content_type
+
+    def to_dict(self) -> dict:
+        """
+        Convierte la respuesta en el formato de API Gateway agregando el Content-Type.
+
+        Returns:
+            dict: La respuesta con atributos 'statusCode', 'headers' y 'body' sin transformar.
+        """
+        return {
+            'statusCode': self.status_code,
+            'headers': {**self.headers, 'Content-Type': self.content_type},
+            'body': self.body
+        }
@@ -0,0 +1,136 @@
+import time
+import threading
+from datetime import datetime, timedelta, timezone
+from utils.config import (JWT_EXPIRATION_TIME, TOKEN_REVOCATION_TABLE, TOKEN_REVOCATION_INDEX, TOKEN_REVOCATION_PREFIX,
+                          TOKEN_REVOCATION_REFRESH_SECONDS, TOKEN_REVOCATION_OVERLAP_MS,
+                          TOKEN_REVOCATION_REFRESH_BUDGET_MS)
+from utils.deadline import Deadline, DynamoClientPool
+from utils.structured_log import get_logger
+
+logger = get_logger(__name__)
+
+_revocation_list = None
+
+
+def revocation_day(epoch_ms: int) -> str:
+    """Partición del GSI de revocaciones: una por día (UTC), así ninguna crece sin límite."""
+    return datetime.fromtimestamp(epoch_ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d')
+
+
+def revocation_days(since_ms: int, until_ms: int) -> list:
+    """Días (particiones) que cubren el intervalo [since_ms, until_ms]."""
+    day = datetime.fromtimestamp(since_ms / 1000, tz=timezone.utc).date()
+    last = datetime.fromtimestamp(until_ms / 1000, tz=timezone.utc).date()
+    days = []
+    while day <= last:
+        days.append(day.strftime('%Y-%m-%d'))
+        day += timedelta(days=1)
+    return days
+
+
+def revocation_item(jti: str, user_id: str, expires_at: int, revoked_at_ms: int) -> dict:
+    """
+    Item que revoca un token. Lleva revocation_day y revoked_at, las claves del GSI disperso que leen los
+    contenedores para refrescar su lista. No lleva username, así que no entra al GSI de usernames.
+    """
+    return {
+        'id': {'S': f"{TOKEN_REVOCATION_PREFIX}{jti}"},
+        'revoked_user_id': {'S': user_id},
+        'revocation_day': {'S': revocation_day(revoked_at_ms)},
+        'revoked_at': {'N': str(revoked_at_ms)},
+        'expires_at': {'N': str(expires_at)}
+    }
+
+
+class RevocationList:
+    """
+    Lista de tokens revocados (jti -> exp) mantenida en memoria por contenedor.
+
+    Consultar DynamoDB en cada solicitud duplicaría las lecturas. En su lugar, la primera verificación
+    carga las revocaciones de las últimas JWT_EXPIRATION_TIME horas, ya que un token más viejo expiró
+    de todos modos. Después, cada TOKEN_REVOCATION_REFRESH_SECONDS se leen solo las revocaciones nuevas
+    desde el GSI. Entre refrescos la verificación es una búsqueda en un dict.
+
+    Un token revocado en otro contenedor puede seguir aceptándose hasta TOKEN_REVOCATION_REFRESH_SECONDS.
+    Si un refresco falla, se sigue con la lista anterior y se reintenta en el próximo intervalo; no se
+    rechazan todas las solicitudes por una falla de DynamoDB.
+    """
+
+    def __init__(self, dynamodb_client, table: str = TOKEN_REVOCATION_TABLE, index: str = TOKEN_REVOCATION_INDEX):
+        self.dynamodb_client = dynamodb_client
+        self.table = table
+        self.index = index
+        self._revoked = {}
+        self._synced_ms = None  # revoked_at hasta el que la lista está al día
+        self._next_refresh = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.table and self.index)
+
+    def add(self, jti: str, expires_at: int):
+        """Registra una revocación hecha en este contenedor, que vale de inmediato sin esperar al refresco."""
+        self._revoked[jti] = expires_at
+
+    def is_revoked(self, jti: str) -> bool:
+        if not self.enabled or not jti:
+            return False
+        if time.monotonic() >= self._next_refresh:
+            self.refresh()
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def refresh(self, deadline=None):
+        with self._lock:
+            if time.monotonic() < self._next_refresh:
+                return  # Otro hilo acaba de refrescar
+            self._next_refresh = time.monotonic() + TOKEN_REVOCATION_REFRESH_SECONDS
+            now_ms = int(time.time() * 1000)
+            if self._synced_ms is None:
+                since_ms = now_ms - JWT_EXPIRATION_TIME * 1000
+            else:
+                since_ms = self._synced_ms - TOKEN_REVOCATION_OVERLAP_MS
+            deadline = deadline or Deadline(TOKEN_REVOCATION_REFRESH_BUDGET_MS, safety_margin_ms=0)
+
+            try:
+                loaded = 0
+                for day in revocation_days(since_ms, now_ms):
+                    loaded += self._load_day(deadline, day, since_ms)
+            except Exception as e:
+                logger.error("No se pudo refrescar la lista de tokens revocados: %s", e)
+                return
+
+            self._synced_ms = now_ms
+            now = time.time()
+            self._revoked = {jti: expires_at for jti, expires_at in self._revoked.items() if expires_at > now}
+            if loaded:
+                logger.info("Lista de tokens revocados: %s nuevos, %s vigentes", loaded, len(self._revoked))
+
+    def _load_day(self, deadline, day: str, since_ms: int) -> int:
+        params = {
+            'TableName': self.table,
+            'IndexName': self.index,
+            'KeyConditionExpression': 'revocation_day = :day AND revoked_at >= :since',
+            'ExpressionAttributeValues': {':day': {'S': day}, ':since': {'N': str(since_ms)}},
+            'ProjectionExpression': '#id, expires_at',
+            'ExpressionAttributeNames': {'#id': 'id'}
+        }
+        loaded = 0
+        while True:
+            response = self.dynamodb_client.call(deadline, 'query', **params)
+            for item in response.get('Items', []):
+                self._revoked[item['id']['S'][len(TOKEN_REVOCATION_PREFIX):]] = int(item['expires_at']['N'])
+                loaded += 1
+            if not response.get('LastEvaluatedKey'):
+                return loaded
+            params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def get_revocation_list() -> RevocationList:
+    """Lista compartida por todos los Token del contenedor."""
+    global _revocation_list
+    if _revocation_list is None:
+        enabled = TOKEN_REVOCATION_TABLE and TOKEN_REVOCATION_INDEX
+        _revocation_list = RevocationList(DynamoClientPool() if enabled else None)
+    return _revocation_list
@@ -0,0 +1,109 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from utils.config import ROOM_TABLE, ROOM_GSI_INDEX_USERID_ID, EXPORT_PAGE_SIZE, EXPORT_CHUNK_BYTES
+from utils.dynamo_utils import serialize_dynamo_to_dict
+from utils.room_repository import room_to_dict
+from utils.sharding import user_partition_keys
+
+
+def iter_room_pages(dynamodb_client, deadline, user_id: str, start_key: dict = None, page_size: int = EXPORT_PAGE_SIZE):
+    """
+    Recorre las páginas de rooms de un usuario en ROOM_GSI_INDEX_USERID_ID.
+
+    Mientras el consumidor procesa una página, la siguiente ya se está pidiendo en un hilo aparte,
+    de modo que la latencia de DynamoDB se solapa con la codificación. Nunca hay más de dos páginas en memoria.
+    Si el docente está repartido en shards, sus particiones se recorren una detrás de otra; la clave de cada
+    item ya incluye su partición (user_id#<shard>), así que sirve igual como punto de reanudación.
+
+    :param dynamodb_client: DynamoClientPool usado para las consultas.
+    :param deadline: Deadline de la invocación.
+    :param user_id: Usuario dueño de los rooms.
+    :param start_key: ExclusiveStartKey desde el que se continúa (opcional).
+    :param page_size: Items por página.
+    :return: Generador de listas de items en formato DynamoDB.
+    :raises ValueError: Si start_key no es una clave de exportación o no pertenece a una partición del usuario.
+    """
+    partition_keys = user_partition_keys(user_id)
+    position = 0
+    if start_key is not None:
+        # El cursor llega del cliente: tiene que ser exactamente una clave {'id', 'user_id'} de iter_ndjson_lines
+        if not isinstance(start_key, dict) or set(start_key) != {'id', 'user_id'} or not all(
+                isinstance(value, dict) and isinstance(value.get('S'), str) for value in start_key.values()):
+            raise ValueError("El cursor no tiene el formato de una clave de exportación.")
+        partition_key = start_key['user_id']['S']
+        if partition_key not in partition_keys:
+            raise ValueError("El cursor no corresponde a los rooms del usuario.")
+        position = partition_keys.index(partition_key)
+
+    def fetch(position, exclusive_start_key):
+        params = {
+            'TableName': ROOM_TABLE,
+            'IndexName': ROOM_GSI_INDEX_USERID_ID,
+            'KeyConditionExpression': 'user_id = :user_id',
+            'ExpressionAttributeValues': {':user_id': {'S': partition_keys[position]}},
+            'Limit': page_size
+        }
+        if exclusive_start_key:
+            params['ExclusiveStartKey'] = exclusive_start_key
+        return position, dynamodb_client.call(deadline, 'query', **params)
+
+    def pages():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(fetch, position, start_key)
+            while pending is not None:
+                current, response = pending.result()
+                last_evaluated_key = response.get('LastEvaluatedKey')
+                if last_evaluated_key:
+                    pending = executor.submit(fetch, current, last_evaluated_key)
+                elif current + 1 < len(partition_keys):
+                    pending = executor.submit(fetch, current + 1, None)
+                else:
+                    pending = None
+                yield response.get('Items', [])
+
+    return pages()
+
+
+def iter_ndjson_lines(pages):
+    """
+    Convierte páginas de items en líneas NDJSON.
+    :return: Generador de tuplas (clave del item, línea), la clave sirve para reanudar la exportación.
+    """
+    for items in pages:
+        for item in items:
+            key = {'id': item['id'], 'user_id': item['user_id']}
+            yield key, json.dumps(room_to_dict(serialize_dynamo_to_dict(item)), ensure_ascii=False) + '\n'
+
+
+def iter_ndjson_chunks(lines, chunk_bytes: int = EXPORT_CHUNK_BYTES):
+    """
+    Agrupa líneas NDJSON en bloques de aproximadamente chunk_bytes.
+    :return: Generador de tuplas (clave del último item del bloque, bloque en bytes).
+    """
+    buffer = []
+    size = 0
+    last_key = None
+    for last_key, line in lines:
+        encoded = line.encode('utf-8')
+        buffer.append(encoded)
+        size += len(encoded)
+        if size >= chunk_bytes:
+            yield last_key, b''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield last_key, b''.join(buffer)
+
+
+def stream_rooms_ndjson(out, dynamodb_client, deadline, user_id: str, start_key: dict = None):
+    """
+    Escribe en out (cualquier objeto con write(bytes)) todos los rooms del usuario en NDJSON,
+    bloque por bloque, sin acumular la exportación completa en memoria.
+    :return: Cantidad de bytes escritos.
+    """
+    written = 0
+    pages = iter_room_pages(dynamodb_client, deadline, user_id, start_key)
+    for _, chunk in iter_ndjson_chunks(iter_ndjson_lines(pages)):
+        out.write(chunk)
+        written += len(chunk)
+    return written
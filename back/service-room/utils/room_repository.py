@@ -0,0 +1,82 @@
+from utils.config import (ROOM_TABLE, ROOM_GSI_INDEX_USERID_ID, ROOM_GSI_INDEX_MEMBER, ROOM_GSI_INDEX_ARCHIVED,
+                          ROOM_GSI_INDEX_SYNC)
+from utils.memberships import student_rooms_key
+from utils.repository import Repository
+from utils.sharding import owner_of, user_partition_keys, is_shard_cursor, merged_page
+
+
+def room_to_dict(room: dict) -> dict:
+    """Vista pública de un room leído del repositorio."""
+    data = dict(room)
+    # Los rooms de docentes repartidos guardan user_id#<shard>; hacia afuera siempre se expone el docente
+    if 'user_id' in data:
+        data['user_id'] = owner_of(data['user_id'])
+    data.pop('sync_user_id', None)  # Solo es la clave de ROOM_GSI_INDEX_SYNC
+    return data
+
+
+class RoomRepository(Repository):
+    """
+    Acceso a los rooms de ROOM_TABLE.
+    """
+    table = ROOM_TABLE
+
+    def _accepts(self, item_id: str) -> bool:
+        # Los ids de los rooms son UUID; los items auxiliares (stats#, join#, score#, ...) nunca son rooms
+        return bool(item_id) and '#' not in item_id
+
+    def exists(self, room_id: str) -> bool:
+        return self.get(room_id) is not None
+
+    def list_by_user(self, user_id: str, limit: int = None, start_key: dict = None):
+        """
+        Rooms del docente por ROOM_GSI_INDEX_USERID_ID, paginados. Si el docente está repartido en shards
+        (ROOM_USER_SHARDS) se leen todas sus particiones en paralelo y el cursor es compuesto.
+        :return: (lista de rooms, LastEvaluatedKey o cursor compuesto, o None)
+        :raises ValueError: Si el cursor no corresponde a las particiones del docente.
+        """
+        partition_keys = user_partition_keys(user_id)
+        if len(partition_keys) == 1 and not is_shard_cursor(start_key):
+            items, last_key = self.backend.query(self.deadline, self.table, ROOM_GSI_INDEX_USERID_ID, 'user_id',
+                                                 user_id, limit=limit, start_key=start_key)
+        else:
+            items, last_key = merged_page(
+                lambda partition_key, key, size: self.backend.query(self.deadline, self.table, ROOM_GSI_INDEX_USERID_ID,
+                                                                    'user_id', partition_key, limit=size, start_key=key),
+                partition_keys, 'user_id', limit, start_key
+            )
+        return [self._remember(item) for item in items], last_key
+
+    def list_archived_by_user(self, user_id: str, limit: int = None, start_key: dict = None):
+        """
+        Rooms archivados del docente por ROOM_GSI_INDEX_ARCHIVED, del archivado más reciente al más antiguo.
+        :return: (lista de rooms, LastEvaluatedKey o None)
+        """
+        items, last_key = self.backend.query(self.deadline, self.table, ROOM_GSI_INDEX_ARCHIVED, 'archived_user_id',
+                                             user_id, limit=limit, start_key=start_key, ascending=False)
+        return [self._remember(item) for item in items], last_key
+
+    def list_changed_since(self, user_id: str, changed_after: str, limit: int = None, start_key: dict = None):
+        """
+        Rooms del docente con updated_at posterior a changed_after, activos o archivados, por ROOM_GSI_INDEX_SYNC:
+        una consulta por rango sobre la clave de ordenamiento, del cambio más antiguo al más reciente.
+        :return: (lista de rooms, LastEvaluatedKey o None)
+        """
+        items, last_key = self.backend.query(self.deadline, self.table, ROOM_GSI_INDEX_SYNC, 'sync_user_id', user_id,
+                                             limit=limit, start_key=start_key, range_name='updated_at',
+                                             range_after=changed_after)
+        return [self._remember(item) for item in items], last_key
+
+    def list_for_student(self, student_id: str, limit: int = None, start_key: dict = None):
+        """
+        Rooms a los que se unió el estudiante, del más reciente al más antiguo: una consulta paginada
+        a ROOM_GSI_INDEX_MEMBER y un solo BatchGetItem para los datos de los rooms de la página.
+        :return: (lista de (room, joined_at), LastEvaluatedKey o None)
+        """
+        memberships, last_key = self.backend.query(self.deadline, self.table, ROOM_GSI_INDEX_MEMBER, 'member_id',
+                                                   student_rooms_key(student_id), limit=limit, start_key=start_key,
+                                                   ascending=False)
+        rooms = self.get_many([membership['room_id']['S'] for membership in memberships])
+        # Un room eliminado deja su membresía huérfana; simplemente no se devuelve
+        return [(room, membership['joined_at']['S'])
+                for room, membership in zip(rooms, memberships) if room is not None], last_key
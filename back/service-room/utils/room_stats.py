@@ -0,0 +1,35 @@
+from utils.config import ROOM_TABLE, ROOM_STATS_PREFIX, ROOM_STATS_COURSE_PREFIX
+
+
+def stats_item_key(user_id: str) -> dict:
+    """Clave del item de estadísticas del docente dentro de ROOM_TABLE."""
+    return {'id': {'S': f"{ROOM_STATS_PREFIX}{user_id}"}}
+
+
+def stats_increment_action(user_id: str, course: str, delta: int = 1) -> dict:
+    """
+    Acción Update (para TransactWriteItems) que suma delta al total de rooms del docente y al contador del curso.
+
+    Los contadores por curso son atributos de primer nivel (course_count#<curso>) porque ADD no puede crear
+    claves dentro de un mapa que todavía no existe. El item usa owner_id y no user_id para no aparecer
+    en ROOM_GSI_INDEX_USERID_ID junto a los rooms.
+    """
+    return {
+        'TableName': ROOM_TABLE,
+        'Key': stats_item_key(user_id),
+        'UpdateExpression': 'SET owner_id = :user_id ADD room_count :delta, #course_count :delta',
+        'ExpressionAttributeNames': {'#course_count': f"{ROOM_STATS_COURSE_PREFIX}{course}"},
+        'ExpressionAttributeValues': {':user_id': {'S': user_id}, ':delta': {'N': str(delta)}}
+    }
+
+
+def stats_from_item(item: dict) -> dict:
+    """Convierte el item de estadísticas (formato DynamoDB) en {'total': n, 'by_course': {curso: n}}."""
+    item = item or {}
+    by_course = {
+        name[len(ROOM_STATS_COURSE_PREFIX):]: int(value['N'])
+        for name, value in item.items()
+        if name.startswith(ROOM_STATS_COURSE_PREFIX) and int(value['N']) > 0
+    }
+    total = int(item['room_count']['N']) if 'room_count' in item else 0
+    return {'total': total, 'by_course': by_course}
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+from utils.config import SYNC_TOMBSTONE_RETENTION_DAYS, SYNC_OVERLAP_MS
+
+
+def sync_watermark(now: datetime = None) -> str:
+    """
+    Marca de sincronización: el instante (UTC, mismo formato que updated_at) en que empezó la lectura. Se toma
+    antes de consultar, así que lo que cambie durante la lectura vuelve a aparecer en la próxima sincronización.
+    """
+    return (now or datetime.utcnow()).isoformat(timespec='microseconds')
+
+
+def parse_watermark(value) -> datetime:
+    """
+    Lee la marca que envía el cliente (la de la última sincronización o la de rooms/get).
+    :raises ValueError: Si no es una fecha ISO 8601.
+    """
+    try:
+        since = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError("El parámetro since debe ser una marca de sincronización válida.")
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    return since
+
+
+def is_expired(since: datetime, now: datetime = None) -> bool:
+    """Con una marca más antigua que la retención de lápidas, un room archivado pudo borrarse sin que el cliente lo viera."""
+    return since < (now or datetime.utcnow()) - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS)
+
+
+def changed_after(since: datetime) -> str:
+    """
+    Límite inferior de updated_at para la consulta: la marca menos SYNC_OVERLAP_MS. Un room escrito por otro
+    contenedor con el reloj atrasado, o que todavía no llegó al GSI, no se pierde; a cambio algunos rooms se
+    devuelven dos veces, y el cliente los aplica por id.
+    """
+    return (since - timedelta(milliseconds=SYNC_OVERLAP_MS)).isoformat(timespec='microseconds')
+
+
+def sync_cursor(watermark: str, last_evaluated_key: dict):
+    """Cursor de la página siguiente: la marca de la primera página viaja con el LastEvaluatedKey."""
+    return {'watermark': watermark, 'key': last_evaluated_key} if last_evaluated_key else None
+
+
+def read_sync_cursor(start_key: dict, user_id: str):
+    """
+    :return: (marca de la primera página, LastEvaluatedKey)
+    :raises ValueError: Si el cursor no es de una sincronización de los rooms del docente.
+    """
+    watermark, key = start_key.get('watermark'), start_key.get('key')
+    if not isinstance(watermark, str) or not isinstance(key, dict):
+        raise ValueError("El parámetro last_evaluated_key no es válido.")
+    if (key.get('sync_user_id') or {}).get('S') != user_id:
+        raise ValueError("El cursor no corresponde a los rooms del usuario.")
+    return watermark, key
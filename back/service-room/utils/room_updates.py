@@ -0,0 +1,41 @@
+from utils.config import ROOM_TABLE
+from utils.dynamo_utils import serialize_to_dynamo
+from utils.sharding import owner_condition
+
+
+def room_patch_update(room_id: str, user_id: str, fields: dict, expected_version: int, updated_at: str) -> dict:
+    """
+    Parámetros de UpdateItem que aplican una actualización parcial de un room en una sola escritura.
+
+    Solo se tocan los campos recibidos (ya validados). La condición exige que el room siga activo y sea del
+    docente (user_id, con o sin shard) y que su versión sea la que el cliente leyó; si otro cambio se adelantó,
+    la condición falla en lugar de pisarlo. Los rooms creados antes del versionado no tienen version y cuentan como 0.
+    ReturnValues=ALL_NEW devuelve el room ya actualizado, así que no hace falta otra lectura.
+
+    updated_at y sync_user_id (el docente sin shard) son las claves de ROOM_GSI_INDEX_SYNC: el room editado
+    aparece en la próxima sincronización incremental, también si se creó antes de existir el índice.
+    """
+    owner, values = owner_condition(user_id)
+    names = {'#version': 'version', '#updated_at': 'updated_at'}
+    values.update({':one': {'N': '1'}, ':updated_at': {'S': updated_at}})
+    assignments = ['#updated_at = :updated_at', 'sync_user_id = :user_id']
+    for position, (field, value) in enumerate(serialize_to_dynamo(fields).items()):
+        names[f'#f{position}'] = field
+        values[f':f{position}'] = value
+        assignments.append(f'#f{position} = :f{position}')
+
+    if expected_version:
+        values[':version'] = {'N': str(expected_version)}
+        version_condition = '#version = :version'
+    else:
+        version_condition = 'attribute_not_exists(#version)'
+
+    return {
+        'TableName': ROOM_TABLE,
+        'Key': {'id': {'S': room_id}},
+        'UpdateExpression': f"SET {', '.join(assignments)} ADD #version :one",
+        'ConditionExpression': f'{owner} AND {version_condition}',
+        'ExpressionAttributeNames': names,
+        'ExpressionAttributeValues': values,
+        'ReturnValues': 'ALL_NEW'
+    }
@@ -0,0 +1,135 @@
+import hashlib
+import heapq
+import math
+from concurrent.futures import ThreadPoolExecutor
+from utils.config import ROOM_USER_SHARDS, ROOM_USER_SHARDS_MAX, ROOM_SHARD_SEPARATOR, ROOM_SHARD_PAGE_SLACK
+
+_executor = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=ROOM_USER_SHARDS_MAX + 1, thread_name_prefix='shard-query')
+    return _executor
+
+
+def user_partition_key(user_id: str, room_id: str) -> str:
+    """
+    Valor de user_id con el que se guarda un room nuevo. Para los docentes de ROOM_USER_SHARDS es
+    user_id#<shard>, con el shard derivado del id del room: el mismo room siempre cae en el mismo shard.
+    """
+    shards = ROOM_USER_SHARDS.get(user_id)
+    if not shards:
+        return user_id
+    shard = int(hashlib.sha256(room_id.encode('utf-8')).hexdigest()[:8], 16) % shards
+    return f"{user_id}{ROOM_SHARD_SEPARATOR}{shard}"
+
+
+def user_partition_keys(user_id: str) -> list:
+    """
+    Particiones donde puede haber rooms del docente. Siempre incluye user_id sin shard: ahí quedan los rooms
+    creados antes de repartirlo.
+    """
+    return [user_id] + [f"{user_id}{ROOM_SHARD_SEPARATOR}{shard}" for shard in range(ROOM_USER_SHARDS.get(user_id, 0))]
+
+
+def owner_of(partition_key: str):
+    """Docente de un valor de user_id, con o sin shard."""
+    return partition_key.split(ROOM_SHARD_SEPARATOR, 1)[0] if partition_key else partition_key
+
+
+def owner_condition(user_id: str):
+    """
+    Condición (y sus valores) de que el room activo es del docente, sea cual sea su shard.
+    :return: (ConditionExpression, ExpressionAttributeValues)
+    """
+    return ('(user_id = :user_id OR begins_with(user_id, :user_shard_prefix))',
+            {':user_id': {'S': user_id}, ':user_shard_prefix': {'S': f"{user_id}{ROOM_SHARD_SEPARATOR}"}})
+
+
+def is_shard_cursor(start_key) -> bool:
+    return isinstance(start_key, dict) and isinstance(start_key.get('shards'), dict)
+
+
+def read_shard_cursor(start_key, partition_keys: list, key_name: str) -> dict:
+    """
+    Posición de cada partición según el cursor: un cursor compuesto ({'shards': {partición: clave}}) o un
+    LastEvaluatedKey simple de antes de repartir al docente. Las particiones ya agotadas no aparecen.
+    :raises ValueError: Si el cursor nombra particiones que no son del docente.
+    """
+    if start_key is None:
+        return {partition_key: None for partition_key in partition_keys}
+    if is_shard_cursor(start_key):
+        positions = start_key['shards']
+    else:
+        partition_key = (start_key.get(key_name) or {}).get('S')
+        # Un cursor simple apunta a una sola partición; las demás todavía no se leyeron
+        positions = {key: (start_key if key == partition_key else None) for key in partition_keys}
+    if not set(positions) <= set(partition_keys):
+        raise ValueError("El cursor no corresponde a los rooms del usuario.")
+    return positions
+
+
+def partition_limit(remaining: int, partitions: int) -> int:
+    """Limit de cada partición para completar `remaining` items entre `partitions` particiones."""
+    return min(remaining, math.ceil(remaining / partitions) + ROOM_SHARD_PAGE_SLACK)
+
+
+def merged_page(fetch, partition_keys: list, key_name: str, limit: int, start_key: dict = None):
+    """
+    Una página de `limit` items leída de varias particiones en paralelo y combinada por id (k-way merge).
+
+    Cada partición se consulta con su parte de la página (partition_limit) en lugar del Limit completo, así que
+    una página lee del orden de limit + particiones × ROOM_SHARD_PAGE_SLACK items y no limit × particiones.
+    Si durante el merge se acaba lo leído de una partición que todavía tiene LastEvaluatedKey, solo esa (y las
+    que estén en la misma situación) se vuelve a consultar, en paralelo, por lo que falta para completar la página.
+
+    De cada partición se consume un prefijo de lo que devolvió, así que el cursor compuesto nunca repite ni
+    salta items: cada partición continúa después de su último item entregado, o desde su LastEvaluatedKey si
+    se entregó todo lo leído.
+
+    :param fetch: fetch(partición, ExclusiveStartKey o None, Limit) -> (items, LastEvaluatedKey o None).
+    :return: (items en formato DynamoDB, cursor compuesto o None si no quedan items)
+    """
+    positions = read_shard_cursor(start_key, partition_keys, key_name)
+    if not positions:
+        return [], None
+
+    # Por partición: ExclusiveStartKey de la última consulta, items leídos (None si todavía no se consultó),
+    # cuántos de ellos ya se entregaron y LastEvaluatedKey de esa consulta
+    streams = {partition_key: {'start': position, 'items': None, 'delivered': 0, 'last_key': None}
+               for partition_key, position in positions.items()}
+    page = []
+    while len(page) < limit:
+        # Una partición sin items en memoria pero con más por leer puede tener el próximo id: se completa antes de seguir
+        pending = [partition_key for partition_key, stream in streams.items() if stream['items'] is None or (
+            stream['delivered'] == len(stream['items']) and stream['last_key'])]
+        if pending:
+            size = partition_limit(limit - len(page), len(pending))
+            for partition_key in pending:
+                if streams[partition_key]['items'] is not None:
+                    streams[partition_key]['start'] = streams[partition_key]['last_key']
+            results = _get_executor().map(
+                lambda partition_key: fetch(partition_key, streams[partition_key]['start'], size), pending)
+            for partition_key, (items, last_key) in zip(pending, results):
+                streams[partition_key].update(items=items, delivered=0, last_key=last_key)
+            continue
+
+        heads = [(stream['items'][stream['delivered']]['id']['S'], partition_key)
+                 for partition_key, stream in streams.items() if stream['delivered'] < len(stream['items'])]
+        if not heads:
+            break
+        stream = streams[min(heads)[1]]
+        page.append(stream['items'][stream['delivered']])
+        stream['delivered'] += 1
+
+    next_positions = {}
+    for partition_key, stream in streams.items():
+        items, delivered = stream['items'], stream['delivered']
+        if delivered < len(items):
+            last = items[delivered - 1] if delivered else None
+            next_positions[partition_key] = {'id': last['id'], key_name: last[key_name]} if last else stream['start']
+        elif stream['last_key']:
+            next_positions[partition_key] = stream['last_key']
+    return page, ({'shards': next_positions} if next_positions else None)
@@ -1,22 +1,25 @@
-import logging
 import jwt
+import uuid
 import datetime
 from typing import Optional
 from utils.config import JWT_SECRET_KEY, JWT_ALGORITHM,JWT_EXPIRATION_TIME
+from utils.revocation import get_revocation_list
+from utils.structured_log import get_logger
 
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = get_logger(__name__)
 class Token:
-    def __init__(self, secret_key: str, algorithm: str = "HS256", expiration_time: int = 3600):
+    def __init__(self, secret_key: str, algorithm: str = "HS256", expiration_time: int = 3600, revocations=None):
         """
         Inicializa la clase Token.
         :param secret_key: La clave secreta para firmar los tokens.
         :param algorithm: El algoritmo de firma (por defecto es 'HS256').
         :param expiration_time: El tiempo de expiración del token en segundos (por defecto es 1 hora).
+        :param revocations: RevocationList contra la que se verifica el jti (opcional).
         """
         self.secret_key = secret_key
         self.algorithm = algorithm
         self.expiration_time = expiration_time
+        self.revocations = revocations
 
     def generate_token(self, payload: dict) -> str:
         """
@@ -26,18 +29,19 @@ class Token:
         """
         expiration = datetime.datetime.utcnow() + datetime.timedelta(seconds=self.expiration_time)
         payload["exp"] = expiration  # Añadir el tiempo de expiración al payload
+        payload["jti"] = uuid.uuid4().hex  # Identificador del token, para poder revocarlo antes del exp
         return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
 
     def decode_token(self, token: str) -> Optional[dict]:
         """
         Decodifica un token JWT.
-        Si el token es válido y no ha expirado, devuelve el payload; si no, devuelve None.
+        Si el token es válido, no ha expirado y no fue revocado, devuelve el payload; si no, lanza ValueError.
         :param token: El token que se desea decodificar.
-        :return: El payload decodificado o None si el token es inválido o ha expirado.
+        :return: El payload decodificado.
+        :raises ValueError: Si el token es inválido, expiró o fue revocado.
         """
         try:
             decoded = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            return decoded
         except jwt.ExpiredSignatureError:
             logger.error("El token ha expirado.")
             raise ValueError("Token expired")
@@ -45,6 +49,11 @@ class Token:
             logger.error("Token inválido.")
             raise ValueError("Token invalid")
 
+        if self.revocations is not None and self.revocations.is_revoked(decoded.get('jti')):
+            logger.error("Token revocado.")
+            raise ValueError("Token revoked")
+        return decoded
+
     def validate_token(self, token: str) -> bool:
         """
         Valida si el token es válido y no ha expirado.
@@ -67,4 +76,4 @@ class Token:
 
 
 def get_token_instance():
-    return Token(JWT_SECRET_KEY, JWT_ALGORITHM, JWT_EXPIRATION_TIME)
\ No newline at end of file
+    return Token(JWT_SECRET_KEY, JWT_ALGORITHM, JWT_EXPIRATION_TIME, get_revocation_list())
\ No newline at end of file
@@ -1,26 +1,63 @@
 import re
-from utils.config import schema_create_room
+from utils.config import (schema_create_room, schema_submit_score, schema_answer_batch, schema_answer_event,
+                          schema_archive_room, schema_question_bank)
 class CustomValidator:
     """
     Clase para validar datos según un esquema definido, soportando validación de tipo, rango y formato.
     """
 
     def __init__(self, schema: dict):
-        self.schema = schema
+        self.schema = self._compile(schema)
         self.errors = {}
 
+    def _compile(self, schema):
+        """
+        Devuelve una copia del esquema con las expresiones regulares ya compiladas, para no
+        compilarlas (ni buscarlas en la caché de re) en cada validación.
+        """
+        if not isinstance(schema, dict):
+            return schema
+        compiled = dict(schema)
+        if isinstance(compiled.get('regex'), str):
+            compiled['regex'] = re.compile(compiled['regex'])
+        if 'schema' in compiled:
+            if compiled.get('type') is dict:
+                compiled['schema'] = {field: self._compile(rules) for field, rules in compiled['schema'].items()}
+            else:
+                compiled['schema'] = self._compile(compiled['schema'])
+        return compiled
+
     def validate(self, data, param_field='general'):
         self.errors = {}
         return self._validate(data, self.schema, param_field)
 
+    def validate_partial(self, data, param_field='general'):
+        """
+        Valida solo los campos presentes (actualizaciones parciales): cada campo debe estar en el esquema y
+        cumplir sus reglas, pero los que faltan no son error. Se exige al menos un campo.
+        """
+        self.errors = {}
+        if not isinstance(data, dict) or not data:
+            self._add_error(param_field, f"{param_field} debe tener al menos un campo.")
+            return False
+
+        schema_dict = self.schema.get('schema', {})
+        for field, value in data.items():
+            if field not in schema_dict:
+                self._add_error(field, f"Campo {field} no está definido en el esquema.")
+                continue
+            self._validate(value, schema_dict[field], param_field=field)
+
+        return not bool(self.errors)
+
     def _validate(self, data, schema, param_field='general'):
         # Validación de esquema
         if 'type' not in schema:
             self._add_error(param_field, f"El esquema está mal definido, debe tener un 'type' o no hay esquema para {type(data).__name__}")
             return False
 
-        # Validación de tipo
-        if not isinstance(data, schema['type']):
+        # Validación de tipo (bool es subclase de int, pero true/false no es un número válido)
+        if not isinstance(data, schema['type']) or (isinstance(data, bool) and schema['type'] is not bool):
             self._add_error(param_field, f"El campo {param_field} debe ser de tipo {schema['type'].__name__}")
 
         # Aplicar validación según el tipo de datos
@@ -123,3 +160,27 @@ class CustomValidator:
 def get_validator_create_room():
     return CustomValidator(schema_create_room)
 
+
+def get_validator_submit_score():
+    return CustomValidator(schema_submit_score)
+
+
+def get_validator_answer_batch():
+    return CustomValidator(schema_answer_batch)
+
+
+def get_validator_answer_event():
+    return CustomValidator(schema_answer_event)
+
+
+def get_validator_update_room():
+    # Las actualizaciones parciales usan las mismas reglas que la creación, con validate_partial
+    return CustomValidator(schema_create_room)
+
+
+def get_validator_archive_room():
+    return CustomValidator(schema_archive_room)
+
+
+def get_validator_question_bank():
+    return CustomValidator(schema_question_bank)
@@ -0,0 +1,231 @@
+import csv
+import io
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from utils.response import Response
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled, stage
+from utils.repository import get_backend
+from utils.dynamo_utils import serialize_to_dynamo
+from utils.user_repository import UserRepository
+from utils.usernames import username_reservation_key, username_reservation_put
+from utils.batch_writer import batch_put_items, batch_delete_keys
+from utils.hash_pool import BcryptPool
+from utils.config import (USER_TABLE, ROLES_PERMITED_BULK_IMPORT, BULK_IMPORT_MAX_ROWS, BCRYPT_ROUNDS,
+                          BULK_IMPORT_HASH_ESTIMATED_MS, BULK_IMPORT_RESERVE_WORKERS, BULK_IMPORT_WRITE_RESERVE_MS,
+                          BULK_IMPORT_RELEASE_BUDGET_MS)
+from utils.validator import create_instance_validator_register
+from utils.token import get_token_instance
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+dyname = DynamoClientPool()
+backend = get_backend(dyname)
+
+validator_register = create_instance_validator_register()
+token_validator = get_token_instance()
+
+CSV_FIELDS = ('name', 'last_name', 'username', 'password')
+
+
+def parse_roster(event, body):
+    """
+    Devuelve las filas del roster. Acepta JSON ({"students": [...]}) o CSV (Content-Type text/csv) con
+    encabezado name,last_name,username,password.
+    :raises ValueError: Si el formato no es válido.
+    """
+    headers = {name.lower(): value for name, value in (event.get('headers') or {}).items()}
+    if 'text/csv' in (headers.get('content-type') or ''):
+        if not isinstance(body, str):
+            raise ValueError("El cuerpo CSV debe ser texto.")
+        reader = csv.DictReader(io.StringIO(body.lstrip('\ufeff')))
+        if not reader.fieldnames or set(name.strip() for name in reader.fieldnames) != set(CSV_FIELDS):
+            raise ValueError(f"El CSV debe tener las columnas {', '.join(CSV_FIELDS)}.")
+        return [{field.strip(): (value or '').strip() for field, value in row.items()} for row in reader]
+
+    if isinstance(body, str):
+        body = json.loads(body)
+    if not isinstance(body, dict) or not isinstance(body.get('students'), list):
+        raise ValueError("El cuerpo debe tener la lista students.")
+    return body['students']
+
+
+def reserve_username(deadline, users: UserRepository, username: str, user_id: str) -> bool:
+    """
+    Reserva el username con una escritura condicional. Los usuarios registrados antes de que existieran
+    las reservas solo están en el índice, por eso también se consulta USER_GSI_INDEX_USERNAME.
+    """
+    if users.find_by_username(username) is not None:
+        return False
+    try:
+        dyname.call(deadline, 'put_item', **username_reservation_put(username, user_id))
+        return True
+    except dyname.exceptions.ConditionalCheckFailedException:
+        return False
+
+
+def release_usernames(usernames: list):
+    """
+    Libera las reservas de las filas que no terminaron creadas. Una reserva que queda huérfana bloquea el
+    username para siempre, así que se usa un presupuesto propio (el deadline de la invocación puede estar
+    agotado justamente por eso) y BatchWriteItem en lugar de un DeleteItem por fila.
+    """
+    if not usernames:
+        return
+    deadline = Deadline(BULK_IMPORT_RELEASE_BUDGET_MS, safety_margin_ms=0)
+    keys = [username_reservation_key(username) for username in usernames]
+    try:
+        failed = batch_delete_keys(dyname, deadline, USER_TABLE, keys)
+    except Exception as e:
+        # Se llama desde un finally: un error aquí no debe tapar el de la etapa que falló
+        logger.error("No se pudieron liberar las reservas de username: %s", e)
+        return
+    if failed:
+        logger.error("No se pudieron liberar %s reservas de username: %s", len(failed), sorted(failed))
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Importa un curso completo de estudiantes (JSON o CSV) creado por un docente.
+
+    Cada fila se valida con schema_register_user y recibe su propio resultado. Los usernames se reservan
+    antes de hashear (para no gastar bcrypt en filas que igual fallarían), las contraseñas se hashean en
+    un pool de procesos con un proceso por vCPU y los usuarios se escriben con BatchWriteItem. Si el
+    tiempo no alcanza para todo el roster, las filas restantes se informan como not_processed.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dyname, token_validator=token_validator,
+                               validators=[validator_register], load_bcrypt=True)
+
+    started_at = time.perf_counter()
+    try:
+        headers = event.get('headers')
+        if not headers or 'Authorization' not in headers:
+            return Response(status_code=400, body={"error": "Falta el encabezado de autorización."}).to_dict()
+
+        token = token_validator.remove_bearer_prefix(headers['Authorization'])
+        try:
+            jwt_decode = token_validator.decode_token(token)
+        except ValueError as e:
+            logger.error("Error al decodificar el token JWT: %s", e)
+            return Response(status_code=401, body={"error": str(e)}).to_dict()
+
+        teacher_id = jwt_decode.get('id')
+        if not teacher_id or jwt_decode.get('role') not in ROLES_PERMITED_BULK_IMPORT:
+            logger.error("Rol no permitido para importar estudiantes: %s", jwt_decode.get('role'))
+            return Response(status_code=403, body={"error": "Rol no permitido para realizar esta acción."}).to_dict()
+
+        body = event.get('body')
+        if not body:
+            return Response(status_code=400, body={'error': 'El body debe tener los parametros requeridos.'}).to_dict()
+
+        try:
+            rows = parse_roster(event, body)
+        except ValueError as e:
+            return Response(status_code=400, body={'error': str(e)}).to_dict()
+
+        if not rows or len(rows) > BULK_IMPORT_MAX_ROWS:
+            return Response(status_code=400, body={
+                'error': f'El roster debe tener entre 1 y {BULK_IMPORT_MAX_ROWS} estudiantes.'}).to_dict()
+
+        # 1. Validación por fila y usernames repetidos dentro del roster
+        results = [{'row': index, 'username': row.get('username') if isinstance(row, dict) else None}
+                   for index, row in enumerate(rows)]
+        candidates = {}
+        seen = set()
+        for index, row in enumerate(rows):
+            if not validator_register.validate(data=row, param_field='row'):
+                results[index].update(status='invalid', details=validator_register.get_errors())
+            elif row['username'] in seen:
+                results[index]['status'] = 'duplicate'
+            else:
+                seen.add(row['username'])
+                candidates[index] = row
+
+        # 2. Reserva de usernames en paralelo (escrituras condicionales)
+        users = UserRepository(backend, deadline)
+        user_ids = {index: str(uuid.uuid4()) for index in candidates}
+        reserved = {}  # índice -> username reservado por esta importación
+        written = set()  # Filas cuyo usuario pudo quedar escrito; sus reservas nunca se liberan
+
+        def reserve(index):
+            if not reserve_username(deadline, users, candidates[index]['username'], user_ids[index]):
+                return False
+            reserved[index] = candidates[index]['username']
+            return True
+
+        try:
+            with stage('reserve'), ThreadPoolExecutor(max_workers=BULK_IMPORT_RESERVE_WORKERS) as executor:
+                outcomes = dict(zip(candidates, executor.map(reserve, candidates)))
+            for index, ok in outcomes.items():
+                if not ok:
+                    results[index]['status'] = 'username_taken'
+            to_hash = {index: candidates[index]['password'] for index in reserved}
+
+            # 3. Hash de contraseñas en todos los vCPUs
+            hash_started_at = time.perf_counter()
+            with stage('bcrypt'), BcryptPool(rounds=BCRYPT_ROUNDS) as pool:
+                hashes = pool.hash_all(to_hash, deadline, BULK_IMPORT_HASH_ESTIMATED_MS,
+                                       reserve_ms=BULK_IMPORT_WRITE_RESERVE_MS)
+                hash_workers = pool.processes
+            hash_elapsed = time.perf_counter() - hash_started_at
+
+            # 4. Escritura de los usuarios en lotes
+            created_at = datetime.utcnow().isoformat()
+            items = []
+            for index in hashes:
+                user_data = {**candidates[index], 'id': user_ids[index], 'created_at': created_at, 'role': 'STUDENT',
+                             'created_by': teacher_id, 'password': hashes[index]}
+                items.append(serialize_to_dynamo(user_data))
+            written = set(hashes)
+            with stage('write'):
+                failed_ids = batch_put_items(dyname, deadline, USER_TABLE, items) if items else set()
+            written = {index for index in hashes if user_ids[index] not in failed_ids}
+        finally:
+            # También si una etapa lanzó (por ejemplo DeadlineExceeded al reservar): ninguna reserva queda huérfana
+            release_usernames([username for index, username in reserved.items() if index not in written])
+
+        for index in to_hash:
+            if index not in hashes:
+                results[index]['status'] = 'not_processed'
+            elif index not in written:
+                results[index]['status'] = 'failed'
+            else:
+                results[index].update(status='created', id=user_ids[index])
+
+        elapsed = time.perf_counter() - started_at
+        summary = {}
+        for result in results:
+            summary[result['status']] = summary.get(result['status'], 0) + 1
+        throughput = {
+            'elapsed_ms': int(elapsed * 1000),
+            'hash_workers': hash_workers,
+            'hash_elapsed_ms': int(hash_elapsed * 1000),
+            'hashes_per_second': round(len(hashes) / hash_elapsed, 1) if hash_elapsed else None,
+            'rows_per_second': round(len(rows) / elapsed, 1)
+        }
+        logger.info("Importación del docente %s: %s %s", teacher_id, summary, throughput)
+
+        return Response(status_code=200, body={'message': 'Importación procesada', 'data': {
+            'summary': summary,
+            'throughput': throughput,
+            'results': results
+        }}).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
+    except Exception as e:
+        logger.error("Error del servidor: %s", e)
+        return Response(status_code=500, body={'error': 'Error interno del servidor'}).to_dict()
@@ -1,29 +1,58 @@
 import json
-import logging
-import boto3
 import bcrypt
 
 from utils.response import Response
-from utils.dynamo_utils import serialize_dynamo_to_dict
-from utils.config import USER_TABLE, USER_GSI_INDEX_USERNAME
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled, stage
+from utils.repository import get_backend
+from utils.user_repository import UserRepository
+from utils.config import BCRYPT_ESTIMATED_MS, HEADERS_RESPONSE_DEFAUL, LOGIN_RATE_LIMITS
+from utils.rate_limiter import SlidingWindowLimiter, RateLimitExceeded
 from utils.validator import create_instance_validator_login
 from utils.token import get_token_instance
+from utils.structured_log import get_logger, logged
 
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = get_logger(__name__)
 
 validator_login_user = create_instance_validator_login()
 token_validator = get_token_instance()
 
-dyname = boto3.client('dynamodb')
+dyname = DynamoClientPool()
+backend = get_backend(dyname)
+login_limiter = SlidingWindowLimiter(dyname, LOGIN_RATE_LIMITS)
 
 
+def too_many_attempts(error: RateLimitExceeded, username: str, source_ip: str) -> dict:
+    """Respuesta 429 con Retry-After para una clave que superó su límite de intentos."""
+    logger.error("Demasiados intentos de login (%s) para el usuario %s desde %s", error.scope, username, source_ip)
+    return Response(status_code=429, body={'error': 'Demasiados intentos de inicio de sesión, intente más tarde.'},
+                    headers={**HEADERS_RESPONSE_DEFAUL, 'Retry-After': str(error.retry_after)}).to_dict()
+
+
+def failed_attempt(deadline, limit_keys: dict, source_ip: str, response: dict) -> dict:
+    """Cobra el intento fallido en los contadores compartidos; si la clave superó su límite responde 429."""
+    try:
+        with stage('rate_limit'):
+            login_limiter.record_failure(deadline, **limit_keys)
+    except RateLimitExceeded as e:
+        return too_many_attempts(e, limit_keys['username'], source_ip)
+    return response
+
+
+@logged
+@profiled
 def lambda_handler(event, context):
     """
     Función Lambda que maneja el proceso de inicio de sesión del usuario. Valida las credenciales proporcionadas
         (nombre de usuario y contraseña), verifica las credenciales contra los datos almacenados en DynamoDB,
         y genera un token JWT si el inicio de sesión es exitoso.
     """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dyname, token_validator=token_validator,
+                               validators=[validator_login_user], load_bcrypt=True)
+
     try:
         body = event.get('body')
 
@@ -35,34 +64,42 @@ def lambda_handler(event, context):
 
 
         if not validator_login_user.validate(data=body,param_field='body'):
-            logger.error(f"Errores de validación: {validator_login_user.get_errors()}")
+            logger.error("Errores de validación: %s", validator_login_user.get_errors())
             return Response(status_code=400, body={'error': 'Fallo en la validación de datos',
                                                    'details': validator_login_user.get_errors()}).to_dict()
 
         username = body['username']
         password = body['password']
 
-        response = dyname.query(
-            TableName=USER_TABLE,
-            IndexName=USER_GSI_INDEX_USERNAME,
-            KeyConditionExpression='username = :username',
-            ExpressionAttributeValues={
-                ':username': {'S': username}
-            }
-        )
-
-        if 'Items' not in response or len(response['Items']) == 0:
-            logger.error(f"Usuario no encontrado: {username}")
-            return Response(status_code=401, body={'error': 'Usuario no encontrado'}).to_dict()
-        response_item_serialiser = serialize_dynamo_to_dict(response['Items'][0])
-
-        stored_hashed_password = response_item_serialiser['password']
-        id = response_item_serialiser['id']
-        role = response_item_serialiser['role']
-
-        if not bcrypt.checkpw(password.encode('utf-8'), stored_hashed_password.encode('utf-8')):
-            logger.error(f"Contraseña incorrecta para el usuario: {username}")
-            return Response(status_code=401, body={'error': 'Contraseña incorrecta'}).to_dict()
+        # El bucket local se consulta antes de la consulta al GSI y de bcrypt, que es lo que encarece un ataque
+        # de fuerza bruta; los contadores compartidos solo se cobran cuando el intento falla
+        source_ip = (event.get('requestContext') or {}).get('identity', {}).get('sourceIp')
+        limit_keys = {'username': username.lower(), 'ip': source_ip}
+        try:
+            login_limiter.acquire(**limit_keys)
+        except RateLimitExceeded as e:
+            return too_many_attempts(e, username, source_ip)
+
+        with stage('query'):
+            user = UserRepository(backend, deadline).find_by_username(username)
+        if user is None:
+            logger.error("Usuario no encontrado: %s", username)
+            return failed_attempt(deadline, limit_keys, source_ip,
+                                  Response(status_code=401, body={'error': 'Usuario no encontrado'}).to_dict())
+
+        stored_hashed_password = user['password']
+        id = user['id']
+        role = user['role']
+
+        deadline.ensure(BCRYPT_ESTIMATED_MS, 'bcrypt')
+        with stage('bcrypt'):
+            password_ok = bcrypt.checkpw(password.encode('utf-8'), stored_hashed_password.encode('utf-8'))
+        if not password_ok:
+            logger.error("Contraseña incorrecta para el usuario: %s", username)
+            return failed_attempt(deadline, limit_keys, source_ip,
+                                  Response(status_code=401, body={'error': 'Contraseña incorrecta'}).to_dict())
+
+        login_limiter.release(**limit_keys)
 
         payload = {
             'id': id,
@@ -73,12 +110,17 @@ def lambda_handler(event, context):
         token = token_validator.generate_token(payload)
 
 
-        logger.info(f"Usuario autenticado exitosamente: {username}")
+        logger.info("Usuario autenticado: %s", id)
 
         return Response(status_code=200, body={'message': 'Login exitoso', 'token': token}).to_dict()
 
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
     except Exception as e:
-        logger.error(f"Error del servidor: {e}")
+        logger.error("Error del servidor: %s", e)
         return Response(status_code=500, body={'message': 'Error interno del servidor'}).to_dict()
 
 
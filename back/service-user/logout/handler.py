@@ -0,0 +1,70 @@
+import time
+
+from utils.response import Response
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled
+from utils.config import TOKEN_REVOCATION_TABLE
+from utils.revocation import get_revocation_list, revocation_item
+from utils.token import get_token_instance
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+dyname = DynamoClientPool()
+
+token_validator = get_token_instance()
+revocations = get_revocation_list()
+
+
+@logged
+@profiled
+def lambda_handler(event, context):
+    """
+    Cierra la sesión revocando el token con el que se llama. Escribe revoked#<jti> con TTL en el exp del
+    token: cuando el token habría expirado, el item ya no hace falta y DynamoDB lo borra.
+    """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dyname, token_validator=token_validator)
+
+    try:
+        headers = event.get('headers')
+        if not headers or 'Authorization' not in headers:
+            return Response(status_code=400, body={"error": "Falta el encabezado de autorización."}).to_dict()
+
+        token = token_validator.remove_bearer_prefix(headers['Authorization'])
+        try:
+            jwt_decode = token_validator.decode_token(token)
+        except ValueError as e:
+            logger.error("Error al decodificar el token JWT: %s", e)
+            return Response(status_code=401, body={"error": str(e)}).to_dict()
+
+        user_id = jwt_decode.get('id')
+        jti = jwt_decode.get('jti')
+        expires_at = int(jwt_decode.get('exp', 0))
+        if not user_id:
+            return Response(status_code=400, body={"error": "Falta el ID de usuario en el token."}).to_dict()
+        if not jti:
+            # Emitido antes de que los tokens llevaran jti: no se puede revocar, expira solo
+            return Response(status_code=400, body={"error": "El token no se puede revocar."}).to_dict()
+        if not revocations.enabled:
+            logger.error("Revocación de tokens sin configurar (TOKEN_REVOCATION_INDEX)")
+            return Response(status_code=503, body={"error": "El cierre de sesión no está disponible."}).to_dict()
+
+        dyname.call(deadline, 'put_item', TableName=TOKEN_REVOCATION_TABLE,
+                    Item=revocation_item(jti, user_id, expires_at, int(time.time() * 1000)))
+        revocations.add(jti, expires_at)
+
+        logger.info("Token revocado para el usuario %s, %s s antes de expirar", user_id,
+                    max(0, expires_at - int(time.time())))
+        return Response(status_code=200, body={'message': 'Sesión cerrada'}).to_dict()
+
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
+    except Exception as e:
+        logger.error("Error del servidor: %s", e)
+        return Response(status_code=500, body={'message': 'Error interno del servidor'}).to_dict()
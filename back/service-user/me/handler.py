@@ -1,24 +1,32 @@
-import logging
-import boto3
 
 from utils.response import Response
-from utils.dynamo_utils import serialize_dynamo_to_dict
-from utils.config import USER_TABLE
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled
+from utils.repository import get_backend
+from utils.user_repository import UserRepository
 from utils.token import get_token_instance
+from utils.structured_log import get_logger, logged
 
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = get_logger(__name__)
 
-dyname = boto3.client('dynamodb')
+dyname = DynamoClientPool()
+backend = get_backend(dyname)
 
 token_valitador = get_token_instance()
 
 
+@logged
+@profiled
 def lambda_handler(event, context):
     """
     Esta función obtiene los datos del usuario dado un JWT token. El token es decodificado y el ID del usuario
     se extrae para hacer una consulta a DynamoDB y obtener los datos asociados con ese usuario.
     """
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dyname, token_validator=token_valitador)
+
     try:
         headers = event.get('headers')
         if not headers or 'Authorization' not in headers:
@@ -30,7 +38,7 @@ def lambda_handler(event, context):
         try:
             jwt_decode = token_valitador.decode_token(token)
         except ValueError as e:
-            logger.error(f"error decoding JWT token: {str(e)}")
+            logger.error("error decoding JWT token: %s", e)
             return Response(status_code=401, body={"error": str(e)}).to_dict()
 
         user_id = jwt_decode.get('id')
@@ -38,27 +46,24 @@ def lambda_handler(event, context):
         if not user_id:
             return Response(status_code=400, body={"error": "Missing user ID in token"})
 
-        response = dyname.query(
-            TableName=USER_TABLE,
-            KeyConditionExpression='id = :id',
-            ExpressionAttributeValues={
-                ':id': {'S': user_id}
-            }
-        )
+        user = UserRepository(backend, deadline).get(user_id)
 
-        if 'Items' not in response or len(response['Items']) == 0:
-            logger.error(f"Usuario no encontrado: {user_id}")
+        if user is None:
+            logger.error("Usuario no encontrado: %s", user_id)
             return Response(status_code=401, body={'error': 'Usuario no encontrado'}).to_dict()
 
-        user_data = response['Items'][0]
-
-        user_data = serialize_dynamo_to_dict(user_data)
+        user_data = dict(user)
         if "password" in user_data:
             del user_data["password"]
 
         return Response(status_code=200, body={'message': 'Datos obtenidos correctamente', 'data': user_data}).to_dict()
 
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
     except Exception as e:
-        logger.error(f"Error del servidor: {e}")
+        logger.error("Error del servidor: %s", e)
         return Response(status_code=500, body={'message': 'Error interno del servidor'}).to_dict()
 
@@ -1,24 +1,35 @@
 import json
-import logging
-import boto3
 import bcrypt
 import uuid
 from datetime import datetime
 
 from utils.response import Response
+from utils.deadline import Deadline, DeadlineExceeded, DynamoClientPool
+from utils.warmup import is_warmup_event, warmup_response
+from utils.memory_profiler import profiled, stage
+from utils.repository import get_backend
 from utils.dynamo_utils import serialize_to_dynamo
-from utils.config import USER_TABLE, USER_GSI_INDEX_USERNAME
+from utils.user_repository import UserRepository
+from utils.usernames import username_reservation_put
+from utils.config import USER_TABLE, BCRYPT_ROUNDS, BCRYPT_ESTIMATED_MS
 from utils.validator import create_instance_validator_register
+from utils.structured_log import get_logger, logged
 
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = get_logger(__name__)
 
 
-dyname = boto3.client('dynamodb')
+dyname = DynamoClientPool()
+backend = get_backend(dyname)
 
 validator_register = create_instance_validator_register()
 
+@logged
+@profiled
 def lambda_handler(event, context):
+    deadline = Deadline.from_context(context)
+    if is_warmup_event(event):
+        return warmup_response(event, deadline, dynamodb_client=dyname, validators=[validator_register], load_bcrypt=True)
+
     try:
         body = event.get('body')
 
@@ -30,54 +41,60 @@ def lambda_handler(event, context):
             return Response(status_code=400, body={'error': 'El body debe tener los parametros requeridos.'}).to_dict()
 
         if not validator_register.validate(data=body,param_field='body'):
-            logger.error(f"Errores de validación: {validator_register.get_errors()}")
+            logger.error("Errores de validación: %s", validator_register.get_errors())
             return Response(status_code=400, body={'error': 'Fallo en la validación de datos',
                                                    'details': validator_register.get_errors()}).to_dict()
 
         username = body['username']
 
-        response = dyname.query(
-            TableName=USER_TABLE,
-            IndexName=USER_GSI_INDEX_USERNAME,
-            KeyConditionExpression='username = :username',
-            ExpressionAttributeValues={
-                ':username': {'S': username}
-            }
-        )
-
-        if 'Items' in response and len(response['Items']) > 0:
-            logger.error(f"El nombre de usuario {username} ya existe.")
+        if UserRepository(backend, deadline).find_by_username(username) is not None:
+            logger.error("El nombre de usuario %s ya existe.", username)
             return Response(status_code=400, body={'error': f'El username {username} ya existe'}).to_dict()
 
+        deadline.ensure(BCRYPT_ESTIMATED_MS, 'bcrypt')
+        with stage('bcrypt'):
+            hashed_password = bcrypt.hashpw(body['password'].encode('utf-8'), bcrypt.gensalt(BCRYPT_ROUNDS))
+
         user_data = {
-            **body,#toda la data validada del body
-            'id': str(uuid.uuid4()), #el id requerido en dynamo
-            'created_at': datetime.utcnow().isoformat(), # fecha de creacion
-            'role': 'TEACHER' # rol por defcto
+            **body,  # toda la data validada del body
+            'id': str(uuid.uuid4()),  # el id requerido en dynamo
+            'created_at': datetime.utcnow().isoformat(),  # fecha de creacion
+            'role': 'TEACHER',  # rol por defcto
+            'password': hashed_password.decode('utf-8')
         }
 
-        password = user_data['password'].encode('utf-8')
-        hashed_password = bcrypt.hashpw(password, bcrypt.gensalt())
-        user_data['password'] = hashed_password.decode('utf-8')
-
-        user_data_serialized = serialize_to_dynamo(user_data)
-
         try:
-            dyname.put_item(
-                TableName=USER_TABLE,
-                Item=user_data_serialized,
-                ConditionExpression="attribute_not_exists(username)"
+            # La reserva del username y el usuario se escriben juntos: si dos registros compiten por el mismo
+            # username, la condición de la reserva cancela uno de los dos
+            dyname.call(
+                deadline, 'transact_write_items',
+                TransactItems=[
+                    {'Put': username_reservation_put(username, user_data['id'])},
+                    {'Put': {
+                        'TableName': USER_TABLE,
+                        'Item': serialize_to_dynamo(user_data),
+                        'ConditionExpression': "attribute_not_exists(id)"
+                    }}
+                ]
             )
 
-            logger.info(f"Usuario registrado exitosamente: {body['username']} en la tabla {USER_TABLE}")
+            logger.info("Usuario registrado: %s", user_data['id'])
 
             return Response(status_code=200, body={'message': 'Usuario registrado exitosamente'}).to_dict()
 
-        except dyname.exceptions.ConditionalCheckFailedException:
-            logger.error(f"El nombre de usuario {username} ya existe.")
+        except dyname.exceptions.TransactionCanceledException as e:
+            reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+            if reasons[:1] != ['ConditionalCheckFailed']:
+                raise
+            logger.error("El nombre de usuario %s ya existe.", username)
             return Response(status_code=400, body={'error': f'El username {username} ya existe'}).to_dict()
 
+    except DeadlineExceeded as e:
+        logger.error("Deadline agotado en la etapa %s: quedan %s ms", e.stage, e.remaining_ms)
+        return Response(status_code=504, body={'error': 'Tiempo de espera agotado al procesar la solicitud.',
+                                               'stage': e.stage}).to_dict()
+
     except Exception as e:
-        logger.error(f"Error del servidor: {e}")
+        logger.error("Error del servidor: %s", e)
         return Response(status_code=500, body={'error': 'Error interno del servidor'}).to_dict()
 
@@ -0,0 +1,66 @@
+import random
+import time
+from botocore.exceptions import ClientError
+from utils.config import DYNAMO_BATCH_WRITE_SIZE, DYNAMO_BATCH_WRITE_MAX_ATTEMPTS, DYNAMO_BATCH_RETRY_BASE_MS
+from utils.deadline import DeadlineExceeded
+from utils.structured_log import get_logger
+
+logger = get_logger(__name__)
+
+
+def batch_put_items(dynamodb_client, deadline, table: str, items: list) -> set:
+    """
+    Escribe los items con BatchWriteItem en bloques de 25 y reintenta los UnprocessedItems con backoff y jitter.
+
+    BatchWriteItem no es transaccional: DynamoDB puede aceptar parte de un bloque y devolver el resto
+    como UnprocessedItems (por ejemplo si la tabla se está escalando), por eso el resultado es por item.
+
+    :param dynamodb_client: DynamoClientPool del handler.
+    :param deadline: Deadline de la invocación; si se agota, los items pendientes se reportan como no escritos.
+        Lo mismo pasa con los de un bloque que DynamoDB rechaza (ClientError).
+    :param table: Nombre de la tabla.
+    :param items: Items en formato DynamoDB; cada uno debe tener un id de tipo S.
+    :return: Conjunto de ids que no se pudieron escribir.
+    """
+    pending = _batch_write(dynamodb_client, deadline, table, [{'PutRequest': {'Item': item}} for item in items])
+    return {request['PutRequest']['Item']['id']['S'] for request in pending}
+
+
+def batch_delete_keys(dynamodb_client, deadline, table: str, keys: list) -> set:
+    """
+    Borra los items por clave con BatchWriteItem, con los mismos bloques y reintentos que batch_put_items.
+    :param keys: Claves en formato DynamoDB ({'id': {'S': ...}}).
+    :return: Conjunto de ids que no se pudieron borrar.
+    """
+    pending = _batch_write(dynamodb_client, deadline, table, [{'DeleteRequest': {'Key': key}} for key in keys])
+    return {request['DeleteRequest']['Key']['id']['S'] for request in pending}
+
+
+def _batch_write(dynamodb_client, deadline, table: str, requests: list) -> list:
+    """Envía las WriteRequest en bloques de 25. :return: Las que no se pudieron aplicar."""
+    failed = []
+    for start in range(0, len(requests), DYNAMO_BATCH_WRITE_SIZE):
+        pending = requests[start:start + DYNAMO_BATCH_WRITE_SIZE]
+
+        for attempt in range(DYNAMO_BATCH_WRITE_MAX_ATTEMPTS):
+            try:
+                if attempt:
+                    backoff_ms = random.uniform(0, DYNAMO_BATCH_RETRY_BASE_MS * (2 ** attempt))
+                    deadline.ensure(int(backoff_ms), 'batch_write_retry')
+                    time.sleep(backoff_ms / 1000)
+                response = dynamodb_client.call(deadline, 'batch_write_item', RequestItems={table: pending})
+            except DeadlineExceeded as e:
+                logger.error("Sin tiempo para escribir %s items en la etapa %s", len(pending), e.stage)
+                break
+            except ClientError as e:
+                # Un item inválido hace que DynamoDB rechace el bloque entero; los demás bloques se siguen escribiendo
+                logger.error("BatchWriteItem rechazó un bloque de %s items: %s", len(pending), e)
+                break
+            pending = response.get('UnprocessedItems', {}).get(table, [])
+            if not pending:
+                break
+            logger.info("%s items sin procesar en BatchWriteItem, reintento %s", len(pending), attempt + 1)
+
+        failed.extend(pending)
+
+    return failed
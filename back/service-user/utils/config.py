@@ -28,3 +28,75 @@ schema_login_user = {
         'username': {'type': str, 'minlength': 4, 'maxlength': 16}
     }
 }
+
+"""presupuesto de tiempo por invocación (deadline)"""
+
+DEADLINE_DEFAULT_BUDGET_MS = 29000  # Se usa cuando no hay context (ejecución local)
+DEADLINE_SAFETY_MARGIN_MS = 500  # Margen reservado para construir la respuesta
+DYNAMO_MIN_CALL_MS = 150  # Tiempo mínimo para intentar una llamada a DynamoDB
+DYNAMO_MAX_CALL_TIMEOUT = 5  # Timeout máximo (segundos) por intento a DynamoDB
+DYNAMO_CONNECT_TIMEOUT = 1
+DYNAMO_MAX_ATTEMPTS = 3
+DYNAMO_TIMEOUT_BUCKETS = (1, 2, 3, 5)  # Timeouts posibles, cada uno con su propio cliente
+BCRYPT_ROUNDS = 12  # Costo de bcrypt de todas las contraseñas (el de gensalt() por defecto)
+BCRYPT_ESTIMATED_MS = 400  # Costo aproximado de un hashpw/checkpw con BCRYPT_ROUNDS
+
+"""warm-up de contenedores"""
+
+WARMUP_SOURCE = 'aula360.warmup'  # source de los eventos de warm-up
+WARMUP_HOLD_MS = 100  # Con concurrencia > 1, mantiene ocupado el contenedor para forzar contenedores distintos
+WARMUP_CONCURRENCY = int(os.environ.get('WARMUP_CONCURRENCY', 1))  # Contenedores a mantener calientes por función
+WARMUP_TARGETS = [name for name in os.environ.get('WARMUP_TARGETS', '').split(',') if name]
+
+"""límite de intentos de login fallidos"""
+
+USER_TTL_ATTRIBUTE = 'expires_at'  # Atributo TTL de USER_TABLE (epoch en segundos)
+LOGIN_RATE_LIMIT_PREFIX = 'ratelimit#'  # id del contador compartido: ratelimit#<alcance>#<clave>
+# alcance -> (intentos fallidos permitidos, ventana en segundos). Los logins correctos no cuentan; el límite por IP
+# es más alto porque un aula suele salir por una sola IP
+LOGIN_RATE_LIMITS = {
+    'username': (10, 300),
+    'ip': (120, 300),
+}
+LOGIN_LOCAL_BUCKETS_SIZE = 4096  # Claves con token bucket local por contenedor
+
+"""repositorios"""
+
+DATA_BACKEND = os.environ.get('DATA_BACKEND', 'dynamodb')  # 'memory' usa un backend en memoria (pruebas y benchmarks)
+DYNAMO_BATCH_GET_SIZE = 100  # Máximo de claves por BatchGetItem
+DYNAMO_BATCH_GET_MAX_ATTEMPTS = 5  # Reintentos de los UnprocessedKeys
+DYNAMO_BATCH_RETRY_BASE_MS = 50  # Base del backoff exponencial con jitter entre reintentos
+
+"""importación masiva de estudiantes"""
+
+USERNAME_RESERVATION_PREFIX = 'username#'  # id del item que reserva el username: username#<username>
+ROLES_PERMITED_BULK_IMPORT = {'TEACHER'}
+BULK_IMPORT_MAX_ROWS = 300  # Con BCRYPT_ROUNDS y 6 vCPUs; lo que no alcanza a hashearse vuelve como not_processed
+BULK_IMPORT_HASH_ESTIMATED_MS = BCRYPT_ESTIMATED_MS  # Mismo costo que register: la importación no debilita los hashes
+BULK_IMPORT_RESERVE_WORKERS = 16  # Hilos para las reservas de username (cada una es una escritura condicional)
+BULK_IMPORT_WRITE_RESERVE_MS = 2000  # Tiempo que se reserva para escribir los usuarios después de hashear
+BULK_IMPORT_RELEASE_BUDGET_MS = 400  # Presupuesto propio para liberar reservas (cabe en el margen del deadline)
+DYNAMO_BATCH_WRITE_SIZE = 25  # Máximo de items por BatchWriteItem
+DYNAMO_BATCH_WRITE_MAX_ATTEMPTS = 5  # Reintentos de los UnprocessedItems
+
+"""revocación de tokens"""
+
+# Los items revocados viven en la tabla de usuarios (service-user); sin tabla o sin índice no se consulta la lista
+TOKEN_REVOCATION_TABLE = os.environ.get('TOKEN_REVOCATION_TABLE', USER_TABLE)
+TOKEN_REVOCATION_INDEX = os.environ.get('TOKEN_REVOCATION_INDEX')  # GSI disperso: revocation_day (hash) + revoked_at (range)
+TOKEN_REVOCATION_PREFIX = 'revoked#'  # id del item: revoked#<jti>, con TTL en el exp del token
+TOKEN_REVOCATION_REFRESH_SECONDS = 5  # Cada cuánto un contenedor trae las revocaciones nuevas
+TOKEN_REVOCATION_OVERLAP_MS = 10000  # Margen que se vuelve a leer en cada refresco (el GSI es eventualmente consistente)
+TOKEN_REVOCATION_REFRESH_BUDGET_MS = 1500  # Presupuesto de un refresco; si no alcanza se sigue con la lista anterior
+
+"""logs estructurados"""
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+# Fracción de invocaciones sin advertencias ni errores cuyos logs se escriben; las demás se descartan sin formatear
+LOG_SUCCESS_SAMPLE_RATE = float(os.environ.get('LOG_SUCCESS_SAMPLE_RATE', '0.1'))
+LOG_MAX_RECORDS_PER_INVOCATION = 200  # Tope del buffer por invocación; lo que exceda solo se cuenta
+
+"""perfilado de memoria (opcional)"""
+
+MEMORY_PROFILING = os.environ.get('MEMORY_PROFILING', '0') == '1'  # Solo para replays locales o pruebas puntuales
+MEMORY_PROFILING_TOP_SITES = 5  # Sitios de asignación que se reportan por etapa
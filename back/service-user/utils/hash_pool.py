@@ -0,0 +1,92 @@
+import os
+import multiprocessing
+from multiprocessing.connection import wait
+from utils.structured_log import get_logger
+
+logger = get_logger(__name__)
+
+
+def _hash_worker(connection, rounds: int):
+    """Proceso hijo: recibe (índice, contraseña) por el pipe y devuelve (índice, hash) hasta recibir None."""
+    import bcrypt
+    while True:
+        task = connection.recv()
+        if task is None:
+            break
+        index, password = task
+        connection.send((index, bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')))
+    connection.close()
+
+
+def available_cpus() -> int:
+    """vCPUs que puede usar el proceso (en Lambda dependen de la memoria configurada)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class BcryptPool:
+    """
+    Pool de procesos para hashear contraseñas con bcrypt en todos los vCPUs disponibles.
+
+    Lambda no tiene /dev/shm, así que multiprocessing.Pool (que usa semáforos) no funciona; cada worker
+    es un Process con su propio Pipe y las tareas se reparten de a una, por lo que un worker libre
+    toma la siguiente contraseña apenas termina la anterior.
+    """
+
+    def __init__(self, rounds: int, processes: int = None):
+        self.rounds = rounds
+        self.processes = processes or available_cpus()
+        self._workers = []
+
+    def __enter__(self):
+        for _ in range(self.processes):
+            parent_connection, child_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_hash_worker, args=(child_connection, self.rounds), daemon=True)
+            process.start()
+            child_connection.close()
+            self._workers.append((process, parent_connection))
+        return self
+
+    def __exit__(self, *exc_info):
+        for process, connection in self._workers:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process, connection in self._workers:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.kill()
+            connection.close()
+        self._workers = []
+
+    def hash_all(self, passwords: dict, deadline, estimated_ms: int, reserve_ms: int = 0) -> dict:
+        """
+        Hashea las contraseñas {índice: contraseña}. Solo entrega una nueva tarea si queda tiempo para
+        terminarla (estimated_ms) sin tocar reserve_ms, así que con un deadline corto algunas quedan sin hashear.
+        :return: {índice: hash} de las contraseñas hasheadas.
+        """
+        tasks = list(passwords.items())
+        hashes = {}
+        busy = set()
+
+        def dispatch(connection):
+            if tasks and deadline.remaining_ms() > estimated_ms + reserve_ms:
+                connection.send(tasks.pop())
+                busy.add(connection)
+
+        for _, connection in self._workers:
+            dispatch(connection)
+
+        while busy:
+            for connection in wait(list(busy)):
+                busy.discard(connection)
+                index, hashed = connection.recv()
+                hashes[index] = hashed
+                dispatch(connection)
+
+        if tasks:
+            logger.error("%s contraseñas quedaron sin hashear por falta de tiempo", len(tasks))
+        return hashes
@@ -0,0 +1,184 @@
+import math
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from utils.config import USER_TABLE, USER_TTL_ATTRIBUTE, LOGIN_RATE_LIMIT_PREFIX, LOGIN_LOCAL_BUCKETS_SIZE
+from utils.deadline import DeadlineExceeded
+from utils.structured_log import get_logger
+
+logger = get_logger(__name__)
+
+
+class RateLimitExceeded(Exception):
+    """
+    Se lanza cuando una clave superó su límite de intentos.
+    """
+
+    def __init__(self, scope: str, retry_after: int):
+        super().__init__(f"Límite de intentos superado para '{scope}', reintentar en {retry_after} s")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class LocalTokenBuckets:
+    """
+    Token buckets en memoria del contenedor, uno por clave, con tamaño máximo (LRU).
+
+    Es la ruta rápida: si el bucket local está vacío se rechaza sin llamar a DynamoDB. Cada bucket
+    se llena a razón de limit / window tokens por segundo hasta un máximo de limit.
+    """
+
+    def __init__(self, max_size: int = LOGIN_LOCAL_BUCKETS_SIZE, clock=time.monotonic):
+        self.max_size = max_size
+        self._clock = clock
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _refill(self, key, limit: int, window: int):
+        now = self._clock()
+        tokens, updated_at = self._buckets.get(key, (limit, now))
+        tokens = min(limit, tokens + (now - updated_at) * limit / window)
+        return tokens, now
+
+    def try_acquire(self, key, limit: int, window: int) -> float:
+        """Consume un token. Devuelve 0 si se pudo, o los segundos que faltan para tener uno."""
+        with self._lock:
+            tokens, now = self._refill(key, limit, window)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return (1 - tokens) * window / limit
+            self._buckets[key] = (tokens - 1, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_size:
+                self._buckets.popitem(last=False)
+            return 0
+
+    def refund(self, key, limit: int):
+        """Devuelve el token de un intento que no debe contar (por ejemplo, un login correcto)."""
+        with self._lock:
+            if key in self._buckets:
+                tokens, updated_at = self._buckets[key]
+                self._buckets[key] = (min(limit, tokens + 1), updated_at)
+
+    def drain(self, key):
+        """Vacía el bucket cuando el contador compartido indica que la clave ya superó el límite."""
+        with self._lock:
+            self._buckets[key] = (0, self._clock())
+            self._buckets.move_to_end(key)
+
+
+class SlidingWindowLimiter:
+    """
+    Limitador de ventana deslizante con un bucket local por contenedor y un contador compartido en DynamoDB.
+
+    El contador compartido es un item ratelimit#<alcance>#<clave> en USER_TABLE con un atributo por ventana
+    fija (w<n>). Cada intento fallido hace un único UpdateItem por alcance que suma 1 a la ventana actual, borra
+    la de hace dos ventanas y devuelve la anterior; el conteo deslizante se aproxima ponderando la ventana
+    anterior por la fracción que todavía se solapa. El item no tiene username, así que no aparece en
+    USER_GSI_INDEX_USERNAME, y el atributo TTL lo elimina cuando la clave deja de usarse.
+
+    Antes de bcrypt solo se consulta el bucket local (acquire), sin llamadas a DynamoDB. Los contadores
+    compartidos se cobran únicamente por los intentos fallidos (record_failure): un login correcto no escribe
+    nada y devuelve su token local (release), y un aula detrás de una misma IP no agota el límite por IP con sus logins exitosos. Cuando el contador
+    compartido supera el límite se vacía el bucket local, así que cada contenedor admite a lo sumo un intento
+    fallido más después de que la clave superó su límite en otro.
+    """
+
+    def __init__(self, dynamodb_client, limits: dict, clock=time.time):
+        """
+        :param dynamodb_client: DynamoClientPool del handler.
+        :param limits: {alcance: (intentos permitidos, ventana en segundos)}.
+        :param clock: Reloj de pared en segundos (las ventanas deben coincidir entre contenedores).
+        """
+        self.dynamodb_client = dynamodb_client
+        self.limits = limits
+        self._clock = clock
+        self._local = LocalTokenBuckets()
+        self._executor = None
+
+    def _shared_count(self, deadline, scope: str, key: str, window: int) -> tuple:
+        """
+        Registra el intento en el contador compartido.
+        Devuelve (conteo deslizante, conteo de la ventana actual, conteo de la anterior, segundos transcurridos).
+        """
+        now = self._clock()
+        index = int(now // window)
+        elapsed = now - index * window
+
+        response = self.dynamodb_client.call(
+            deadline, 'update_item',
+            TableName=USER_TABLE,
+            Key={'id': {'S': f"{LOGIN_RATE_LIMIT_PREFIX}{scope}#{key}"}},
+            UpdateExpression='ADD #current :one SET #ttl = :expires_at REMOVE #stale',
+            ExpressionAttributeNames={'#current': f"w{index}", '#stale': f"w{index - 2}", '#ttl': USER_TTL_ATTRIBUTE},
+            ExpressionAttributeValues={':one': {'N': '1'}, ':expires_at': {'N': str((index + 2) * window)}},
+            ReturnValues='ALL_NEW'
+        )
+        attributes = response.get('Attributes', {})
+        current = int(attributes[f"w{index}"]['N'])
+        previous = int(attributes[f"w{index - 1}"]['N']) if f"w{index - 1}" in attributes else 0
+        return previous * (1 - elapsed / window) + current, current, previous, elapsed
+
+    @staticmethod
+    def _retry_after(limit: int, window: int, current: int, previous: int, elapsed: float) -> int:
+        """Segundos hasta que el conteo deslizante vuelva a estar por debajo del límite."""
+        if current >= limit:
+            # Hay que esperar a la próxima ventana y a que la actual (que pasa a ser la anterior) pierda peso
+            wait = (window - elapsed) + window * (1 - (limit - 1) / current)
+        else:
+            wait = window * (1 - (limit - current) / previous) - elapsed
+        return max(1, math.ceil(wait))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=len(self.limits), thread_name_prefix='ratelimit')
+        return self._executor
+
+    def _scoped(self, keys: dict) -> list:
+        return [(scope, key) for scope, key in keys.items() if key and scope in self.limits]
+
+    def acquire(self, **keys):
+        """
+        Consume un token del bucket local de cada alcance ({'username': ..., 'ip': ...}). No llama a DynamoDB.
+        :raises RateLimitExceeded: Si el bucket local de alguna clave está vacío.
+        """
+        for scope, key in self._scoped(keys):
+            limit, window = self.limits[scope]
+            wait = self._local.try_acquire((scope, key), limit, window)
+            if wait:
+                raise RateLimitExceeded(scope, max(1, math.ceil(wait)))
+
+    def release(self, **keys):
+        """Devuelve a los buckets locales los tokens de un intento correcto, que no cuenta para el límite."""
+        for scope, key in self._scoped(keys):
+            self._local.refund((scope, key), self.limits[scope][0])
+
+    def record_failure(self, deadline, **keys):
+        """
+        Registra un intento fallido en el contador compartido de cada alcance, con los UpdateItem en paralelo.
+        :raises RateLimitExceeded: Si alguna clave superó su límite (el bucket local queda vacío).
+        """
+        scoped = self._scoped(keys)
+        futures = [(scope, key, self._get_executor().submit(
+            self._shared_count, deadline, scope, key, self.limits[scope][1])) for scope, key in scoped]
+
+        exceeded = None
+        for scope, key, future in futures:
+            limit, window = self.limits[scope]
+            try:
+                count, current, previous, elapsed = future.result()
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                # Si el contador compartido falla se sigue solo con el bucket local en lugar de bloquear el login
+                logger.error("No se pudo actualizar el contador de intentos de %s: %s", scope, e)
+                continue
+
+            if count > limit:
+                self._local.drain((scope, key))
+                retry_after = self._retry_after(limit, window, current, previous, elapsed)
+                if exceeded is None or retry_after > exceeded.retry_after:
+                    exceeded = RateLimitExceeded(scope, retry_after)
+        if exceeded:
+            raise exceeded
@@ -0,0 +1,194 @@
+import random
+import time
+from utils.config import (DATA_BACKEND, DYNAMO_BATCH_GET_SIZE, DYNAMO_BATCH_GET_MAX_ATTEMPTS,
+                          DYNAMO_BATCH_RETRY_BASE_MS)
+from utils.dynamo_utils import serialize_dynamo_to_dict
+from utils.structured_log import get_logger
+
+logger = get_logger(__name__)
+
+
+class DynamoBackend:
+    """
+    Acceso de lectura a DynamoDB usado por los repositorios. Todas las llamadas pasan por el
+    DynamoClientPool del handler, así que respetan el deadline de la invocación.
+    """
+
+    def __init__(self, dynamodb_client):
+        self.dynamodb_client = dynamodb_client
+
+    def batch_get(self, deadline, table: str, ids: list) -> dict:
+        """
+        Lee los items por id con BatchGetItem (bloques de 100) y reintenta los UnprocessedKeys con backoff.
+        :return: {id: item en formato DynamoDB} solo con los items que existen.
+        """
+        found = {}
+        for start in range(0, len(ids), DYNAMO_BATCH_GET_SIZE):
+            pending = {table: {'Keys': [{'id': {'S': item_id}} for item_id in ids[start:start + DYNAMO_BATCH_GET_SIZE]]}}
+
+            for attempt in range(DYNAMO_BATCH_GET_MAX_ATTEMPTS):
+                if attempt:
+                    backoff_ms = random.uniform(0, DYNAMO_BATCH_RETRY_BASE_MS * (2 ** attempt))
+                    deadline.ensure(int(backoff_ms), 'batch_get_retry')
+                    time.sleep(backoff_ms / 1000)
+                response = self.dynamodb_client.call(deadline, 'batch_get_item', RequestItems=pending)
+                for item in response.get('Responses', {}).get(table, []):
+                    found[item['id']['S']] = item
+                pending = response.get('UnprocessedKeys')
+                if not pending:
+                    break
+            else:
+                raise RuntimeError(f"BatchGetItem dejó claves sin procesar en {table} tras {DYNAMO_BATCH_GET_MAX_ATTEMPTS} intentos")
+        return found
+
+    def query(self, deadline, table: str, index: str, key_name: str, key_value: str, limit: int = None,
+              start_key: dict = None, ascending: bool = True):
+        """
+        Consulta los items cuya clave de partición key_name vale key_value (en la tabla o en el índice dado).
+        :param ascending: Orden por la clave de ordenamiento (ScanIndexForward).
+        :return: (items en formato DynamoDB, LastEvaluatedKey o None)
+        """
+        params = {
+            'TableName': table,
+            'KeyConditionExpression': '#key = :key',
+            'ExpressionAttributeNames': {'#key': key_name},
+            'ExpressionAttributeValues': {':key': {'S': key_value}}
+        }
+        if index:
+            params['IndexName'] = index
+        if limit:
+            params['Limit'] = limit
+        if start_key:
+            params['ExclusiveStartKey'] = start_key
+        if not ascending:
+            params['ScanIndexForward'] = False
+
+        response = self.dynamodb_client.call(deadline, 'query', **params)
+        return response.get('Items', []), response.get('LastEvaluatedKey')
+
+
+class InMemoryBackend:
+    """
+    Backend en memoria con la misma interfaz que DynamoBackend, para pruebas y benchmarks.
+
+    Guarda los items en formato DynamoDB y registra las operaciones en calls, para poder verificar
+    cuántas lecturas hizo un repositorio.
+    """
+
+    def __init__(self):
+        self.tables = {}
+        self.calls = []
+
+    def put(self, table: str, item: dict):
+        self.tables.setdefault(table, {})[item['id']['S']] = item
+
+    def batch_get(self, deadline, table: str, ids: list) -> dict:
+        self.calls.append(('batch_get', table, tuple(ids)))
+        items = self.tables.get(table, {})
+        return {item_id: items[item_id] for item_id in ids if item_id in items}
+
+    def query(self, deadline, table: str, index: str, key_name: str, key_value: str, limit: int = None,
+              start_key: dict = None, ascending: bool = True):
+        self.calls.append(('query', table, index, key_value))
+        matches = sorted(
+            (item for item in self.tables.get(table, {}).values() if item.get(key_name, {}).get('S') == key_value),
+            key=lambda item: item['id']['S'], reverse=not ascending
+        )
+        if start_key:
+            position = [item['id']['S'] for item in matches].index(start_key['id']['S'])
+            matches = matches[position + 1:]
+        if limit and len(matches) > limit:
+            matches = matches[:limit]
+            last = matches[-1]
+            return matches, {'id': last['id'], key_name: last[key_name]}
+        return matches, None
+
+
+memory_backend = InMemoryBackend()
+
+
+def get_backend(dynamodb_client):
+    """Backend de datos según DATA_BACKEND ('dynamodb' por defecto o 'memory' para pruebas locales)."""
+    if DATA_BACKEND == 'memory':
+        return memory_backend
+    return DynamoBackend(dynamodb_client)
+
+
+class PendingRecord:
+    """
+    Resultado diferido de Repository.load. Las claves pedidas antes del primer result() se leen
+    juntas en un solo BatchGetItem.
+    """
+    __slots__ = ('_repository', '_item_id')
+
+    def __init__(self, repository, item_id: str):
+        self._repository = repository
+        self._item_id = item_id
+
+    def result(self):
+        return self._repository._resolve(self._item_id)
+
+
+class Repository:
+    """
+    Repositorio de un tipo de registro, creado por invocación. Los registros son los items ya convertidos
+    a dict con serialize_dynamo_to_dict.
+
+    Las lecturas se agrupan: load() solo encola la clave y devuelve un PendingRecord; al pedir el primer
+    resultado, todas las claves encoladas (sin duplicados) se leen en un BatchGetItem. Lo leído queda en un
+    mapa de identidad, así que durante la invocación un mismo item nunca se lee dos veces y siempre se
+    devuelve el mismo objeto.
+    """
+    table = None
+
+    def __init__(self, backend, deadline):
+        self.backend = backend
+        self.deadline = deadline
+        self._identity_map = {}
+        self._queued = {}
+
+    def _accepts(self, item_id: str) -> bool:
+        """Permite descartar sin leer los ids que no pueden pertenecer al repositorio."""
+        return True
+
+    def _to_record(self, item: dict):
+        return serialize_dynamo_to_dict(item) if item else None
+
+    def _remember(self, item: dict):
+        """Agrega al mapa de identidad un item leído por otra vía (por ejemplo una consulta) y devuelve su registro."""
+        item_id = item['id']['S']
+        if self._identity_map.get(item_id) is None:
+            self._identity_map[item_id] = self._to_record(item)
+        return self._identity_map[item_id]
+
+    def load(self, item_id: str) -> PendingRecord:
+        if item_id not in self._identity_map:
+            if self._accepts(item_id):
+                self._queued[item_id] = None
+            else:
+                self._identity_map[item_id] = None
+        return PendingRecord(self, item_id)
+
+    def dispatch(self):
+        """Lee en un solo lote todas las claves encoladas."""
+        if not self._queued:
+            return
+        ids = list(self._queued)
+        self._queued.clear()
+        items = self.backend.batch_get(self.deadline, self.table, ids)
+        for item_id in ids:
+            self._identity_map[item_id] = self._to_record(items.get(item_id))
+
+    def _resolve(self, item_id: str):
+        if item_id not in self._identity_map:
+            self.dispatch()
+        return self._identity_map[item_id]
+
+    def get(self, item_id: str):
+        """Devuelve el registro o None si no existe."""
+        return self.load(item_id).result()
+
+    def get_many(self, ids) -> list:
+        """Devuelve los registros en el mismo orden que ids (None para los que no existen), con una sola lectura en lote."""
+        pending = [self.load(item_id) for item_id in ids]
+        return [record.result() for record in pending]
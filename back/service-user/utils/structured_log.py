@@ -0,0 +1,135 @@
+import sys
+import json
+import time
+import random
+import logging
+import functools
+import traceback
+from utils.config import LOG_LEVEL, LOG_SUCCESS_SAMPLE_RATE, LOG_MAX_RECORDS_PER_INVOCATION
+
+_current_invocation = None
+
+
+class Invocation:
+    """
+    Logs de una invocación del handler, guardados como LogRecord sin formatear.
+
+    Al terminar se escriben todos juntos en una sola línea JSON con el aws_request_id, o se descartan si la
+    invocación no salió en el muestreo y no tuvo advertencias ni errores. Los descartados nunca se formatean.
+    """
+
+    def __init__(self, request_id: str, function_name: str, sampled: bool):
+        self.request_id = request_id
+        self.function_name = function_name
+        self.sampled = sampled
+        self.started_at = time.time()
+        self.records = []
+        self.dropped = 0
+        self.keep = False
+
+    def add(self, record: logging.LogRecord):
+        if record.levelno >= logging.WARNING or getattr(record, 'keep', False):
+            self.keep = True
+        if len(self.records) < LOG_MAX_RECORDS_PER_INVOCATION:
+            self.records.append(record)
+        else:
+            self.dropped += 1
+
+    def should_write(self, status_code) -> bool:
+        return self.keep or self.sampled or (isinstance(status_code, int) and status_code >= 500)
+
+    def to_log_document(self, status_code) -> dict:
+        document = {
+            'aws_request_id': self.request_id,
+            'function': self.function_name,
+            'status_code': status_code,
+            'duration_ms': round((time.time() - self.started_at) * 1000, 1),
+            'sampled': self.sampled,
+            'records': [record_to_dict(record, self.started_at) for record in self.records]
+        }
+        if self.dropped:
+            document['dropped_records'] = self.dropped
+        return document
+
+
+def record_to_dict(record: logging.LogRecord, started_at: float = None) -> dict:
+    """Recién aquí se formatea el mensaje (record.getMessage aplica los argumentos %s)."""
+    entry = {'level': record.levelname, 'logger': record.name, 'message': record.getMessage()}
+    if started_at is not None:
+        entry['t_ms'] = round((record.created - started_at) * 1000, 1)
+    fields = getattr(record, 'fields', None)
+    if isinstance(fields, dict):
+        entry.update(fields)
+    if record.exc_info:
+        entry['exception'] = ''.join(traceback.format_exception(*record.exc_info))
+    return entry
+
+
+def _write(document: dict):
+    sys.stdout.write(json.dumps(document, default=str, ensure_ascii=False) + '\n')
+    sys.stdout.flush()
+
+
+class InvocationBufferHandler(logging.Handler):
+    """
+    Handler de los loggers del servicio: dentro de una invocación guarda el record en su buffer; fuera de
+    una (carga del módulo, scripts) lo escribe de inmediato como JSON.
+    """
+
+    def emit(self, record):
+        try:
+            invocation = _current_invocation
+            if invocation is not None:
+                invocation.add(record)
+            else:
+                _write(record_to_dict(record))
+        except Exception:
+            self.handleError(record)
+
+
+_handler = InvocationBufferHandler()
+
+
+def get_logger(name: str = None) -> logging.Logger:
+    """
+    Logger con salida JSON por invocación. No propaga al logger raíz (el del runtime de Lambda escribiría
+    cada record por separado). Se usa con argumentos %s para que el formateo sea perezoso:
+        logger.info("Room %s actualizado", room_id)
+    """
+    logger = logging.getLogger(name)
+    if _handler not in logger.handlers:
+        logger.addHandler(_handler)
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+    return logger
+
+
+def logged(handler):
+    """
+    Decorador del lambda_handler: abre el buffer de logs de la invocación, decide el muestreo y al final
+    escribe (o descarta) todos los records en una sola escritura, con el statusCode de la respuesta.
+    """
+
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        global _current_invocation
+        _current_invocation = Invocation(
+            getattr(context, 'aws_request_id', None),
+            getattr(context, 'function_name', handler.__module__),
+            random.random() < LOG_SUCCESS_SAMPLE_RATE
+        )
+        status_code = None
+        try:
+            response = handler(event, context)
+            if isinstance(response, dict):
+                status_code = response.get('statusCode')
+            return response
+        except BaseException:
+            status_code = 500
+            raise
+        finally:
+            invocation, _current_invocation = _current_invocation, None
+            if invocation.records and invocation.should_write(status_code):
+                _write(invocation.to_log_document(status_code))
+
+    return wrapper
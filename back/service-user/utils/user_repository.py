@@ -0,0 +1,24 @@
+from utils.config import USER_TABLE, USER_GSI_INDEX_USERNAME
+from utils.repository import Repository
+
+
+class UserRepository(Repository):
+    """
+    Acceso a los usuarios de USER_TABLE.
+    """
+    table = USER_TABLE
+
+    def __init__(self, backend, deadline):
+        super().__init__(backend, deadline)
+        self._by_username = {}
+
+    def _accepts(self, item_id: str) -> bool:
+        # Los ids de los usuarios son UUID; los items auxiliares (ratelimit#, ...) nunca son usuarios
+        return bool(item_id) and '#' not in item_id
+
+    def find_by_username(self, username: str):
+        """Busca el usuario por USER_GSI_INDEX_USERNAME. Devuelve el usuario o None."""
+        if username not in self._by_username:
+            items, _ = self.backend.query(self.deadline, self.table, USER_GSI_INDEX_USERNAME, 'username', username)
+            self._by_username[username] = self._remember(items[0]) if items else None
+        return self._by_username[username]
@@ -0,0 +1,24 @@
+from datetime import datetime
+from utils.config import USER_TABLE, USERNAME_RESERVATION_PREFIX
+
+
+def username_reservation_key(username: str) -> dict:
+    """Clave del item que reserva el username dentro de USER_TABLE."""
+    return {'id': {'S': f"{USERNAME_RESERVATION_PREFIX}{username}"}}
+
+
+def username_reservation_put(username: str, user_id: str) -> dict:
+    """
+    Put condicional que reserva el username para user_id. Un índice secundario no puede garantizar unicidad,
+    en cambio este item tiene el username en la clave primaria y la condición falla si ya existe.
+    El item guarda owner_id (no username) para no aparecer en USER_GSI_INDEX_USERNAME.
+    """
+    return {
+        'TableName': USER_TABLE,
+        'Item': {
+            **username_reservation_key(username),
+            'owner_id': {'S': user_id},
+            'reserved_at': {'S': datetime.utcnow().isoformat()}
+        },
+        'ConditionExpression': 'attribute_not_exists(id)'
+    }
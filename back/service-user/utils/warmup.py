@@ -0,0 +1,53 @@
+import time
+from utils.config import WARMUP_SOURCE, WARMUP_HOLD_MS
+from utils.response import Response
+from utils.structured_log import get_logger
+
+logger = get_logger(__name__)
+
+_primed = False
+
+
+def is_warmup_event(event) -> bool:
+    """Indica si el evento es un warm-up programado y no una solicitud real."""
+    return isinstance(event, dict) and (event.get('source') == WARMUP_SOURCE or event.get('warmup') is True)
+
+
+def prime(deadline, dynamodb_client=None, token_validator=None, validators=(), load_bcrypt=False) -> bool:
+    """
+    Carga una sola vez por contenedor todo lo que la primera solicitud real pagaría: la conexión TLS con
+    DynamoDB, el código de jwt, las rutas de los validadores y, si se pide, el código nativo de bcrypt.
+    :return: True si esta llamada hizo el priming, False si el contenedor ya estaba listo.
+    """
+    global _primed
+    if _primed:
+        return False
+
+    if dynamodb_client is not None:
+        dynamodb_client.prime(deadline)
+
+    if token_validator is not None:
+        token_validator.decode_token(token_validator.generate_token({'warmup': True}))
+
+    for validator in validators:
+        validator.validate(data={}, param_field='warmup')
+
+    if load_bcrypt:
+        import bcrypt
+        bcrypt.checkpw(b'warmup', bcrypt.hashpw(b'warmup', bcrypt.gensalt(rounds=4)))
+
+    _primed = True
+    return True
+
+
+def warmup_response(event, deadline, **prime_kwargs) -> dict:
+    """
+    Atiende un evento de warm-up sin pasar por la lógica de negocio.
+
+    Cuando el warmer pide concurrencia mayor a 1, la invocación se mantiene ocupada unos milisegundos para
+    que las invocaciones simultáneas caigan en contenedores distintos.
+    """
+    primed = prime(deadline, **prime_kwargs)
+    if int(event.get('concurrency', 1)) > 1:
+        time.sleep(WARMUP_HOLD_MS / 1000)
+    return Response(status_code=200, body={'warmup': True, 'primed': primed}).to_dict()
@@ -0,0 +1,54 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+import boto3
+from utils.config import WARMUP_SOURCE, WARMUP_CONCURRENCY, WARMUP_TARGETS
+from utils.structured_log import get_logger, logged
+
+logger = get_logger(__name__)
+
+lambda_client = boto3.client('lambda')
+
+MAX_PARALLEL_INVOCATIONS = 32
+
+
+def invoke_warmup(function_name: str, concurrency: int) -> bool:
+    """Invoca una función con un evento de warm-up y espera su respuesta."""
+    payload = {'source': WARMUP_SOURCE, 'concurrency': concurrency}
+    try:
+        response = lambda_client.invoke(
+            FunctionName=function_name,
+            InvocationType='RequestResponse',  # Síncrono, para que las N invocaciones coincidan en el tiempo
+            Payload=json.dumps(payload).encode('utf-8')
+        )
+        return response.get('StatusCode') == 200 and 'FunctionError' not in response
+    except Exception as e:
+        logger.error("Error al calentar la función %s: %s", function_name, e)
+        return False
+
+
+@logged
+def lambda_handler(event, context):
+    """
+    Función programada que mantiene N contenedores calientes por cada función de WARMUP_TARGETS.
+
+    Lanza N invocaciones simultáneas de cada función; como cada una retiene su contenedor unos milisegundos,
+    Lambda las reparte en N contenedores distintos. El evento puede sobreescribir targets y concurrency.
+    """
+    event = event if isinstance(event, dict) else {}
+    targets = event.get('targets') or WARMUP_TARGETS
+    concurrency = int(event.get('concurrency', WARMUP_CONCURRENCY))
+
+    jobs = [name for name in targets for _ in range(concurrency)]
+    if not jobs:
+        logger.info("No hay funciones configuradas en WARMUP_TARGETS.")
+        return {'warmed': {}}
+
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_INVOCATIONS, len(jobs))) as executor:
+        results = list(executor.map(lambda name: invoke_warmup(name, concurrency), jobs))
+
+    warmed = {name: 0 for name in targets}
+    for name, ok in zip(jobs, results):
+        warmed[name] += int(ok)
+
+    logger.info("Warm-up completado: %s", warmed)
+    return {'warmed': warmed}